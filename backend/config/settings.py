@@ -7,6 +7,7 @@ import dj_database_url
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv()
@@ -56,6 +57,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'cupcakes_api.middleware.CompressaoRespostaMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -113,6 +115,74 @@ else:
         }
     }
 
+# Cache
+# As versões do catálogo (e as páginas guardadas sob elas) precisam ser
+# vistas por todos os processos: Redis se REDIS_URL estiver definido, senão
+# a tabela de cache no banco (python manage.py createcachetable). O cache em
+# memória do processo só é aceito com CACHE_LOCAL=True, o padrão em
+# desenvolvimento (DEBUG fora da Vercel, um único processo do runserver).
+REDIS_URL = os.environ.get('REDIS_URL')
+CACHE_LOCAL = os.environ.get('CACHE_LOCAL', str(DEBUG and not VERCEL_URL)) == 'True'
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif CACHE_LOCAL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sweet-cupcakes',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'cache_sweet_cupcakes',
+        }
+    }
+
+# Tempo (segundos) que as páginas serializadas do catálogo ficam em cache.
+# A invalidação é feita pela versão do catálogo, este é só um limite superior.
+CATALOGO_CACHE_TIMEOUT = int(os.environ.get('CATALOGO_CACHE_TIMEOUT', 3600))
+
+# Publica o snapshot estático do catálogo (STATIC_ROOT/catalogo/) a cada
+# alteração. Exige STATIC_ROOT gravável; na Vercel o snapshot é gerado no build.
+CATALOGO_SNAPSHOT_AUTOMATICO = os.environ.get('CATALOGO_SNAPSHOT_AUTOMATICO', 'False') == 'True'
+
+# Dias em que as exclusões do catálogo ficam registradas para a
+# sincronização incremental; clientes mais antigos baixam tudo de novo
+CATALOGO_REMOCOES_RETENCAO_DIAS = int(os.environ.get('CATALOGO_REMOCOES_RETENCAO_DIAS', 90))
+
+# Validade (horas) das respostas guardadas por Idempotency-Key
+IDEMPOTENCIA_TTL_HORAS = int(os.environ.get('IDEMPOTENCIA_TTL_HORAS', 24))
+
+# Compressão das respostas da API (brotli quando instalado, senão gzip)
+COMPRESSAO_TAMANHO_MINIMO = int(os.environ.get('COMPRESSAO_TAMANHO_MINIMO', 1024))
+COMPRESSAO_NIVEL_GZIP = int(os.environ.get('COMPRESSAO_NIVEL_GZIP', 6))
+COMPRESSAO_NIVEL_BROTLI = int(os.environ.get('COMPRESSAO_NIVEL_BROTLI', 5))
+# Só JSON: páginas HTML (admin, login) refletem entrada do usuário junto do
+# token CSRF, e comprimi-las abre espaço para o ataque BREACH
+COMPRESSAO_TIPOS = ['application/json']
+
+# Armazenamento dos itens do carrinho: 'orm' (tabelas carrinhos/itens_carrinho)
+# ou 'memoria' (LRU no processo, gravado no banco ao sair do LRU, por uma
+# thread a cada CARRINHO_PERSISTENCIA_SEGUNDOS - 0 desliga - e no checkout).
+# 'memoria' exige que as requisições de cada usuário caiam sempre no mesmo
+# processo.
+CARRINHO_ARMAZENAMENTO = os.environ.get('CARRINHO_ARMAZENAMENTO', 'orm')
+CARRINHO_MEMORIA_MAXIMO = int(os.environ.get('CARRINHO_MEMORIA_MAXIMO', 1000))
+CARRINHO_PERSISTENCIA_SEGUNDOS = int(os.environ.get('CARRINHO_PERSISTENCIA_SEGUNDOS', 60))
+# Validade (dias) do cookie assinado do carrinho de visitantes
+CARRINHO_ANONIMO_DIAS = int(os.environ.get('CARRINHO_ANONIMO_DIAS', 30))
+# Validade (segundos) do mapa de preços/estoque usado pelo carrinho de
+# visitantes; o checkout baixa o estoque sem mudar a versão do catálogo
+CARRINHO_ANONIMO_MAPA_SEGUNDOS = int(os.environ.get('CARRINHO_ANONIMO_MAPA_SEGUNDOS', 60))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -144,6 +214,13 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Variantes das imagens enviadas (larguras em pixels, formatos e qualidade)
+IMAGEM_LARGURAS = [320, 640, 960]
+IMAGEM_FORMATOS = ['webp', 'jpeg']
+IMAGEM_QUALIDADE = int(os.environ.get('IMAGEM_QUALIDADE', 80))
+# Threads que geram as variantes após o upload (0 = gera na própria requisição)
+IMAGEM_THREADS = int(os.environ.get('IMAGEM_THREADS', 2))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -164,13 +241,21 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'cupcakes_api.renderers.JSONRapidoRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'cupcakes_api.parsers.JSONRapidoParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DATETIME_FORMAT': '%d/%m/%Y %H:%M:%S',
     'DATE_FORMAT': '%d/%m/%Y',
 }
 
+# API navegável apenas em desenvolvimento
+if DEBUG:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('rest_framework.renderers.BrowsableAPIRenderer')
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -193,6 +278,10 @@ CORS_ALLOWED_ORIGIN_REGEXES = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Headers extras usados pela API (idempotência na criação de pedidos)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
+
 # Se em desenvolvimento, pode permitir todas as origens
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = True
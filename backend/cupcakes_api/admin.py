@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Sum
 from cupcakes_api.models import (
     Categoria,
     Cupcake,
@@ -7,8 +9,10 @@ from cupcakes_api.models import (
     Cupom,
     Pedido,
     ItemPedido,
-    Pagamento
+    Pagamento,
+    VendaDiaria
 )
+from cupcakes_api.services import VendaDiariaService
 
 
 @admin.register(Categoria)
@@ -28,8 +32,8 @@ class CupcakeAdmin(admin.ModelAdmin):
     """
     Admin para gerenciar Cupcakes
     """
-    list_display = ['nome', 'categoria', 'preco', 'estoque', 'destaque', 'ativo', 'created_at']
-    list_filter = ['categoria', 'destaque', 'ativo', 'created_at']
+    list_display = ['nome', 'categoria', 'preco', 'estoque', 'destaque', 'ativo', 'disponivel', 'created_at']
+    list_filter = ['categoria', 'destaque', 'ativo', 'disponivel', 'created_at']
     search_fields = ['nome', 'descricao', 'slug']
     prepopulated_fields = {'slug': ('nome',)}
     list_editable = ['preco', 'estoque', 'destaque', 'ativo']
@@ -129,6 +133,32 @@ class PedidoAdmin(admin.ModelAdmin):
     list_editable = ['status']
     ordering = ['-created_at']
     inlines = [ItemPedidoInline]
+
+    def save_model(self, request, obj, form, change):
+        """
+        Mantém a consolidação diária em dia quando o status é alterado no admin
+        """
+        status_anterior = form.initial.get('status')
+        super().save_model(request, obj, form, change)
+        if change and 'status' in form.changed_data:
+            VendaDiariaService.mover_status(obj, status_anterior)
+
+    @transaction.atomic
+    def delete_model(self, request, obj):
+        """
+        Tira o pedido excluído da consolidação diária
+        """
+        VendaDiariaService.remover_pedido(obj)
+        super().delete_model(request, obj)
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        """
+        Tira da consolidação diária os pedidos excluídos em massa
+        """
+        for pedido in queryset.annotate(quantidade_itens=Sum('itens__quantidade')):
+            VendaDiariaService.remover_pedido(pedido, pedido.quantidade_itens or 0)
+        super().delete_queryset(request, queryset)
     
     fieldsets = (
         ('Informações do Pedido', {
@@ -186,3 +216,23 @@ class PagamentoAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(VendaDiaria)
+class VendaDiariaAdmin(admin.ModelAdmin):
+    """
+    Admin (somente leitura) da consolidação diária de vendas
+    """
+    list_display = [
+        'data', 'status', 'tipo_entrega', 'total_pedidos',
+        'total_vendas', 'total_descontos', 'total_frete', 'itens_vendidos'
+    ]
+    list_filter = ['status', 'tipo_entrega', 'data']
+    date_hierarchy = 'data'
+    ordering = ['-data', 'status', 'tipo_entrega']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -5,3 +5,7 @@ class CupcakesApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cupcakes_api'
     verbose_name = 'Sweet Cupcakes API'
+
+    def ready(self):
+        # Registra os receivers de sinais e as verificações da aplicação
+        from cupcakes_api import checks, signals  # noqa: F401
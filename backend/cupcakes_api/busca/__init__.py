@@ -0,0 +1,14 @@
+from .normalizador import normalizar, remover_acentos, radical
+from .tokenizador import tokenizar, extrair_termos
+from .indice import IndiceInvertido
+from .trie import TriePrefixos
+
+__all__ = [
+    'normalizar',
+    'remover_acentos',
+    'radical',
+    'tokenizar',
+    'extrair_termos',
+    'IndiceInvertido',
+    'TriePrefixos'
+]
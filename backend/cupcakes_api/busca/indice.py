@@ -0,0 +1,93 @@
+import math
+from collections import Counter, defaultdict
+
+
+class IndiceInvertido:
+    """
+    Índice invertido em memória com ranqueamento BM25
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        # termo -> {doc_id: frequência}
+        self.postings = defaultdict(dict)
+        # doc_id -> quantidade de termos do documento
+        self.comprimentos = {}
+        # doc_id -> termos distintos do documento (para remoção)
+        self.termos_documento = {}
+        self.comprimento_total = 0
+
+    def __len__(self):
+        return len(self.comprimentos)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.comprimentos
+
+    def adicionar(self, doc_id, termos):
+        """
+        Indexa (ou reindexa) um documento
+
+        Args:
+            doc_id (int): Identificador do documento
+            termos (list): Termos do documento, com repetições
+        """
+        if doc_id in self.comprimentos:
+            self.remover(doc_id)
+
+        frequencias = Counter(termos)
+        for termo, frequencia in frequencias.items():
+            self.postings[termo][doc_id] = frequencia
+        self.termos_documento[doc_id] = set(frequencias)
+        self.comprimentos[doc_id] = len(termos)
+        self.comprimento_total += len(termos)
+
+    def remover(self, doc_id):
+        """
+        Remove um documento do índice
+
+        Args:
+            doc_id (int): Identificador do documento
+        """
+        comprimento = self.comprimentos.pop(doc_id, None)
+        if comprimento is None:
+            return
+
+        self.comprimento_total -= comprimento
+        for termo in self.termos_documento.pop(doc_id):
+            del self.postings[termo][doc_id]
+            if not self.postings[termo]:
+                del self.postings[termo]
+
+    def buscar(self, termos, limite=None):
+        """
+        Busca os documentos que contêm ao menos um dos termos
+
+        Args:
+            termos (list): Termos da consulta
+            limite (int, optional): Quantidade máxima de resultados
+
+        Returns:
+            list: Tuplas (doc_id, pontuação) em ordem decrescente de pontuação
+        """
+        total_documentos = len(self.comprimentos)
+        if not total_documentos:
+            return []
+
+        comprimento_medio = self.comprimento_total / total_documentos
+        pontuacoes = defaultdict(float)
+
+        for termo in set(termos):
+            docs = self.postings.get(termo)
+            if not docs:
+                continue
+
+            idf = math.log(1 + (total_documentos - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, frequencia in docs.items():
+                normalizacao = 1 - self.b + self.b * self.comprimentos[doc_id] / comprimento_medio
+                pontuacoes[doc_id] += idf * frequencia * (self.k1 + 1) / (frequencia + self.k1 * normalizacao)
+
+        resultado = sorted(pontuacoes.items(), key=lambda item: (-item[1], item[0]))
+        if limite is not None:
+            resultado = resultado[:limite]
+        return resultado
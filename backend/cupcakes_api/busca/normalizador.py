@@ -0,0 +1,101 @@
+import unicodedata
+
+
+# Palavras sem valor de busca (já sem acento)
+STOPWORDS = frozenset([
+    'a', 'o', 'as', 'os', 'e', 'de', 'da', 'do', 'das', 'dos', 'em', 'no',
+    'na', 'nos', 'nas', 'com', 'sem', 'um', 'uma', 'uns', 'umas', 'para',
+    'pra', 'por', 'ao', 'aos', 'ou', 'que'
+])
+
+
+def remover_acentos(texto):
+    """
+    Remove acentos e cedilha ("maçã" -> "maca")
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        str: Texto sem marcas diacríticas
+    """
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+
+
+def normalizar(texto):
+    """
+    Normaliza o texto para comparação (minúsculas e sem acentos)
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        str: Texto normalizado
+    """
+    return remover_acentos(texto or '').lower()
+
+
+# Regras de plural, aplicadas na ordem (sufixo, substituto)
+_PLURAIS = (
+    ('oes', 'ao'),
+    ('aes', 'ao'),
+    ('ais', 'al'),
+    ('eis', 'el'),
+    ('ois', 'ol'),
+    ('ns', 'm'),
+    ('res', 'r'),
+    ('zes', 'z'),
+)
+
+# Diminutivos e aumentativos
+_GRAUS = (
+    ('zinhos', ''),
+    ('zinhas', ''),
+    ('zinho', ''),
+    ('zinha', ''),
+    ('guinho', 'go'),
+    ('guinha', 'ga'),
+    ('quinho', 'co'),
+    ('quinha', 'ca'),
+    ('inho', 'o'),
+    ('inha', 'a'),
+    ('issimo', 'o'),
+    ('issima', 'a'),
+)
+
+
+def radical(palavra):
+    """
+    Reduz uma palavra normalizada ao seu radical (stemmer leve de português)
+
+    Trata plural, grau (diminutivo/superlativo) e a vogal temática final, o
+    suficiente para "morangos", "morango" e "moranguinho" caírem no mesmo
+    termo sem as perdas de um stemmer agressivo.
+
+    Args:
+        palavra (str): Palavra já normalizada (minúscula e sem acento)
+
+    Returns:
+        str: Radical
+    """
+    if len(palavra) < 4 or not palavra.isalpha():
+        return palavra
+
+    for sufixo, substituto in _PLURAIS:
+        if palavra.endswith(sufixo):
+            palavra = palavra[:-len(sufixo)] + substituto
+            break
+    else:
+        if palavra.endswith('s') and not palavra.endswith(('ss', 'us', 'is')):
+            palavra = palavra[:-1]
+
+    for sufixo, substituto in _GRAUS:
+        if palavra.endswith(sufixo) and len(palavra) - len(sufixo) >= 3:
+            palavra = palavra[:-len(sufixo)] + substituto
+            break
+
+    if len(palavra) > 3 and palavra[-1] in 'aeo':
+        palavra = palavra[:-1]
+
+    return palavra
@@ -0,0 +1,31 @@
+import re
+from .normalizador import STOPWORDS, normalizar, radical
+
+
+_PALAVRA = re.compile(r'[a-z0-9]+')
+
+
+def tokenizar(texto):
+    """
+    Separa o texto em palavras normalizadas (sem acento, minúsculas)
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        list: Palavras, na ordem em que aparecem
+    """
+    return _PALAVRA.findall(normalizar(texto))
+
+
+def extrair_termos(texto):
+    """
+    Converte o texto nos termos indexáveis (sem stopwords e com radical)
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        list: Termos, com repetições
+    """
+    return [radical(palavra) for palavra in tokenizar(texto) if palavra not in STOPWORDS]
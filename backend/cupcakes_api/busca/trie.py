@@ -0,0 +1,83 @@
+from bisect import insort
+
+
+class _No:
+    """Nó da trie: filhos por caractere e as melhores entradas do prefixo"""
+
+    __slots__ = ('filhos', 'entradas')
+
+    def __init__(self):
+        self.filhos = {}
+        # Lista ordenada de (prioridade, chave), no máximo `limite` itens
+        self.entradas = []
+
+
+class TriePrefixos:
+    """
+    Trie de prefixos com as k melhores sugestões pré-calculadas em cada nó
+
+    A consulta percorre apenas os caracteres do prefixo e devolve a lista
+    já pronta do último nó, sem percorrer a subárvore.
+    """
+
+    def __init__(self, limite=10):
+        self.limite = limite
+        self.raiz = _No()
+        # chave -> valor devolvido pela consulta
+        self.sugestoes = {}
+
+    def __len__(self):
+        return len(self.sugestoes)
+
+    def adicionar(self, texto, chave, prioridade, sugestao):
+        """
+        Registra uma sugestão para todos os prefixos de `texto`
+
+        Args:
+            texto (str): Texto já normalizado
+            chave (tuple): Identifica a sugestão (ex: ('cupcake', 3))
+            prioridade (tuple): Menor vem primeiro
+            sugestao (object): Valor devolvido pela consulta
+        """
+        self.sugestoes[chave] = sugestao
+        entrada = (prioridade, chave)
+        no = self.raiz
+        for caractere in texto:
+            no = no.filhos.setdefault(caractere, _No())
+            self._registrar(no, entrada)
+
+    def _registrar(self, no, entrada):
+        """Mantém no nó apenas as `limite` entradas de menor prioridade"""
+        prioridade, chave = entrada
+        for posicao, (prioridade_atual, chave_atual) in enumerate(no.entradas):
+            if chave_atual == chave:
+                if prioridade_atual <= prioridade:
+                    return
+                del no.entradas[posicao]
+                break
+
+        if len(no.entradas) >= self.limite and entrada >= no.entradas[-1]:
+            return
+        insort(no.entradas, entrada)
+        del no.entradas[self.limite:]
+
+    def buscar(self, prefixo, limite=None):
+        """
+        Retorna as melhores sugestões para o prefixo
+
+        Args:
+            prefixo (str): Prefixo já normalizado
+            limite (int, optional): Máximo de sugestões (até o limite da trie)
+
+        Returns:
+            list: Sugestões em ordem de prioridade
+        """
+        if not prefixo:
+            return []
+        no = self.raiz
+        for caractere in prefixo:
+            no = no.filhos.get(caractere)
+            if no is None:
+                return []
+        entradas = no.entradas[:limite] if limite else no.entradas
+        return [self.sugestoes[chave] for _, chave in entradas]
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+# Backends cujo conteúdo não é visto pelos outros processos/instâncias
+CACHES_LOCAIS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+)
+
+
+@register()
+def verificar_cache_compartilhado(app_configs, **kwargs):
+    """
+    Exige um cache compartilhado para as versões do catálogo
+
+    Com o cache em memória, a versão incrementada por um save ou checkout
+    só muda no processo que o atendeu; os demais seguem servindo preço e
+    estoque antigos até CATALOGO_CACHE_TIMEOUT.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if backend in CACHES_LOCAIS and not settings.CACHE_LOCAL:
+        return [
+            Error(
+                f'O cache padrão ({backend}) é local do processo.',
+                hint='Defina REDIS_URL ou use a tabela de cache no banco '
+                     '(DatabaseCache + createcachetable); CACHE_LOCAL=True só '
+                     'com um único processo.',
+                id='cupcakes_api.E001',
+            )
+        ]
+    return []
@@ -0,0 +1,33 @@
+from django.db.models import Case, IntegerField, When
+from rest_framework import filters
+from cupcakes_api.services.busca_service import BuscaService
+
+
+class BuscaCupcakeFilter(filters.SearchFilter):
+    """
+    Filtro de busca textual de cupcakes (?search=)
+
+    Usa o índice invertido do BuscaService em vez de `icontains`: ignora
+    acentos, reduz as palavras ao radical e ordena por relevância (BM25).
+    Um `?ordering=` explícito tem prioridade sobre a relevância, por isso
+    este filtro deve vir depois do OrderingFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        termo = request.query_params.get(self.search_param, '').strip()
+        if not termo:
+            return queryset
+
+        ids = BuscaService.buscar(termo)
+        if not ids:
+            return queryset.none()
+
+        queryset = queryset.filter(id__in=ids)
+        if 'ordering' in request.query_params:
+            return queryset
+
+        relevancia = Case(
+            *[When(id=cupcake_id, then=posicao) for posicao, cupcake_id in enumerate(ids)],
+            output_field=IntegerField()
+        )
+        return queryset.order_by(relevancia)
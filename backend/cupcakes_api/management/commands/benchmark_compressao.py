@@ -0,0 +1,138 @@
+import time
+from decimal import Decimal
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIClient
+from cupcakes_api.middleware import brotli, comprimir
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.services import CarrinhoService, PedidoService
+
+
+class Command(BaseCommand):
+    """
+    Mede bytes trafegados e custo de CPU da compressão por endpoint
+    """
+    help = 'Compara tamanho e tempo de CPU de gzip/brotli nas respostas da API (dados descartados ao final)'
+
+    ENDPOINTS = [
+        '/api/cupcakes/',
+        '/api/cupcakes/destaques/',
+        '/api/cupcakes/facetas/',
+        '/api/categorias/',
+        '/api/pedidos/',
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cupcakes',
+            type=int,
+            default=60,
+            help='Quantidade de cupcakes de exemplo (padrão: 60)'
+        )
+        parser.add_argument(
+            '--pedidos',
+            type=int,
+            default=20,
+            help='Quantidade de pedidos do usuário de exemplo (padrão: 20)'
+        )
+        parser.add_argument(
+            '--repeticoes',
+            type=int,
+            default=20,
+            help='Compressões por medida; vale a média (padrão: 20)'
+        )
+
+    def handle(self, *args, **options):
+        if min(options['cupcakes'], options['pedidos'], options['repeticoes']) < 1:
+            raise CommandError('Os valores devem ser maiores que zero')
+
+        codificacoes = [('gzip', settings.COMPRESSAO_NIVEL_GZIP)]
+        if brotli is not None:
+            codificacoes.append(('br', settings.COMPRESSAO_NIVEL_BROTLI))
+        else:
+            self.stdout.write(self.style.WARNING('Brotli não instalado: medindo apenas gzip'))
+
+        # Os dados de exemplo vivem só dentro desta transação
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['testserver']):
+            usuario = self._criar_dados(options['cupcakes'], options['pedidos'])
+            client = APIClient()
+            client.force_authenticate(usuario)
+
+            cabecalho = f"{'endpoint':<26} {'original':>9}"
+            for codificacao, nivel in codificacoes:
+                cabecalho += f" {f'{codificacao}-{nivel}':>9} {'razão':>6} {'CPU':>8}"
+            self.stdout.write(cabecalho)
+
+            for endpoint in self.ENDPOINTS:
+                resposta = client.get(endpoint, HTTP_ACCEPT_ENCODING='identity')
+                if resposta.status_code != 200:
+                    raise CommandError(f'{endpoint} respondeu {resposta.status_code}')
+                conteudo = resposta.content
+
+                linha = f"{endpoint:<26} {len(conteudo):>9}"
+                for codificacao, nivel in codificacoes:
+                    tamanho, segundos = self._medir(conteudo, codificacao, nivel, options['repeticoes'])
+                    linha += f" {tamanho:>9} {tamanho / len(conteudo):>6.1%} {segundos * 1000:>6.3f}ms"
+                self.stdout.write(linha)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Respostas abaixo de {settings.COMPRESSAO_TAMANHO_MINIMO} bytes não são comprimidas'
+        ))
+
+    @staticmethod
+    def _criar_dados(quantidade_cupcakes, quantidade_pedidos):
+        """
+        Cria catálogo e pedidos de exemplo
+
+        Returns:
+            User: Usuário dono dos pedidos
+        """
+        categorias = [
+            Categoria.objects.create(nome=f'Benchmark {indice}', slug=f'benchmark-{indice}')
+            for indice in range(4)
+        ]
+        cupcakes = Cupcake.objects.bulk_create([
+            Cupcake(
+                nome=f'Cupcake Especial {indice}',
+                slug=f'benchmark-{indice}',
+                descricao='Massa de baunilha com recheio cremoso e cobertura de chantilly',
+                preco=Decimal('7.50') + indice % 5,
+                categoria=categorias[indice % len(categorias)],
+                imagem_url=f'https://cdn.exemplo.com/cupcakes/{indice}.jpg',
+                destaque=indice % 3 == 0,
+                estoque=1000,
+                disponivel=True
+            )
+            for indice in range(quantidade_cupcakes)
+        ])
+
+        usuario = User.objects.create_user('benchmark-compressao', 'benchmark@exemplo.com', 'senha')
+        for indice in range(quantidade_pedidos):
+            for cupcake in cupcakes[indice % len(cupcakes):][:5]:
+                CarrinhoService.adicionar_item(usuario, cupcake.id, 2)
+            PedidoService.criar_pedido(usuario, {
+                'nome_cliente': 'Cliente Benchmark',
+                'email_cliente': 'benchmark@exemplo.com',
+                'telefone_cliente': '51999999999',
+                'tipo_entrega': 'retirada',
+                'metodo_pagamento': 'pix'
+            })
+        return usuario
+
+    @staticmethod
+    def _medir(conteudo, codificacao, nivel, repeticoes):
+        """
+        Comprime o conteúdo várias vezes
+
+        Returns:
+            tuple: (tamanho comprimido, segundos de CPU por compressão)
+        """
+        inicio = time.process_time()
+        for _ in range(repeticoes):
+            comprimido = comprimir(conteudo, codificacao, nivel)
+        return len(comprimido), (time.process_time() - inicio) / repeticoes
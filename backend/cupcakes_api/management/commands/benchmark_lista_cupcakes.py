@@ -0,0 +1,117 @@
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.serializers import CupcakeListSerializer
+
+
+class Command(BaseCommand):
+    """
+    Compara a serialização da listagem de cupcakes: caminho por instâncias
+    (ModelSerializer linha a linha) x caminho rápido sobre `.values()`
+    """
+    help = 'Mede a serialização de /api/cupcakes/ com 20, 200 e 2000 linhas (dados descartados ao final)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tamanhos',
+            type=int,
+            nargs='+',
+            default=[20, 200, 2000],
+            help='Quantidades de linhas medidas (padrão: 20 200 2000)'
+        )
+        parser.add_argument(
+            '--repeticoes',
+            type=int,
+            default=5,
+            help='Execuções por medida; vale o melhor tempo (padrão: 5)'
+        )
+
+    def handle(self, *args, **options):
+        if options['repeticoes'] < 1 or min(options['tamanhos']) < 1:
+            raise CommandError('Tamanhos e repetições devem ser maiores que zero')
+
+        # Os dados de teste vivem só dentro desta transação
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['benchmark.local']):
+            ids = self._criar_cupcakes(max(options['tamanhos']))
+            request = RequestFactory().get('/api/cupcakes/', HTTP_HOST='benchmark.local')
+            contexto = {'request': request}
+
+            self.stdout.write(f"{'linhas':>8} {'instâncias':>12} {'rápido':>12} {'ganho':>7} {'queries':>9}")
+            for tamanho in options['tamanhos']:
+                queryset = Cupcake.objects.filter(id__in=ids[:tamanho]).order_by('id')
+
+                def por_instancias():
+                    return CupcakeListSerializer(list(queryset.all()), many=True, context=contexto).data
+
+                def rapido():
+                    return CupcakeListSerializer(queryset.all(), many=True, context=contexto).data
+
+                tempo_antigo, queries_antigo, saida_antiga = self._medir(por_instancias, options['repeticoes'])
+                tempo_novo, queries_novo, saida_nova = self._medir(rapido, options['repeticoes'])
+
+                if JSONRenderer().render(saida_antiga) != JSONRenderer().render(saida_nova):
+                    raise CommandError(f'Saídas diferentes com {tamanho} linhas')
+
+                self.stdout.write(
+                    f"{tamanho:>8} {tempo_antigo * 1000:>10.2f}ms {tempo_novo * 1000:>10.2f}ms "
+                    f"{tempo_antigo / tempo_novo:>6.1f}x {queries_antigo:>4}/{queries_novo:<4}"
+                )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Saídas idênticas em todos os tamanhos'))
+
+    @staticmethod
+    def _criar_cupcakes(quantidade):
+        """
+        Cria cupcakes temporários (metade com imagem enviada)
+
+        Returns:
+            list: IDs criados, em ordem
+        """
+        categoria = Categoria.objects.create(nome='Benchmark', slug='benchmark')
+        Cupcake.objects.bulk_create([
+            Cupcake(
+                nome=f'Cupcake de Maçã {indice}',
+                slug=f'benchmark-{indice}',
+                descricao='Massa de baunilha com cobertura de maçã caramelizada',
+                preco=Decimal('8.50') + indice % 7,
+                categoria=categoria,
+                imagem=f'cupcakes/benchmark-{indice}.jpg' if indice % 2 else None,
+                imagem_url=None if indice % 2 else f'https://cdn.exemplo.com/{indice}.jpg',
+                destaque=indice % 3 == 0,
+                estoque=indice % 4,
+                # bulk_create não chama save()
+                disponivel=indice % 4 > 0
+            )
+            for indice in range(quantidade)
+        ], batch_size=500)
+        return list(
+            Cupcake.objects.filter(categoria=categoria).order_by('id').values_list('id', flat=True)
+        )
+
+    @staticmethod
+    def _medir(funcao, repeticoes):
+        """
+        Executa a função várias vezes e retorna o melhor tempo
+
+        Returns:
+            tuple: (segundos, queries de uma execução, resultado)
+        """
+        # O log de queries é limitado; limpá-lo mantém a contagem correta
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as consultas:
+            resultado = funcao()
+
+        melhor = None
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            duracao = time.perf_counter() - inicio
+            melhor = duracao if melhor is None else min(melhor, duracao)
+        return melhor, len(consultas), resultado
@@ -0,0 +1,84 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from cupcakes_api.models import Cupcake
+from cupcakes_api.services import CatalogoCacheService, ImagemService
+
+
+def _iniciar_processo():
+    """Prepara o Django nos processos criados por spawn (ex: macOS)"""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _processar(cupcake_id, forcar):
+    resultado = ImagemService.processar_cupcake(cupcake_id, forcar=forcar)
+    return cupcake_id, resultado
+
+
+class Command(BaseCommand):
+    """
+    (Re)gera as variantes das imagens dos cupcakes em paralelo
+    """
+    help = 'Gera as miniaturas WebP/JPEG das imagens dos cupcakes usando vários processos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processos',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Quantidade de processos (padrão: número de CPUs)'
+        )
+        parser.add_argument(
+            '--ids',
+            type=int,
+            nargs='+',
+            help='IDs dos cupcakes a processar (padrão: todos com imagem)'
+        )
+        parser.add_argument(
+            '--forcar',
+            action='store_true',
+            help='Regera mesmo as variantes que já estão atualizadas'
+        )
+
+    def handle(self, *args, **options):
+        if options['processos'] < 1:
+            raise CommandError('A quantidade de processos deve ser maior que zero')
+
+        cupcakes = Cupcake.objects.all()
+        if options['ids']:
+            cupcakes = cupcakes.filter(pk__in=options['ids'])
+        else:
+            cupcakes = cupcakes.exclude(imagem='').exclude(imagem__isnull=True)
+        ids = list(cupcakes.order_by('pk').values_list('pk', flat=True))
+
+        if options['processos'] == 1:
+            resultados = [_processar(cupcake_id, options['forcar']) for cupcake_id in ids]
+        else:
+            # Os processos filhos não podem herdar conexões abertas
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options['processos'],
+                initializer=_iniciar_processo
+            ) as executor:
+                tarefas = [executor.submit(_processar, cupcake_id, options['forcar']) for cupcake_id in ids]
+                resultados = [tarefa.result() for tarefa in as_completed(tarefas)]
+
+        falhas = 0
+        for cupcake_id, resultado in sorted(resultados):
+            if not resultado['sucesso']:
+                falhas += 1
+                self.stderr.write(f"Cupcake {cupcake_id}: {resultado['mensagem']}")
+
+        # O cache local dos processos filhos não é o deste processo
+        CatalogoCacheService.invalidar()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(ids) - falhas} de {len(ids)} cupcakes processados'
+        ))
+        if falhas:
+            raise CommandError(f'{falhas} cupcakes falharam')
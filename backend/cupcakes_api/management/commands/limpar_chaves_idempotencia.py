@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from cupcakes_api.services import IdempotenciaService
+
+
+class Command(BaseCommand):
+    """
+    Remove as chaves de idempotência expiradas
+    """
+    help = 'Remove as respostas guardadas por Idempotency-Key que já expiraram'
+
+    def handle(self, *args, **options):
+        removidas = IdempotenciaService.limpar_expiradas()
+        self.stdout.write(self.style.SUCCESS(f'{removidas} chaves expiradas removidas'))
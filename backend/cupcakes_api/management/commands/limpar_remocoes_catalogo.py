@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from cupcakes_api.services import SincronizacaoCatalogoService
+
+
+class Command(BaseCommand):
+    """
+    Remove os registros de exclusão do catálogo fora do período de retenção
+    """
+    help = 'Remove os tombstones do catálogo mais antigos que CATALOGO_REMOCOES_RETENCAO_DIAS'
+
+    def handle(self, *args, **options):
+        removidos = SincronizacaoCatalogoService.limpar_remocoes_antigas()
+        self.stdout.write(self.style.SUCCESS(f'{removidos} registros de remoção antigos apagados'))
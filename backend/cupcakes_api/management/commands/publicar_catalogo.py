@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from cupcakes_api.services import SnapshotCatalogoService
+
+
+class Command(BaseCommand):
+    """
+    Publica o catálogo completo como arquivo estático
+    """
+    help = 'Gera STATIC_ROOT/catalogo/catalogo.<hash>.json (e .gz/.br) com os cupcakes e categorias ativos'
+
+    def handle(self, *args, **options):
+        resultado = SnapshotCatalogoService.publicar()
+        atual = SnapshotCatalogoService.obter_atual()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['mensagem']}: {atual['url']} "
+            f"({atual['cupcakes']} cupcakes, {atual['categorias']} categorias)"
+        ))
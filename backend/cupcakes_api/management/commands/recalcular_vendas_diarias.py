@@ -0,0 +1,46 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from cupcakes_api.services import VendaDiariaService
+
+
+class Command(BaseCommand):
+    """
+    Reconstrói a consolidação diária de vendas a partir dos pedidos
+    """
+    help = 'Recalcula a tabela vendas_diarias a partir de Pedido/ItemPedido, em lotes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-inicio',
+            help='Primeiro dia a recalcular (AAAA-MM-DD). Padrão: todo o histórico'
+        )
+        parser.add_argument(
+            '--data-fim',
+            help='Último dia a recalcular (AAAA-MM-DD). Padrão: todo o histórico'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=2000,
+            help='Quantidade de pedidos lidos por consulta (padrão: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            data_inicio = date.fromisoformat(options['data_inicio']) if options['data_inicio'] else None
+            data_fim = date.fromisoformat(options['data_fim']) if options['data_fim'] else None
+        except ValueError:
+            raise CommandError('Datas devem estar no formato AAAA-MM-DD')
+
+        if options['lote'] < 1:
+            raise CommandError('O tamanho do lote deve ser maior que zero')
+
+        resultado = VendaDiariaService.recalcular(
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            tamanho_lote=options['lote']
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['pedidos']} pedidos consolidados em {resultado['linhas']} linhas"
+        ))
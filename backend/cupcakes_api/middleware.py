@@ -0,0 +1,135 @@
+import gzip
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+
+def codificacoes_aceitas(accept_encoding):
+    """
+    Lê o header Accept-Encoding com seus pesos (q)
+
+    Args:
+        accept_encoding (str): Valor do header
+
+    Returns:
+        dict: Codificação -> peso (0 significa recusada)
+    """
+    aceitas = {}
+    for item in (accept_encoding or '').split(','):
+        partes = [parte.strip() for parte in item.split(';')]
+        nome = partes[0].lower()
+        if not nome:
+            continue
+        peso = 1.0
+        for parametro in partes[1:]:
+            chave, _, valor = parametro.partition('=')
+            if chave.strip().lower() == 'q':
+                try:
+                    peso = float(valor)
+                except ValueError:
+                    peso = 0.0
+        aceitas[nome] = peso
+    return aceitas
+
+
+def escolher_codificacao(accept_encoding):
+    """
+    Escolhe a codificação da resposta: brotli (se disponível) ou gzip
+
+    Args:
+        accept_encoding (str): Valor do header Accept-Encoding
+
+    Returns:
+        str|None: 'br', 'gzip' ou None para não comprimir
+    """
+    aceitas = codificacoes_aceitas(accept_encoding)
+    curinga = aceitas.get('*', 0)
+    candidatas = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    melhor = None
+    melhor_peso = 0
+    for codificacao in candidatas:
+        peso = aceitas.get(codificacao, curinga)
+        # Em empate vale a ordem de preferência do servidor (br antes de gzip)
+        if peso > melhor_peso:
+            melhor, melhor_peso = codificacao, peso
+    return melhor
+
+
+def comprimir(conteudo, codificacao, nivel=None):
+    """
+    Comprime o conteúdo na codificação indicada
+
+    Args:
+        conteudo (bytes): Corpo da resposta
+        codificacao (str): 'br' ou 'gzip'
+        nivel (int, optional): Nível de compressão (padrão: o das settings)
+
+    Returns:
+        bytes: Conteúdo comprimido
+    """
+    if codificacao == 'br':
+        if nivel is None:
+            nivel = settings.COMPRESSAO_NIVEL_BROTLI
+        return brotli.compress(conteudo, mode=brotli.MODE_TEXT, quality=nivel)
+
+    if nivel is None:
+        nivel = settings.COMPRESSAO_NIVEL_GZIP
+    # mtime fixo para que o mesmo conteúdo gere sempre os mesmos bytes
+    return gzip.compress(conteudo, compresslevel=nivel, mtime=0)
+
+
+class CompressaoRespostaMiddleware:
+    """
+    Comprime respostas da API com brotli ou gzip conforme o Accept-Encoding
+
+    Só comprime respostas não-streaming, com tipo de conteúdo listado em
+    COMPRESSAO_TIPOS e corpo de pelo menos COMPRESSAO_TAMANHO_MINIMO bytes.
+    Respostas que usaram o token CSRF nunca são comprimidas (BREACH).
+    Arquivos estáticos continuam com o WhiteNoise, que já os serve
+    pré-comprimidos.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+            or len(response.content) < settings.COMPRESSAO_TAMANHO_MINIMO
+        ):
+            return response
+
+        tipo = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if tipo not in settings.COMPRESSAO_TIPOS:
+            return response
+
+        # A resposta depende do Accept-Encoding mesmo quando não é comprimida
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        codificacao = escolher_codificacao(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if codificacao is None:
+            return response
+
+        comprimido = comprimir(response.content, codificacao)
+        if len(comprimido) >= len(response.content):
+            return response
+
+        response.content = comprimido
+        response['Content-Length'] = str(len(comprimido))
+        response['Content-Encoding'] = codificacao
+
+        # Os bytes mudaram: a ETag forte passa a ser fraca (RFC 9110, 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        return response
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cupcakes_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.DateField()),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('recebido', 'Recebido'), ('em_preparo', 'Em Preparo'), ('pronto', 'Pronto'), ('saiu_entrega', 'Saiu para Entrega'), ('entregue', 'Entregue'), ('cancelado', 'Cancelado')], max_length=20)),
+                ('tipo_entrega', models.CharField(choices=[('entrega', 'Entrega'), ('retirada', 'Retirada')], max_length=20)),
+                ('total_pedidos', models.IntegerField(default=0)),
+                ('total_vendas', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_descontos', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_frete', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('itens_vendidos', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Venda Diária',
+                'verbose_name_plural': 'Vendas Diárias',
+                'db_table': 'vendas_diarias',
+                'ordering': ['-data', 'status', 'tipo_entrega'],
+                'unique_together': {('data', 'status', 'tipo_entrega')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cupcakes_api', '0003_chave_idempotencia'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cupcake',
+            index=models.Index(fields=['-created_at', '-id'], name='cupcakes_created_6783d4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cupcake',
+            index=models.Index(fields=['ativo', '-created_at', '-id'], name='cupcakes_ativo_01c2ec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pagamento',
+            index=models.Index(fields=['-created_at', '-id'], name='pagamentos_created_3c9d27_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['-created_at', '-id'], name='pedidos_created_ad62fb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['usuario', '-created_at', '-id'], name='pedidos_usuario_fc4159_idx'),
+        ),
+    ]
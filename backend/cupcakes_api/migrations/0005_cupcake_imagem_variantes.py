@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cupcakes_api', '0004_indices_paginacao_cursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cupcake',
+            name='imagem_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
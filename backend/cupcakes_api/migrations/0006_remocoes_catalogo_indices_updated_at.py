@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:28
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cupcakes_api', '0005_cupcake_imagem_variantes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RemocaoCatalogo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('cupcake', 'Cupcake'), ('categoria', 'Categoria')], max_length=20)),
+                ('objeto_id', models.BigIntegerField()),
+                ('categoria_id', models.BigIntegerField(blank=True, null=True)),
+                ('removido_em', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Remoção do Catálogo',
+                'verbose_name_plural': 'Remoções do Catálogo',
+                'db_table': 'remocoes_catalogo',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='categoria',
+            index=models.Index(fields=['updated_at'], name='categorias_updated_f9309b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cupcake',
+            index=models.Index(fields=['updated_at'], name='cupcakes_updated_500155_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='remocaocatalogo',
+            index=models.Index(fields=['removido_em'], name='remocoes_ca_removid_584c14_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='remocaocatalogo',
+            unique_together={('tipo', 'objeto_id')},
+        ),
+    ]
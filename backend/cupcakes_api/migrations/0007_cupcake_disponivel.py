@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+def preencher_disponivel(apps, schema_editor):
+    Cupcake = apps.get_model('cupcakes_api', 'Cupcake')
+    Cupcake.objects.filter(ativo=True, estoque__gt=0).update(disponivel=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cupcakes_api', '0006_remocoes_catalogo_indices_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cupcake',
+            name='disponivel',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(preencher_disponivel, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='cupcake',
+            index=models.Index(condition=models.Q(('disponivel', True)), fields=['-destaque', 'nome'], name='cupcakes_disponiveis_idx'),
+        ),
+    ]
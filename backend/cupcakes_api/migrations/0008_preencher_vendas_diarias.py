@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def preencher_vendas_diarias(apps, schema_editor):
+    # Mesmo recálculo em lotes do comando recalcular_vendas_diarias, com os
+    # modelos históricos: as estatísticas leem só a consolidação
+    from cupcakes_api.services.venda_diaria_service import VendaDiariaService
+
+    VendaDiariaService.recalcular(modelos=(
+        apps.get_model('cupcakes_api', 'Pedido'),
+        apps.get_model('cupcakes_api', 'VendaDiaria'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cupcakes_api', '0007_cupcake_disponivel'),
+    ]
+
+    operations = [
+        migrations.RunPython(preencher_vendas_diarias, migrations.RunPython.noop),
+    ]
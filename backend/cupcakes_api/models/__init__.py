@@ -4,6 +4,9 @@ from .carrinho import Carrinho, ItemCarrinho
 from .cupom import Cupom
 from .pedido import Pedido, ItemPedido
 from .pagamento import Pagamento
+from .venda_diaria import VendaDiaria
+from .idempotencia import ChaveIdempotencia
+from .remocao_catalogo import RemocaoCatalogo
 
 __all__ = [
     'Categoria',
@@ -13,5 +16,8 @@ __all__ = [
     'Cupom',
     'Pedido',
     'ItemPedido',
-    'Pagamento'
+    'Pagamento',
+    'VendaDiaria',
+    'ChaveIdempotencia',
+    'RemocaoCatalogo'
 ]
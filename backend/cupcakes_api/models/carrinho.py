@@ -1,4 +1,7 @@
+from decimal import Decimal
 from django.db import models
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
 from .cupcake import Cupcake
@@ -24,15 +27,58 @@ class Carrinho(models.Model):
     def __str__(self):
         return f"Carrinho de {self.usuario.username}"
 
+    @staticmethod
+    def expressoes_totais(prefixo='itens__'):
+        """
+        Agregações SQL do total de itens e do subtotal do carrinho
+
+        Args:
+            prefixo (str): Caminho até ItemCarrinho ('itens__' a partir do
+                carrinho, '' a partir dos próprios itens)
+
+        Returns:
+            dict: Nome da anotação -> expressão
+        """
+        return {
+            'total_itens_calculado': Coalesce(Sum(f'{prefixo}quantidade'), Value(0)),
+            'subtotal_calculado': Coalesce(
+                Sum(
+                    F(f'{prefixo}quantidade') * F(f'{prefixo}cupcake__preco'),
+                    output_field=models.DecimalField(max_digits=10, decimal_places=2)
+                ),
+                Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2)
+            ),
+        }
+
+    def _totais(self):
+        """
+        Total de itens e subtotal, sem repetir consultas
+
+        Usa, nesta ordem: as anotações de expressoes_totais() (carrinho
+        carregado por CarrinhoService.carregar_carrinho), os itens já
+        pré-carregados ou uma única agregação no banco.
+        """
+        if not hasattr(self, 'total_itens_calculado'):
+            if 'itens' in getattr(self, '_prefetched_objects_cache', {}):
+                itens = self.itens.all()
+                self.total_itens_calculado = sum(item.quantidade for item in itens)
+                self.subtotal_calculado = sum((item.subtotal for item in itens), Decimal('0.00'))
+            else:
+                totais = self.itens.aggregate(**Carrinho.expressoes_totais(prefixo=''))
+                self.total_itens_calculado = totais['total_itens_calculado']
+                self.subtotal_calculado = totais['subtotal_calculado']
+        return self.total_itens_calculado, self.subtotal_calculado
+
     @property
     def total_itens(self):
         """Retorna o total de itens no carrinho"""
-        return sum(item.quantidade for item in self.itens.all())
+        return self._totais()[0]
 
     @property
     def subtotal(self):
         """Calcula o subtotal do carrinho"""
-        return sum(item.subtotal for item in self.itens.all())
+        return self._totais()[1]
 
     def limpar(self):
         """Remove todos os itens do carrinho"""
@@ -17,6 +17,10 @@ class Categoria(models.Model):
         verbose_name = 'Categoria'
         verbose_name_plural = 'Categorias'
         ordering = ['nome']
+        indexes = [
+            # Sincronização incremental (/api/cupcakes/mudancas/)
+            models.Index(fields=['updated_at']),
+        ]
 
     def __str__(self):
         return self.nome
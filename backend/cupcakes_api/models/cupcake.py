@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
 from django.core.validators import MinValueValidator
 from .categoria import Categoria
 
@@ -22,9 +24,14 @@ class Cupcake(models.Model):
     )
     imagem_url = models.URLField(max_length=500, blank=True, null=True)
     imagem = models.ImageField(upload_to='cupcakes/', blank=True, null=True)
+    # Variantes redimensionadas de `imagem`, mantidas pelo ImagemService:
+    # {'origem': nome, 'webp': {'320': nome_arquivo, ...}, 'jpeg': {...}}
+    imagem_variantes = models.JSONField(default=dict, blank=True, editable=False)
     destaque = models.BooleanField(default=False)
     ativo = models.BooleanField(default=True)
     estoque = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    # ativo and estoque > 0, mantido em save() e nos UPDATEs de estoque
+    disponivel = models.BooleanField(default=False, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -36,20 +43,74 @@ class Cupcake(models.Model):
         indexes = [
             models.Index(fields=['categoria', 'ativo']),
             models.Index(fields=['destaque']),
+            # Chaves da paginação por cursor (-created_at, -id)
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['ativo', '-created_at', '-id']),
+            # Sincronização incremental (/api/cupcakes/mudancas/)
+            models.Index(fields=['updated_at']),
+            # Índice parcial: só os cupcakes à venda, na ordem da listagem
+            models.Index(
+                fields=['-destaque', 'nome'],
+                condition=Q(disponivel=True),
+                name='cupcakes_disponiveis_idx'
+            ),
         ]
 
     def __str__(self):
         return self.nome
 
-    @property
-    def disponivel(self):
-        """Verifica se o cupcake está disponível para venda"""
-        return self.ativo and self.estoque > 0
+    def save(self, *args, **kwargs):
+        """Recalcula a coluna `disponivel` antes de gravar"""
+        self.disponivel = self.ativo and self.estoque > 0
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'ativo', 'estoque'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'disponivel'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def disponivel_apos(variacao):
+        """
+        Expressão de `disponivel` para um UPDATE que soma `variacao` ao estoque
+
+        No UPDATE as expressões leem os valores anteriores da linha, então
+        a condição compara o estoque atual com -variacao.
+
+        Args:
+            variacao (int): Unidades somadas ao estoque (negativo para reduzir)
+
+        Returns:
+            Case: Expressão para o .update()
+        """
+        return Case(
+            When(Q(ativo=True) & Q(estoque__gt=-variacao), then=Value(True)),
+            default=Value(False)
+        )
 
     def reduzir_estoque(self, quantidade):
-        """Reduz o estoque do cupcake"""
-        if self.estoque >= quantidade:
+        """
+        Reduz o estoque do cupcake
+
+        Usa um único UPDATE condicional (estoque = estoque - n WHERE
+        estoque >= n), de modo que checkouts concorrentes não vendam além do
+        estoque. O UPDATE não dispara sinais de post_save.
+        """
+        atualizados = Cupcake.objects.filter(pk=self.pk, estoque__gte=quantidade).update(
+            estoque=F('estoque') - quantidade,
+            disponivel=Cupcake.disponivel_apos(-quantidade),
+            updated_at=timezone.now()
+        )
+        if atualizados:
             self.estoque -= quantidade
-            self.save()
+            self.disponivel = self.ativo and self.estoque > 0
             return True
         return False
+
+    def repor_estoque(self, quantidade):
+        """Devolve unidades ao estoque do cupcake (UPDATE atômico)"""
+        Cupcake.objects.filter(pk=self.pk).update(
+            estoque=F('estoque') + quantidade,
+            disponivel=Cupcake.disponivel_apos(quantidade),
+            updated_at=timezone.now()
+        )
+        self.estoque += quantidade
+        self.disponivel = self.ativo and self.estoque > 0
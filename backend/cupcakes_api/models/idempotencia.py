@@ -0,0 +1,34 @@
+from django.db import models
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class ChaveIdempotencia(models.Model):
+    """
+    Model para chaves de idempotência (header Idempotency-Key)
+
+    Guarda a resposta da primeira execução de uma requisição para que
+    repetições com a mesma chave devolvam o mesmo resultado sem executar a
+    operação de novo.
+    """
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='chaves_idempotencia'
+    )
+    chave = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=100)
+    hash_requisicao = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    resposta = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expira_em = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'chaves_idempotencia'
+        verbose_name = 'Chave de Idempotência'
+        verbose_name_plural = 'Chaves de Idempotência'
+        unique_together = ['usuario', 'endpoint', 'chave']
+
+    def __str__(self):
+        return f"{self.endpoint} - {self.chave}"
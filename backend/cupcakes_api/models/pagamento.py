@@ -70,6 +70,10 @@ class Pagamento(models.Model):
         verbose_name = 'Pagamento'
         verbose_name_plural = 'Pagamentos'
         ordering = ['-created_at']
+        indexes = [
+            # Chave da paginação por cursor (-created_at, -id)
+            models.Index(fields=['-created_at', '-id']),
+        ]
 
     def __str__(self):
         return f"Pagamento {self.metodo_pagamento} - Pedido #{self.pedido.numero_pedido}"
@@ -100,6 +100,9 @@ class Pedido(models.Model):
         indexes = [
             models.Index(fields=['usuario', 'status']),
             models.Index(fields=['numero_pedido']),
+            # Chaves da paginação por cursor (-created_at, -id)
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['usuario', '-created_at', '-id']),
         ]
 
     def __str__(self):
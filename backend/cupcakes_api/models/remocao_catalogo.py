@@ -0,0 +1,35 @@
+from django.db import models
+from django.utils import timezone
+
+
+class RemocaoCatalogo(models.Model):
+    """
+    Model de registros de remoção (tombstones) do catálogo
+
+    Guarda o ID de cupcakes e categorias excluídos para que a sincronização
+    incremental (`/api/cupcakes/mudancas/`) informe aos clientes o que
+    apagar da cópia local. Desativações não precisam de registro: o objeto
+    continua no banco com o updated_at atualizado.
+    """
+    TIPO_CHOICES = [
+        ('cupcake', 'Cupcake'),
+        ('categoria', 'Categoria')
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES)
+    objeto_id = models.BigIntegerField()
+    # Categoria do cupcake removido (os totais dela mudaram)
+    categoria_id = models.BigIntegerField(null=True, blank=True)
+    removido_em = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'remocoes_catalogo'
+        verbose_name = 'Remoção do Catálogo'
+        verbose_name_plural = 'Remoções do Catálogo'
+        unique_together = ['tipo', 'objeto_id']
+        indexes = [
+            models.Index(fields=['removido_em']),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} #{self.objeto_id} ({self.removido_em:%d/%m/%Y %H:%M})"
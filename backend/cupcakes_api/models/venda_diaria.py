@@ -0,0 +1,31 @@
+from django.db import models
+from .pedido import Pedido
+
+
+class VendaDiaria(models.Model):
+    """
+    Model de consolidação diária de vendas
+
+    Cada linha acumula os pedidos de um dia para uma combinação de status e
+    tipo de entrega. É mantida incrementalmente pelo PedidoService e pode ser
+    reconstruída com o comando `recalcular_vendas_diarias`.
+    """
+    data = models.DateField()
+    status = models.CharField(max_length=20, choices=Pedido.STATUS_CHOICES)
+    tipo_entrega = models.CharField(max_length=20, choices=Pedido.TIPO_ENTREGA_CHOICES)
+    total_pedidos = models.IntegerField(default=0)
+    total_vendas = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_descontos = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_frete = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    itens_vendidos = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'vendas_diarias'
+        verbose_name = 'Venda Diária'
+        verbose_name_plural = 'Vendas Diárias'
+        ordering = ['-data', 'status', 'tipo_entrega']
+        unique_together = ['data', 'status', 'tipo_entrega']
+
+    def __str__(self):
+        return f"{self.data:%d/%m/%Y} - {self.status} ({self.tipo_entrega})"
@@ -0,0 +1,59 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class PaginacaoPorCursor(CursorPagination):
+    """
+    Paginação por cursor (keyset) ordenada por (-created_at, -id)
+
+    Cada página é buscada a partir da posição da anterior, sem COUNT(*) e
+    sem OFFSET, então páginas profundas custam o mesmo que a primeira.
+    """
+    ordering = ('-created_at', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Usa sempre a ordenação da chave do cursor
+
+        A ordenação padrão dos ViewSets (ex: '-destaque', 'nome') não é uma
+        chave estável para o cursor, por isso o OrderingFilter é ignorado.
+        """
+        return self.ordering
+
+
+class PaginacaoCursorOpcional(PageNumberPagination):
+    """
+    Paginação por número de página com modo cursor opcional
+
+    Por padrão mantém o formato atual (count, next, previous, results).
+    Requisições com `?paginacao=cursor` (ou que já trazem `?cursor=`)
+    usam a PaginacaoPorCursor.
+    """
+    cursor_class = PaginacaoPorCursor
+    paginador_cursor = None
+
+    def usa_cursor(self, request):
+        """Verifica se a requisição pediu o modo cursor"""
+        return (
+            request.query_params.get('paginacao') == 'cursor'
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.usa_cursor(request):
+            self.paginador_cursor = self.cursor_class()
+            pagina = self.paginador_cursor.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.paginador_cursor.display_page_controls
+            return pagina
+
+        self.paginador_cursor = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.paginador_cursor is not None:
+            return self.paginador_cursor.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.paginador_cursor is not None:
+            return self.paginador_cursor.to_html()
+        return super().to_html()
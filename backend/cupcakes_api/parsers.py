@@ -0,0 +1,33 @@
+import codecs
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from cupcakes_api.renderers import JSONRapidoRenderer, orjson
+
+
+class JSONRapidoParser(JSONParser):
+    """
+    Parser JSON baseado em orjson (mesmo comportamento do JSONParser)
+
+    Sem o orjson instalado, usa o JSONParser padrão.
+    """
+
+    renderer_class = JSONRapidoRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Converte o corpo JSON da requisição em dados Python
+        """
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            conteudo = stream.read()
+            if codecs.lookup(encoding).name != 'utf-8':
+                conteudo = conteudo.decode(encoding)
+            return orjson.loads(conteudo)
+        except (ValueError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,57 @@
+import datetime
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+# Datetimes vão para o encoder (DATETIME_FORMAT); chaves não-texto viram texto
+OPCOES_ORJSON = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+class JSONEncoderAPI(encoders.JSONEncoder):
+    """
+    Encoder JSON do DRF com datetimes no DATETIME_FORMAT da API
+
+    Datetimes soltos (ex: em dicionários montados pelos serviços) saem no
+    mesmo formato e fuso dos campos DateTimeField dos serializers.
+    """
+
+    campo_data_hora = serializers.DateTimeField()
+
+    def default(self, obj):
+        if isinstance(obj, datetime.datetime):
+            return self.campo_data_hora.to_representation(obj)
+        return super().default(obj)
+
+
+class JSONRapidoRenderer(JSONRenderer):
+    """
+    Renderer JSON baseado em orjson, com a mesma saída do JSONRenderer
+
+    Tipos que o orjson não serializa sozinho (Decimal, textos traduzíveis,
+    datetimes no DATETIME_FORMAT etc.) passam pelo JSONEncoderAPI. Saídas
+    indentadas (ex: API navegável) e a ausência do orjson usam o
+    JSONRenderer padrão com o mesmo encoder.
+    """
+
+    encoder_class = JSONEncoderAPI
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Renderiza `data` em JSON, retornando bytes
+        """
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=OPCOES_ORJSON)
+
+        # Mesmo escape do JSONRenderer: \u2028 e \u2029 não são válidos em JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
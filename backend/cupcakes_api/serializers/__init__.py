@@ -1,8 +1,19 @@
 from .categoria_serializer import CategoriaSerializer
-from .cupcake_serializer import CupcakeSerializer, CupcakeListSerializer
-from .carrinho_serializer import CarrinhoSerializer, ItemCarrinhoSerializer, AdicionarItemCarrinhoSerializer
+from .cupcake_serializer import CupcakeSerializer, CupcakeListSerializer, CupcakeListaRapidaSerializer
+from .carrinho_serializer import (
+    CarrinhoSerializer,
+    ItemCarrinhoSerializer,
+    AdicionarItemCarrinhoSerializer,
+    OperacaoCarrinhoSerializer,
+    SincronizarCarrinhoSerializer
+)
 from .cupom_serializer import CupomSerializer, ValidarCupomSerializer
-from .pedido_serializer import PedidoSerializer, ItemPedidoSerializer, CriarPedidoSerializer
+from .pedido_serializer import (
+    PedidoSerializer,
+    ItemPedidoSerializer,
+    CriarPedidoSerializer,
+    EstatisticasPedidosSerializer
+)
 from .pagamento_serializer import PagamentoSerializer
 from .auth_serializer import RegistroSerializer, LoginSerializer, UsuarioSerializer
 
@@ -10,14 +21,18 @@ __all__ = [
     'CategoriaSerializer',
     'CupcakeSerializer',
     'CupcakeListSerializer',
+    'CupcakeListaRapidaSerializer',
     'CarrinhoSerializer',
     'ItemCarrinhoSerializer',
     'AdicionarItemCarrinhoSerializer',
+    'OperacaoCarrinhoSerializer',
+    'SincronizarCarrinhoSerializer',
     'CupomSerializer',
     'ValidarCupomSerializer',
     'PedidoSerializer',
     'ItemPedidoSerializer',
     'CriarPedidoSerializer',
+    'EstatisticasPedidosSerializer',
     'PagamentoSerializer',
     'RegistroSerializer',
     'LoginSerializer',
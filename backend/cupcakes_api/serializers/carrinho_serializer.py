@@ -1,8 +1,10 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
-from cupcakes_api.models import Carrinho, ItemCarrinho, Cupcake
+from cupcakes_api.models import Carrinho, ItemCarrinho
+from .mixins import CamposDinamicosMixin
 
 
-class ItemCarrinhoSerializer(serializers.ModelSerializer):
+class ItemCarrinhoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para itens do carrinho
     """
@@ -38,7 +40,7 @@ class ItemCarrinhoSerializer(serializers.ModelSerializer):
         return obj.cupcake.imagem_url
 
 
-class CarrinhoSerializer(serializers.ModelSerializer):
+class CarrinhoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para o carrinho de compras
     """
@@ -55,27 +57,65 @@ class CarrinhoSerializer(serializers.ModelSerializer):
         fields = ['id', 'usuario', 'itens', 'total_itens', 'subtotal', 'created_at', 'updated_at']
         read_only_fields = ['id', 'usuario', 'created_at', 'updated_at']
 
+    dependencias_campos = {'total_itens': (), 'subtotal': ()}
+
+    @staticmethod
+    def otimizar_queryset(queryset, campos=None):
+        """
+        Aplica o plano de carregamento usado na serialização do carrinho
+
+        Os totais saem agregados na mesma consulta do carrinho e os itens,
+        com seus cupcakes, em uma consulta extra, qualquer que seja o número
+        de itens.
+
+        Args:
+            queryset (QuerySet): Carrinhos
+            campos (list, optional): Campos solicitados (?fields=/?omit=);
+                sem `itens` o prefetch não é feito
+        """
+        queryset = queryset.annotate(**Carrinho.expressoes_totais())
+        if campos is not None and 'itens' not in campos:
+            return queryset
+        return queryset.prefetch_related(
+            Prefetch(
+                'itens',
+                queryset=ItemCarrinho.objects.select_related('cupcake').order_by('created_at', 'id')
+            )
+        )
+
 
 class AdicionarItemCarrinhoSerializer(serializers.Serializer):
     """
     Serializer para adicionar itens ao carrinho
+
+    Disponibilidade e estoque são verificados pelo CarrinhoService no
+    mesmo comando que grava o item.
     """
     cupcake_id = serializers.IntegerField()
     quantidade = serializers.IntegerField(min_value=1, default=1)
 
-    def validate_cupcake_id(self, value):
-        try:
-            cupcake = Cupcake.objects.get(id=value)
-            if not cupcake.disponivel:
-                raise serializers.ValidationError("Este cupcake não está disponível.")
-        except Cupcake.DoesNotExist:
-            raise serializers.ValidationError("Cupcake não encontrado.")
-        return value
+
+class OperacaoCarrinhoSerializer(serializers.Serializer):
+    """
+    Uma operação da sincronização do carrinho
+
+    set: define a quantidade (0 remove), add: soma à quantidade,
+    remove: tira o cupcake do carrinho
+    """
+    op = serializers.ChoiceField(choices=['set', 'add', 'remove'])
+    cupcake_id = serializers.IntegerField()
+    quantidade = serializers.IntegerField(min_value=0, default=1)
 
     def validate(self, data):
-        cupcake = Cupcake.objects.get(id=data['cupcake_id'])
-        if cupcake.estoque < data['quantidade']:
-            raise serializers.ValidationError(
-                f"Quantidade solicitada ({data['quantidade']}) excede o estoque disponível ({cupcake.estoque})."
-            )
+        if data['op'] == 'add' and data['quantidade'] < 1:
+            raise serializers.ValidationError({'quantidade': 'Informe ao menos 1 unidade.'})
         return data
+
+
+class SincronizarCarrinhoSerializer(serializers.Serializer):
+    """
+    Serializer para aplicar várias operações no carrinho de uma vez
+    """
+    operacoes = OperacaoCarrinhoSerializer(many=True, max_length=100)
+    # Remove do carrinho os cupcakes que não aparecem nas operações
+    substituir = serializers.BooleanField(default=False)
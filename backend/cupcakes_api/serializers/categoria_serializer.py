@@ -1,17 +1,62 @@
+from django.db.models import Count, Max, Min, Q
 from rest_framework import serializers
 from cupcakes_api.models import Categoria
+from .mixins import CamposDinamicosMixin
 
 
-class CategoriaSerializer(serializers.ModelSerializer):
+class CategoriaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para o modelo Categoria
     """
-    total_cupcakes = serializers.SerializerMethodField()
+    total_cupcakes = serializers.IntegerField(read_only=True)
+    cupcakes_em_estoque = serializers.IntegerField(read_only=True)
+    preco_minimo = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    preco_maximo = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
 
     class Meta:
         model = Categoria
-        fields = ['id', 'nome', 'slug', 'descricao', 'ativo', 'total_cupcakes', 'created_at', 'updated_at']
+        fields = [
+            'id', 'nome', 'slug', 'descricao', 'ativo', 'total_cupcakes',
+            'cupcakes_em_estoque', 'preco_minimo', 'preco_maximo',
+            'created_at', 'updated_at'
+        ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-    def get_total_cupcakes(self, obj):
-        return obj.cupcakes.filter(ativo=True).count()
+    # Totais anotados por otimizar_queryset (não são colunas do model)
+    CAMPOS_TOTAIS = ('total_cupcakes', 'cupcakes_em_estoque', 'preco_minimo', 'preco_maximo')
+    dependencias_campos = {campo: () for campo in CAMPOS_TOTAIS}
+
+    @staticmethod
+    def otimizar_queryset(queryset, campos=None):
+        """
+        Anota os totais dos cupcakes ativos de cada categoria
+
+        Os valores saem de uma única consulta agrupada, em vez de uma
+        consulta por categoria durante a serialização. Consultas agrupadas não
+        usam o Meta.ordering, por isso a ordenação padrão é reaplicada.
+
+        Args:
+            queryset (QuerySet): Categorias
+            campos (list, optional): Campos solicitados (?fields=/?omit=);
+                sem nenhum total o agrupamento não é feito
+        """
+        if campos is not None and not set(campos) & set(CategoriaSerializer.CAMPOS_TOTAIS):
+            return queryset
+        if not queryset.query.order_by:
+            queryset = queryset.order_by(*Categoria._meta.ordering)
+        ativos = Q(cupcakes__ativo=True)
+        return queryset.annotate(
+            total_cupcakes=Count('cupcakes', filter=ativos),
+            cupcakes_em_estoque=Count('cupcakes', filter=Q(cupcakes__disponivel=True)),
+            preco_minimo=Min('cupcakes__preco', filter=ativos),
+            preco_maximo=Max('cupcakes__preco', filter=ativos)
+        )
+
+    def to_representation(self, instance):
+        # Instâncias que não vieram do queryset anotado (ex: resposta de
+        # create/update) são recarregadas com os totais
+        if not hasattr(instance, 'total_cupcakes') and set(self.fields) & set(self.CAMPOS_TOTAIS):
+            instance = CategoriaSerializer.otimizar_queryset(
+                Categoria.objects.filter(pk=instance.pk)
+            ).get()
+        return super().to_representation(instance)
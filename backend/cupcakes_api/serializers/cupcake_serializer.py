@@ -1,22 +1,173 @@
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils.encoding import filepath_to_uri
 from rest_framework import serializers
 from cupcakes_api.models import Cupcake, Categoria
+from cupcakes_api.services.imagem_service import ImagemService
+from .mixins import CamposDinamicosMixin
 
 
-class CupcakeListSerializer(serializers.ModelSerializer):
+def srcset_imagem(cupcake, request=None):
+    """
+    Mapa formato -> srcset das variantes da imagem de um cupcake
+
+    Args:
+        cupcake (Cupcake): Instância do cupcake
+        request (Request, optional): Requisição, para URLs absolutas
+
+    Returns:
+        dict: srcset por formato (vazio se não houver variantes)
+    """
+    storage = Cupcake._meta.get_field('imagem').storage
+    if request:
+        return ImagemService.montar_srcset(
+            cupcake.imagem_variantes,
+            lambda nome: request.build_absolute_uri(storage.url(nome))
+        )
+    return ImagemService.montar_srcset(cupcake.imagem_variantes, storage.url)
+
+
+class CupcakeListaRapidaSerializer(serializers.ListSerializer):
+    """
+    Serializer de lista do CupcakeListSerializer com caminho rápido
+
+    Para querysets e linhas de `.values()` monta os dicionários diretamente,
+    a partir de uma projeção estreita com a categoria no mesmo JOIN, sem
+    instanciar models nem passar pelos campos do DRF em cada linha. O
+    prefixo absoluto das imagens é calculado uma vez por requisição. A
+    saída é idêntica à do CupcakeListSerializer; listas de instâncias
+    seguem o caminho normal.
+    """
+
+    CAMPOS = (
+        'id', 'nome', 'slug', 'descricao', 'preco', 'categoria__nome',
+        'categoria__slug', 'imagem', 'imagem_url', 'imagem_variantes', 'destaque', 'disponivel',
+        'created_at'
+    )
+
+    # Campo da resposta -> colunas da projeção que ele usa
+    COLUNAS = {
+        'id': ('id',),
+        'nome': ('nome',),
+        'slug': ('slug',),
+        'descricao': ('descricao',),
+        'preco': ('preco',),
+        'categoria_nome': ('categoria__nome',),
+        'categoria_slug': ('categoria__slug',),
+        'imagem': ('imagem', 'imagem_url'),
+        'imagem_srcset': ('imagem_variantes',),
+        'destaque': ('destaque',),
+        'disponivel': ('disponivel',),
+    }
+
+    @classmethod
+    def projetar(cls, queryset, campos=None):
+        """
+        Projeção usada pelo caminho rápido (inclui as chaves do cursor)
+
+        Args:
+            queryset (QuerySet): Cupcakes já filtrados e ordenados
+            campos (list, optional): Campos solicitados (?fields=/?omit=)
+
+        Returns:
+            QuerySet: Linhas como dicionários
+        """
+        if campos is None:
+            return queryset.values(*cls.CAMPOS)
+        colunas = {'id', 'created_at'}
+        for campo in campos:
+            colunas.update(cls.COLUNAS[campo])
+        return queryset.values(*(coluna for coluna in cls.CAMPOS if coluna in colunas))
+
+    def _montar_url_imagem(self):
+        """
+        Retorna a função que converte o nome do arquivo na URL da imagem
+        """
+        storage = Cupcake._meta.get_field('imagem').storage
+        request = self.context.get('request')
+
+        if request is None:
+            return storage.url
+        if isinstance(storage, FileSystemStorage) and storage.base_url.startswith('/'):
+            prefixo = request.build_absolute_uri(storage.base_url)
+            return lambda nome: prefixo + filepath_to_uri(nome).lstrip('/')
+        return lambda nome: request.build_absolute_uri(storage.url(nome))
+
+    def to_representation(self, data):
+        if isinstance(data, models.Manager):
+            data = data.all()
+        if isinstance(data, models.QuerySet):
+            data = self.projetar(data)
+
+        linhas = list(data)
+        if linhas and not isinstance(linhas[0], dict):
+            return super().to_representation(linhas)
+
+        url_imagem = self._montar_url_imagem()
+        preco = self.child.fields['preco'].to_representation if 'preco' in self.child.fields else None
+        if self.child.selecao_aplicada:
+            return self._representar_campos(linhas, list(self.child.fields), url_imagem, preco)
+        return [
+            {
+                'id': linha['id'],
+                'nome': linha['nome'],
+                'slug': linha['slug'],
+                'descricao': linha['descricao'],
+                'preco': preco(linha['preco']),
+                'categoria_nome': linha['categoria__nome'],
+                'categoria_slug': linha['categoria__slug'],
+                'imagem': url_imagem(linha['imagem']) if linha['imagem'] else linha['imagem_url'],
+                'imagem_srcset': ImagemService.montar_srcset(linha['imagem_variantes'], url_imagem),
+                'destaque': linha['destaque'],
+                'disponivel': linha['disponivel']
+            }
+            for linha in linhas
+        ]
+
+    @staticmethod
+    def _representar_campos(linhas, campos, url_imagem, preco):
+        """
+        Caminho rápido com campos esparsos: monta só os campos solicitados
+        """
+        montadores = {
+            'id': lambda linha: linha['id'],
+            'nome': lambda linha: linha['nome'],
+            'slug': lambda linha: linha['slug'],
+            'descricao': lambda linha: linha['descricao'],
+            'preco': lambda linha: preco(linha['preco']),
+            'categoria_nome': lambda linha: linha['categoria__nome'],
+            'categoria_slug': lambda linha: linha['categoria__slug'],
+            'imagem': lambda linha: url_imagem(linha['imagem']) if linha['imagem'] else linha['imagem_url'],
+            'imagem_srcset': lambda linha: ImagemService.montar_srcset(linha['imagem_variantes'], url_imagem),
+            'destaque': lambda linha: linha['destaque'],
+            'disponivel': lambda linha: linha['disponivel'],
+        }
+        montadores = [(campo, montadores[campo]) for campo in campos]
+        return [{campo: montar(linha) for campo, montar in montadores} for linha in linhas]
+
+
+class CupcakeListSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer simplificado para listagem de cupcakes
     """
     categoria_nome = serializers.CharField(source='categoria.nome', read_only=True)
     categoria_slug = serializers.CharField(source='categoria.slug', read_only=True)
     imagem = serializers.SerializerMethodField()
+    imagem_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Cupcake
         fields = [
             'id', 'nome', 'slug', 'descricao', 'preco',
-            'categoria_nome', 'categoria_slug', 'imagem',
+            'categoria_nome', 'categoria_slug', 'imagem', 'imagem_srcset',
             'destaque', 'disponivel'
         ]
+        list_serializer_class = CupcakeListaRapidaSerializer
+
+    dependencias_campos = {
+        'imagem': ('imagem', 'imagem_url'),
+        'imagem_srcset': ('imagem_variantes',),
+    }
 
     def get_imagem(self, obj):
         if obj.imagem:
@@ -26,24 +177,30 @@ class CupcakeListSerializer(serializers.ModelSerializer):
             return obj.imagem.url
         return obj.imagem_url
 
+    def get_imagem_srcset(self, obj):
+        return srcset_imagem(obj, self.context.get('request'))
 
-class CupcakeSerializer(serializers.ModelSerializer):
+
+class CupcakeSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer completo para o modelo Cupcake
     """
     categoria_nome = serializers.CharField(source='categoria.nome', read_only=True)
     imagem = serializers.SerializerMethodField()
+    imagem_srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = Cupcake
         fields = [
             'id', 'nome', 'slug', 'descricao', 'preco',
-            'categoria', 'categoria_nome', 'imagem_url', 'imagem',
+            'categoria', 'categoria_nome', 'imagem_url', 'imagem', 'imagem_srcset',
             'destaque', 'ativo', 'estoque', 'disponivel',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'disponivel', 'created_at', 'updated_at']
 
+    dependencias_campos = CupcakeListSerializer.dependencias_campos
+
     def get_imagem(self, obj):
         if obj.imagem:
             request = self.context.get('request')
@@ -52,6 +209,9 @@ class CupcakeSerializer(serializers.ModelSerializer):
             return obj.imagem.url
         return obj.imagem_url
 
+    def get_imagem_srcset(self, obj):
+        return srcset_imagem(obj, self.context.get('request'))
+
     def validate_preco(self, value):
         if value <= 0:
             raise serializers.ValidationError("O preço deve ser maior que zero.")
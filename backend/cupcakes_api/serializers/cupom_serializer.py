@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from cupcakes_api.models import Cupom
+from .mixins import CamposDinamicosMixin
 
 
-class CupomSerializer(serializers.ModelSerializer):
+class CupomSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para o modelo Cupom
     """
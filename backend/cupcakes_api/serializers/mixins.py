@@ -0,0 +1,125 @@
+import re
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+
+
+def arvore_campos(valor):
+    """
+    Converte a lista de campos da query string em árvore
+
+    Args:
+        valor (str): Ex: 'id,status,itens.quantidade'
+
+    Returns:
+        dict: Ex: {'id': {}, 'status': {}, 'itens': {'quantidade': {}}}
+    """
+    arvore = {}
+    for caminho in (valor or '').split(','):
+        no = arvore
+        for parte in caminho.split('.'):
+            parte = parte.strip()
+            if parte:
+                no = no.setdefault(parte, {})
+    return arvore
+
+
+class CamposDinamicosMixin:
+    """
+    Mixin de campos esparsos (?fields= / ?omit=) para ModelSerializers
+
+    Em requisições de leitura, `?fields=id,status` mantém só os campos
+    listados e `?omit=itens` remove campos; com ponto a seleção alcança os
+    serializers aninhados (`?fields=id,itens.quantidade`). Nomes
+    desconhecidos são ignorados. A view usa `restringir_queryset` para
+    carregar do banco apenas as colunas que os campos mantidos leem.
+    """
+
+    # Campo sem origem direta no model -> campos do model que ele lê
+    dependencias_campos = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.selecao_aplicada = False
+
+        request = self.context.get('request')
+        if request is not None and request.method in SAFE_METHODS:
+            parametros = getattr(request, 'query_params', request.GET)
+            campos = arvore_campos(parametros.get('fields'))
+            omitir = arvore_campos(parametros.get('omit'))
+            if campos or omitir:
+                self.aplicar_selecao(campos, omitir)
+
+    def aplicar_selecao(self, campos=None, omitir=None):
+        """
+        Remove os campos não solicitados (e repassa a seleção aos aninhados)
+
+        Args:
+            campos (dict, optional): Árvore de campos a manter (vazia = todos)
+            omitir (dict, optional): Árvore de campos a remover
+        """
+        campos = campos or {}
+        omitir = omitir or {}
+        self.selecao_aplicada = True
+
+        for nome in list(self.fields):
+            if (campos and nome not in campos) or omitir.get(nome) == {}:
+                self.fields.pop(nome)
+
+        for nome, campo in self.fields.items():
+            aninhado = getattr(campo, 'child', campo)
+            if isinstance(aninhado, CamposDinamicosMixin) and (campos.get(nome) or omitir.get(nome)):
+                aninhado.aplicar_selecao(campos.get(nome), omitir.get(nome))
+
+    def colunas_necessarias(self):
+        """
+        Campos do model lidos pelos campos mantidos
+
+        Returns:
+            list|None: Nomes para o .only(), ou None se algum campo não puder
+                ser resolvido (ex: SerializerMethodField sem dependências)
+        """
+        opcoes = self.Meta.model._meta
+        colunas = {opcoes.pk.name}
+
+        for nome, campo in self.fields.items():
+            if nome in self.dependencias_campos:
+                colunas.update(self.dependencias_campos[nome])
+                continue
+            if campo.source == '*':
+                return None
+
+            atributo = campo.source_attrs[0]
+            exibicao = re.fullmatch(r'get_(\w+)_display', atributo)
+            if exibicao:
+                atributo = exibicao.group(1)
+            try:
+                campo_model = opcoes.get_field(atributo)
+            except FieldDoesNotExist:
+                return None
+            # Relações reversas (ex: itens) vêm por prefetch, não por coluna
+            if campo_model.concrete:
+                colunas.add(campo_model.name)
+
+        return sorted(colunas)
+
+    def restringir_queryset(self, queryset):
+        """
+        Aplica .only() com as colunas dos campos mantidos
+
+        Sem seleção na requisição o queryset volta inalterado.
+
+        Args:
+            queryset (QuerySet): Queryset da view
+
+        Returns:
+            QuerySet: Queryset com as demais colunas adiadas
+        """
+        if not self.selecao_aplicada:
+            return queryset
+        colunas = self.colunas_necessarias()
+        if colunas is None:
+            return queryset
+        # Relações em select_related não podem ser adiadas
+        if isinstance(queryset.query.select_related, dict):
+            colunas.extend(queryset.query.select_related)
+        return queryset.only(*colunas)
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from cupcakes_api.models import Pagamento
+from .mixins import CamposDinamicosMixin
 
 
-class PagamentoSerializer(serializers.ModelSerializer):
+class PagamentoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para o modelo Pagamento
     """
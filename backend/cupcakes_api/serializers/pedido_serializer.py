@@ -1,8 +1,10 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from cupcakes_api.models import Pedido, ItemPedido
+from .mixins import CamposDinamicosMixin
 
 
-class ItemPedidoSerializer(serializers.ModelSerializer):
+class ItemPedidoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para itens do pedido
     """
@@ -17,6 +19,8 @@ class ItemPedidoSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'subtotal']
 
+    dependencias_campos = {'cupcake_imagem': ('cupcake',)}
+
     def get_cupcake_imagem(self, obj):
         if obj.cupcake.imagem:
             request = self.context.get('request')
@@ -26,7 +30,7 @@ class ItemPedidoSerializer(serializers.ModelSerializer):
         return obj.cupcake.imagem_url
 
 
-class PedidoSerializer(serializers.ModelSerializer):
+class PedidoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para o modelo Pedido
     """
@@ -48,6 +52,27 @@ class PedidoSerializer(serializers.ModelSerializer):
             'id', 'numero_pedido', 'usuario', 'created_at', 'updated_at'
         ]
 
+    @staticmethod
+    def otimizar_queryset(queryset, campos=None):
+        """
+        Aplica o plano de carregamento usado na serialização de pedidos
+
+        Itens e seus cupcakes vêm em uma consulta extra, qualquer que seja o
+        número de pedidos, em vez de uma consulta por pedido e por item.
+
+        Args:
+            queryset (QuerySet): Pedidos
+            campos (list, optional): Campos solicitados (?fields=/?omit=);
+                sem `itens` o prefetch não é feito
+        """
+        if campos is None:
+            queryset = queryset.select_related('cupom', 'pagamento')
+        elif 'itens' not in campos:
+            return queryset
+        return queryset.prefetch_related(
+            Prefetch('itens', queryset=ItemPedido.objects.select_related('cupcake'))
+        )
+
 
 class CriarPedidoSerializer(serializers.Serializer):
     """
@@ -96,3 +121,29 @@ class CriarPedidoSerializer(serializers.Serializer):
                     })
         
         return data
+
+
+class EstatisticasPedidosSerializer(serializers.Serializer):
+    """
+    Serializer para os parâmetros de consulta das estatísticas de pedidos
+    """
+    data_inicio = serializers.DateField(
+        required=False,
+        input_formats=['%Y-%m-%d', '%d/%m/%Y']
+    )
+    data_fim = serializers.DateField(
+        required=False,
+        input_formats=['%Y-%m-%d', '%d/%m/%Y']
+    )
+    granularidade = serializers.ChoiceField(
+        choices=['dia', 'semana', 'mes'],
+        required=False
+    )
+
+    def validate(self, data):
+        if data.get('data_inicio') and data.get('data_fim'):
+            if data['data_inicio'] > data['data_fim']:
+                raise serializers.ValidationError({
+                    'data_fim': 'A data final deve ser posterior à data inicial.'
+                })
+        return data
@@ -1,11 +1,39 @@
 from .cupom_service import CupomService
 from .frete_service import FreteService
 from .carrinho_service import CarrinhoService
+from .carrinho_armazenamento import (
+    ArmazenamentoCarrinho,
+    ArmazenamentoCarrinhoORM,
+    ArmazenamentoCarrinhoMemoria
+)
+from .carrinho_anonimo_service import CarrinhoAnonimoService
 from .pedido_service import PedidoService
+from .catalogo_cache_service import CatalogoCacheService
+from .venda_diaria_service import VendaDiariaService
+from .idempotencia_service import IdempotenciaService
+from .busca_service import BuscaService
+from .autocompletar_service import AutocompletarService
+from .faceta_service import FacetaService
+from .imagem_service import ImagemService
+from .snapshot_catalogo_service import SnapshotCatalogoService
+from .sincronizacao_catalogo_service import SincronizacaoCatalogoService
 
 __all__ = [
     'CupomService',
     'FreteService',
     'CarrinhoService',
-    'PedidoService'
+    'ArmazenamentoCarrinho',
+    'ArmazenamentoCarrinhoORM',
+    'ArmazenamentoCarrinhoMemoria',
+    'CarrinhoAnonimoService',
+    'PedidoService',
+    'CatalogoCacheService',
+    'VendaDiariaService',
+    'IdempotenciaService',
+    'BuscaService',
+    'AutocompletarService',
+    'FacetaService',
+    'ImagemService',
+    'SnapshotCatalogoService',
+    'SincronizacaoCatalogoService'
 ]
@@ -0,0 +1,129 @@
+import threading
+from cupcakes_api.busca import TriePrefixos, normalizar
+from cupcakes_api.busca.normalizador import STOPWORDS
+from cupcakes_api.models import Cupcake, Categoria
+from cupcakes_api.services.catalogo_cache_service import CatalogoCacheService
+
+
+class AutocompletarService:
+    """
+    Serviço de sugestões para a caixa de busca do cardápio
+
+    Mantém em memória uma trie de prefixos com os nomes normalizados dos
+    cupcakes e categorias ativos. A trie tem uma versão própria no cache,
+    incrementada pelos sinais de Cupcake/Categoria só quando mudam os
+    campos que ela usa (CAMPOS): baixas de estoque dos pedidos, que mudam a
+    versão do catálogo, não a reconstroem. Fora isso, as consultas não
+    acessam o banco.
+    """
+
+    LIMITE = 10
+    CHAVE_VERSAO = 'autocompletar:versao'
+    # Campos lidos por reconstruir(); salvar só outros campos não muda a trie
+    CAMPOS = {
+        Cupcake: frozenset({'nome', 'ativo', 'destaque'}),
+        Categoria: frozenset({'nome', 'ativo'}),
+    }
+
+    _trie = None
+    _versao = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _chaves(nome):
+        """
+        Gera os textos indexados de um nome: o nome inteiro e o trecho que
+        começa em cada palavra seguinte ("Maçã com Canela" -> "maca com
+        canela", "canela"), para que o usuário encontre por qualquer palavra
+
+        Returns:
+            list: Tuplas (texto, posicao_da_palavra)
+        """
+        palavras = normalizar(nome).split()
+        return [
+            (' '.join(palavras[posicao:]), posicao)
+            for posicao, palavra in enumerate(palavras)
+            if posicao == 0 or palavra not in STOPWORDS
+        ]
+
+    @classmethod
+    def reconstruir(cls, versao=None):
+        """
+        Reconstrói a trie a partir do banco
+
+        Args:
+            versao (int, optional): Versão da trie que está sendo montada
+
+        Returns:
+            TriePrefixos: Nova trie
+        """
+        if versao is None:
+            versao = CatalogoCacheService.obter_versao(cls.CHAVE_VERSAO)
+
+        trie = TriePrefixos(limite=cls.LIMITE)
+        cupcakes = Cupcake.objects.filter(ativo=True).values_list('id', 'nome', 'destaque')
+        for cupcake_id, nome, destaque in cupcakes.iterator():
+            sugestao = {'tipo': 'cupcake', 'id': cupcake_id, 'nome': nome}
+            for texto, posicao in cls._chaves(nome):
+                # Começo do nome antes de palavra interna; cupcakes antes de
+                # categorias; destaques primeiro; depois ordem alfabética
+                prioridade = (posicao > 0, 0, not destaque, texto)
+                trie.adicionar(texto, ('cupcake', cupcake_id), prioridade, sugestao)
+
+        categorias = Categoria.objects.filter(ativo=True).values_list('id', 'nome')
+        for categoria_id, nome in categorias.iterator():
+            sugestao = {'tipo': 'categoria', 'id': categoria_id, 'nome': nome}
+            for texto, posicao in cls._chaves(nome):
+                prioridade = (posicao > 0, 1, True, texto)
+                trie.adicionar(texto, ('categoria', categoria_id), prioridade, sugestao)
+
+        cls._trie = trie
+        cls._versao = versao
+        return trie
+
+    @classmethod
+    def obter_trie(cls):
+        """
+        Retorna a trie da versão atual
+
+        Returns:
+            TriePrefixos: Trie atualizada
+        """
+        versao = CatalogoCacheService.obter_versao(cls.CHAVE_VERSAO)
+        if cls._trie is not None and cls._versao == versao:
+            return cls._trie
+        with cls._lock:
+            if cls._trie is None or cls._versao != versao:
+                cls.reconstruir(versao)
+            return cls._trie
+
+    @classmethod
+    def invalidar_apos_commit(cls, modelo, update_fields=None):
+        """
+        Marca a trie como desatualizada se o save tocou algum campo dela
+
+        Args:
+            modelo (type): Cupcake ou Categoria
+            update_fields (frozenset, optional): Campos do save(), se informados
+        """
+        if update_fields and not cls.CAMPOS[modelo] & set(update_fields):
+            return
+        CatalogoCacheService.invalidar_apos_commit(cls.CHAVE_VERSAO)
+
+    @classmethod
+    def sugerir(cls, termo, limite=None):
+        """
+        Sugere cupcakes e categorias cujo nome começa pelo termo
+
+        Args:
+            termo (str): Texto digitado
+            limite (int, optional): Quantidade máxima de sugestões
+
+        Returns:
+            list: Dicionários com tipo, id e nome
+        """
+        prefixo = ' '.join(normalizar(termo).split())
+        if not prefixo:
+            return []
+        limite = min(limite or cls.LIMITE, cls.LIMITE)
+        return cls.obter_trie().buscar(prefixo, limite)
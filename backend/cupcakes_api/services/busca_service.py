@@ -0,0 +1,157 @@
+import threading
+from django.core.cache import cache
+from cupcakes_api.busca import IndiceInvertido, extrair_termos
+from cupcakes_api.models import Cupcake
+
+
+class BuscaService:
+    """
+    Serviço de busca textual de cupcakes
+
+    Mantém em memória, por processo, um índice invertido dos cupcakes (nome,
+    categoria e descrição) com ranqueamento BM25. Funciona igual em SQLite e
+    PostgreSQL porque não depende de recursos de busca do banco.
+
+    Uma versão compartilhada no cache (`busca:versao`) indica quando o índice
+    de um processo ficou desatualizado por alterações feitas em outro: nesse
+    caso ele é reconstruído na próxima busca. Alterações feitas no próprio
+    processo são aplicadas de forma incremental.
+    """
+
+    CHAVE_VERSAO = 'busca:versao'
+
+    # Peso de cada campo (quantas vezes seus termos contam no documento)
+    PESO_NOME = 3
+    PESO_CATEGORIA = 2
+    PESO_DESCRICAO = 1
+
+    _indice = None
+    _versao = None
+    _lock = threading.RLock()
+
+    @staticmethod
+    def termos_documento(nome, descricao, categoria_nome):
+        """
+        Monta a lista de termos de um cupcake, já com os pesos por campo
+
+        Args:
+            nome (str): Nome do cupcake
+            descricao (str): Descrição do cupcake
+            categoria_nome (str): Nome da categoria
+
+        Returns:
+            list: Termos do documento
+        """
+        return (
+            extrair_termos(nome) * BuscaService.PESO_NOME
+            + extrair_termos(categoria_nome) * BuscaService.PESO_CATEGORIA
+            + extrair_termos(descricao) * BuscaService.PESO_DESCRICAO
+        )
+
+    @staticmethod
+    def _versao_compartilhada():
+        versao = cache.get(BuscaService.CHAVE_VERSAO)
+        if versao is None:
+            cache.add(BuscaService.CHAVE_VERSAO, 1, timeout=None)
+            versao = cache.get(BuscaService.CHAVE_VERSAO, 1)
+        return versao
+
+    @staticmethod
+    def _incrementar_versao():
+        try:
+            return cache.incr(BuscaService.CHAVE_VERSAO)
+        except ValueError:
+            cache.add(BuscaService.CHAVE_VERSAO, 1, timeout=None)
+            return cache.incr(BuscaService.CHAVE_VERSAO)
+
+    @classmethod
+    def reconstruir(cls):
+        """
+        Reconstrói o índice a partir de todos os cupcakes
+
+        Returns:
+            IndiceInvertido: Novo índice
+        """
+        with cls._lock:
+            versao = cls._versao_compartilhada()
+            indice = IndiceInvertido()
+            cupcakes = Cupcake.objects.values_list('id', 'nome', 'descricao', 'categoria__nome')
+            for cupcake_id, nome, descricao, categoria_nome in cupcakes.iterator():
+                indice.adicionar(cupcake_id, cls.termos_documento(nome, descricao, categoria_nome))
+
+            cls._indice = indice
+            cls._versao = versao
+            return indice
+
+    @classmethod
+    def obter_indice(cls):
+        """
+        Retorna o índice do processo, reconstruindo-o se estiver desatualizado
+
+        Returns:
+            IndiceInvertido: Índice atual
+        """
+        with cls._lock:
+            if cls._indice is None or cls._versao != cls._versao_compartilhada():
+                return cls.reconstruir()
+            return cls._indice
+
+    @classmethod
+    def buscar(cls, termo, limite=None):
+        """
+        Busca cupcakes pelo texto informado
+
+        Args:
+            termo (str): Texto digitado pelo usuário
+            limite (int, optional): Quantidade máxima de resultados
+
+        Returns:
+            list: IDs dos cupcakes, do mais para o menos relevante
+        """
+        termos = extrair_termos(termo)
+        if not termos:
+            return []
+        return [doc_id for doc_id, _ in cls.obter_indice().buscar(termos, limite)]
+
+    @classmethod
+    def _registrar_alteracao(cls, aplicar=None):
+        """
+        Publica uma alteração e, se possível, aplica-a no índice local
+
+        Args:
+            aplicar (callable, optional): Atualização incremental do índice.
+                Sem ela, o índice é apenas marcado como desatualizado.
+        """
+        with cls._lock:
+            nova_versao = cls._incrementar_versao()
+            if aplicar and cls._indice is not None and cls._versao == nova_versao - 1:
+                aplicar(cls._indice)
+                cls._versao = nova_versao
+
+    @classmethod
+    def indexar_cupcake(cls, cupcake):
+        """
+        Atualiza o documento de um cupcake no índice
+
+        Args:
+            cupcake (Cupcake): Cupcake salvo
+        """
+        termos = cls.termos_documento(cupcake.nome, cupcake.descricao, cupcake.categoria.nome)
+        cls._registrar_alteracao(lambda indice: indice.adicionar(cupcake.id, termos))
+
+    @classmethod
+    def remover_cupcake(cls, cupcake_id):
+        """
+        Remove um cupcake do índice
+
+        Args:
+            cupcake_id (int): ID do cupcake removido
+        """
+        cls._registrar_alteracao(lambda indice: indice.remover(cupcake_id))
+
+    @classmethod
+    def marcar_desatualizado(cls):
+        """
+        Força a reconstrução do índice na próxima busca (ex: categoria renomeada)
+        """
+        cls._registrar_alteracao()
@@ -0,0 +1,209 @@
+from decimal import Decimal
+from django.conf import settings
+from django.core import signing
+from cupcakes_api.models import Cupcake
+from .carrinho_service import CarrinhoService
+from .catalogo_cache_service import CatalogoCacheService
+
+
+class CarrinhoAnonimoService:
+    """
+    Carrinho de visitantes não autenticados, guardado em um cookie assinado
+
+    O cookie traz só [versão, [[cupcake_id, quantidade], ...]], assinado
+    com a SECRET_KEY. Preços e estoque vêm de um mapa do catálogo no cache
+    compartilhado, invalidado pela versão do catálogo e com validade curta
+    (CARRINHO_ANONIMO_MAPA_SEGUNDOS), já que baixas de estoque no checkout
+    não mudam a versão. Ler ou alterar o carrinho anônimo não consulta as
+    tabelas do catálogo. No login/registro o carrinho é juntado ao do
+    usuário por CarrinhoService.mesclar_anonimo.
+    """
+
+    COOKIE = 'carrinho_anonimo'
+    SALT = 'cupcakes_api.carrinho_anonimo'
+    VERSAO = 1
+    # Limite de linhas (o cookie precisa caber em 4 KB)
+    MAXIMO_LINHAS = 50
+
+    @staticmethod
+    def mapa_cupcakes():
+        """
+        Preço, estoque e disponibilidade de todos os cupcakes, em cache
+
+        Returns:
+            dict: cupcake_id -> {'nome', 'preco', 'estoque', 'disponivel',
+                'imagem', 'imagem_url'}
+        """
+        def calcular():
+            return {
+                cupcake['id']: cupcake
+                for cupcake in Cupcake.objects.values(
+                    'id', 'nome', 'preco', 'estoque', 'disponivel', 'imagem', 'imagem_url'
+                )
+            }
+
+        chave = CatalogoCacheService.montar_chave('carrinho-anonimo:cupcakes')
+        return CatalogoCacheService.obter_ou_calcular(
+            chave, calcular, timeout=settings.CARRINHO_ANONIMO_MAPA_SEGUNDOS
+        )
+
+    @staticmethod
+    def ler(request):
+        """
+        Lê as linhas do cookie (assinatura ou versão inválida = carrinho vazio)
+
+        Args:
+            request (HttpRequest): Requisição
+
+        Returns:
+            dict: cupcake_id -> quantidade
+        """
+        valor = request.COOKIES.get(CarrinhoAnonimoService.COOKIE)
+        if not valor:
+            return {}
+        try:
+            versao, linhas = signing.loads(
+                valor,
+                salt=CarrinhoAnonimoService.SALT,
+                max_age=settings.CARRINHO_ANONIMO_DIAS * 86400
+            )
+        except (signing.BadSignature, TypeError, ValueError):
+            return {}
+        if versao != CarrinhoAnonimoService.VERSAO:
+            return {}
+
+        try:
+            return {
+                int(cupcake_id): int(quantidade)
+                for cupcake_id, quantidade in linhas[:CarrinhoAnonimoService.MAXIMO_LINHAS]
+                if int(quantidade) > 0
+            }
+        except (TypeError, ValueError):
+            return {}
+
+    @staticmethod
+    def gravar(response, linhas):
+        """
+        Grava as linhas no cookie da resposta (ou o remove se vazio)
+
+        Args:
+            response (HttpResponse): Resposta
+            linhas (dict): cupcake_id -> quantidade
+        """
+        if not linhas:
+            CarrinhoAnonimoService.remover(response)
+            return
+
+        valor = signing.dumps(
+            [CarrinhoAnonimoService.VERSAO, [[cupcake_id, quantidade] for cupcake_id, quantidade in linhas.items()]],
+            salt=CarrinhoAnonimoService.SALT,
+            compress=True
+        )
+        response.set_cookie(
+            CarrinhoAnonimoService.COOKIE,
+            valor,
+            max_age=settings.CARRINHO_ANONIMO_DIAS * 86400,
+            httponly=True,
+            secure=settings.SESSION_COOKIE_SECURE,
+            samesite=settings.SESSION_COOKIE_SAMESITE
+        )
+
+    @staticmethod
+    def remover(response):
+        response.delete_cookie(
+            CarrinhoAnonimoService.COOKIE,
+            samesite=settings.SESSION_COOKIE_SAMESITE
+        )
+
+    @staticmethod
+    def aplicar(linhas, operacoes, substituir=False):
+        """
+        Aplica operações set/add/remove às linhas do cookie
+
+        Args:
+            linhas (dict): Linhas atuais
+            operacoes (list): Operações validadas por OperacaoCarrinhoSerializer
+            substituir (bool): Remove os cupcakes que não aparecem nas operações
+
+        Returns:
+            dict: Resultado com as novas linhas ou 'erros' por cupcake
+        """
+        alteracoes = CarrinhoService.aplicar_operacoes(linhas, operacoes, substituir)
+        erros = CarrinhoService.validar_quantidades(alteracoes, CarrinhoAnonimoService.mapa_cupcakes())
+
+        novas = dict(linhas)
+        for cupcake_id, quantidade in alteracoes.items():
+            if quantidade > 0:
+                novas[cupcake_id] = quantidade
+            else:
+                novas.pop(cupcake_id, None)
+
+        if len(novas) > CarrinhoAnonimoService.MAXIMO_LINHAS:
+            erros.append({
+                'cupcake_id': None,
+                'mensagem': f'O carrinho aceita até {CarrinhoAnonimoService.MAXIMO_LINHAS} cupcakes diferentes'
+            })
+        if erros:
+            return {
+                'sucesso': False,
+                'mensagem': 'Carrinho não atualizado',
+                'erros': erros
+            }
+
+        return {
+            'sucesso': True,
+            'mensagem': 'Carrinho atualizado',
+            'linhas': novas
+        }
+
+    @staticmethod
+    def montar(linhas, url_imagem):
+        """
+        Valida as linhas contra o mapa em cache e monta a resposta
+
+        Cupcakes removidos ou indisponíveis saem do carrinho e quantidades
+        acima do estoque são reduzidas, com um aviso para cada ajuste.
+
+        Args:
+            linhas (dict): cupcake_id -> quantidade
+            url_imagem (callable): Converte o nome do arquivo em URL
+
+        Returns:
+            tuple: (linhas válidas, dados do carrinho)
+        """
+        mapa = CarrinhoAnonimoService.mapa_cupcakes()
+        validas = {}
+        itens = []
+        avisos = []
+        subtotal = Decimal('0.00')
+
+        for cupcake_id, quantidade in linhas.items():
+            cupcake = mapa.get(cupcake_id)
+            if cupcake is None or not cupcake['disponivel']:
+                nome = cupcake['nome'] if cupcake else 'Cupcake'
+                avisos.append({'cupcake_id': cupcake_id, 'mensagem': f'{nome} não está mais disponível'})
+                continue
+            if quantidade > cupcake['estoque']:
+                quantidade = cupcake['estoque']
+                avisos.append({
+                    'cupcake_id': cupcake_id,
+                    'mensagem': f'Quantidade de {cupcake["nome"]} ajustada ao estoque ({quantidade})'
+                })
+
+            validas[cupcake_id] = quantidade
+            subtotal += cupcake['preco'] * quantidade
+            itens.append({
+                'cupcake': cupcake_id,
+                'cupcake_nome': cupcake['nome'],
+                'cupcake_preco': f'{cupcake["preco"]:.2f}',
+                'cupcake_imagem': url_imagem(cupcake['imagem']) if cupcake['imagem'] else cupcake['imagem_url'],
+                'quantidade': quantidade,
+                'subtotal': f'{cupcake["preco"] * quantidade:.2f}',
+            })
+
+        return validas, {
+            'itens': itens,
+            'total_itens': sum(validas.values()),
+            'subtotal': f'{subtotal:.2f}',
+            'avisos': avisos,
+        }
@@ -0,0 +1,486 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from itertools import islice
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from cupcakes_api.models import Carrinho, ItemCarrinho, Cupcake
+
+logger = logging.getLogger(__name__)
+
+
+class ArmazenamentoCarrinho:
+    """
+    Interface de armazenamento dos itens do carrinho
+
+    O conteúdo do carrinho é tratado como linhas cupcake_id -> quantidade;
+    as regras (disponibilidade, estoque, mensagens) ficam no CarrinhoService.
+    """
+
+    def carregar(self, usuario, campos=None):
+        """
+        Carrinho pronto para o CarrinhoSerializer, com os itens pré-carregados
+
+        Args:
+            usuario (User): Instância do usuário
+            campos (list, optional): Campos que serão serializados
+
+        Returns:
+            Carrinho: Carrinho para leitura
+        """
+        raise NotImplementedError
+
+    def linhas(self, usuario):
+        """
+        Returns:
+            dict: cupcake_id -> quantidade, na ordem de inclusão
+        """
+        raise NotImplementedError
+
+    def cupcake_do_item(self, usuario, item_id):
+        """
+        Returns:
+            int|None: Cupcake da linha identificada por `item_id`
+        """
+        raise NotImplementedError
+
+    def adicionar(self, usuario, cupcake_id, quantidade):
+        """
+        Soma `quantidade` à linha do cupcake, limitada ao estoque
+
+        Returns:
+            tuple|None: (quantidade no carrinho, nome do cupcake) ou None se
+                o cupcake não estiver disponível ou o estoque não bastar
+        """
+        raise NotImplementedError
+
+    def gravar(self, usuario, quantidades):
+        """
+        Define as quantidades das linhas (0 remove a linha)
+
+        Args:
+            usuario (User): Instância do usuário
+            quantidades (dict): cupcake_id -> quantidade
+        """
+        raise NotImplementedError
+
+    def limpar(self, usuario):
+        """Remove todas as linhas do carrinho"""
+        raise NotImplementedError
+
+    def persistir(self, usuario):
+        """Garante que o banco tenha o conteúdo atual (antes do checkout)"""
+
+    def esquecer(self, usuario_id):
+        """Descarta o que estiver guardado fora do banco para o usuário"""
+
+
+class ArmazenamentoCarrinhoORM(ArmazenamentoCarrinho):
+    """
+    Armazenamento direto nas tabelas carrinhos/itens_carrinho
+    """
+
+    # Bancos com INSERT ... ON CONFLICT DO UPDATE (RETURNING é checado
+    # pela feature do Django: SQLite 3.35+)
+    BANCOS_UPSERT = ('postgresql', 'sqlite')
+
+    def carregar(self, usuario, campos=None):
+        """
+        O custo é fixo (carrinho com totais agregados + itens com cupcakes),
+        qualquer que seja o número de itens.
+        """
+        # Import local: os serializers importam serviços
+        from cupcakes_api.serializers import CarrinhoSerializer
+
+        queryset = CarrinhoSerializer.otimizar_queryset(
+            Carrinho.objects.filter(usuario=usuario), campos
+        )
+        carrinho = queryset.first()
+        if carrinho is None:
+            Carrinho.objects.get_or_create(usuario=usuario)
+            carrinho = queryset.get()
+        return carrinho
+
+    def linhas(self, usuario):
+        return self.linhas_do_usuario(usuario.pk)
+
+    @staticmethod
+    def linhas_do_usuario(usuario_id):
+        return dict(
+            ItemCarrinho.objects
+            .filter(carrinho__usuario_id=usuario_id)
+            .order_by('created_at', 'id')
+            .values_list('cupcake_id', 'quantidade')
+        )
+
+    def cupcake_do_item(self, usuario, item_id):
+        return (
+            ItemCarrinho.objects
+            .filter(carrinho__usuario=usuario, id=item_id)
+            .values_list('cupcake_id', flat=True)
+            .first()
+        )
+
+    @staticmethod
+    def _upsert_item(carrinho_id, cupcake_id, quantidade):
+        """
+        Insere o item ou soma a quantidade em um único comando SQL
+
+        INSERT ... SELECT (só se o cupcake estiver disponível e com estoque)
+        ON CONFLICT (carrinho_id, cupcake_id) DO UPDATE, com a soma limitada
+        ao estoque. PostgreSQL e SQLite (3.35+) aceitam a mesma sintaxe;
+        cliques repetidos em "adicionar" não disputam a restrição única.
+
+        Returns:
+            tuple|None: (quantidade no carrinho, nome do cupcake) ou None se
+                nada foi gravado
+        """
+        quote = connection.ops.quote_name
+        itens = quote(ItemCarrinho._meta.db_table)
+        cupcakes = quote(Cupcake._meta.db_table)
+        agora = connection.ops.adapt_datetimefield_value(timezone.now())
+
+        sql = f"""
+            INSERT INTO {itens} (carrinho_id, cupcake_id, quantidade, created_at, updated_at)
+            SELECT %s, c.id, %s, %s, %s
+            FROM {cupcakes} c
+            WHERE c.id = %s AND c.disponivel = %s AND c.estoque >= %s
+            ON CONFLICT (carrinho_id, cupcake_id) DO UPDATE
+            SET quantidade = {itens}.quantidade + excluded.quantidade,
+                updated_at = excluded.updated_at
+            WHERE {itens}.quantidade + excluded.quantidade <= (
+                SELECT estoque FROM {cupcakes} WHERE id = excluded.cupcake_id
+            )
+            RETURNING quantidade, (SELECT nome FROM {cupcakes} WHERE id = {itens}.cupcake_id)
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [
+                carrinho_id, quantidade, agora, agora,
+                cupcake_id, True, quantidade
+            ])
+            return cursor.fetchone()
+
+    @staticmethod
+    def _adicionar_com_lock(carrinho, cupcake_id, quantidade):
+        """
+        Equivalente do upsert para bancos sem ON CONFLICT ... RETURNING
+
+        Returns:
+            tuple|None: (quantidade no carrinho, nome do cupcake) ou None se
+                nada foi gravado
+        """
+        cupcake = Cupcake.objects.select_for_update().filter(
+            pk=cupcake_id, disponivel=True, estoque__gte=quantidade
+        ).first()
+        if cupcake is None:
+            return None
+
+        item, criado = ItemCarrinho.objects.select_for_update().get_or_create(
+            carrinho=carrinho,
+            cupcake=cupcake,
+            defaults={'quantidade': quantidade}
+        )
+        if not criado:
+            if item.quantidade + quantidade > cupcake.estoque:
+                return None
+            item.quantidade += quantidade
+            item.save(update_fields=['quantidade', 'updated_at'])
+        return item.quantidade, cupcake.nome
+
+    def adicionar(self, usuario, cupcake_id, quantidade):
+        carrinho, _ = Carrinho.objects.get_or_create(usuario=usuario)
+        if (
+            connection.vendor in self.BANCOS_UPSERT
+            and connection.features.can_return_rows_from_bulk_insert
+        ):
+            return self._upsert_item(carrinho.id, cupcake_id, quantidade)
+        return self._adicionar_com_lock(carrinho, cupcake_id, quantidade)
+
+    def gravar(self, usuario, quantidades):
+        self._gravar_linhas(usuario.pk, quantidades)
+
+    @staticmethod
+    def _gravar_linhas(usuario_id, quantidades, substituir=False):
+        """
+        Grava as linhas com um DELETE e um upsert em lote
+
+        Args:
+            usuario_id (int): ID do usuário
+            quantidades (dict): cupcake_id -> quantidade (0 remove)
+            substituir (bool): Remove também as linhas fora de `quantidades`
+        """
+        carrinho, _ = Carrinho.objects.get_or_create(usuario_id=usuario_id)
+        manter = {
+            cupcake_id: quantidade
+            for cupcake_id, quantidade in quantidades.items()
+            if quantidade > 0
+        }
+
+        if substituir:
+            carrinho.itens.exclude(cupcake_id__in=list(manter)).delete()
+        else:
+            remover = [cupcake_id for cupcake_id in quantidades if cupcake_id not in manter]
+            if remover:
+                carrinho.itens.filter(cupcake_id__in=remover).delete()
+
+        if manter:
+            ItemCarrinho.objects.bulk_create(
+                [
+                    ItemCarrinho(carrinho=carrinho, cupcake_id=cupcake_id, quantidade=quantidade)
+                    for cupcake_id, quantidade in manter.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['carrinho', 'cupcake'],
+                update_fields=['quantidade', 'updated_at']
+            )
+
+    @staticmethod
+    def substituir(usuario_id, quantidades):
+        """
+        Deixa no banco exatamente as linhas informadas
+
+        Cupcakes excluídos depois de entrarem no carrinho em memória são
+        descartados, em vez de violarem a chave estrangeira.
+
+        Args:
+            usuario_id (int): ID do usuário
+            quantidades (dict): cupcake_id -> quantidade
+        """
+        if quantidades:
+            existentes = set(
+                Cupcake.objects.filter(pk__in=list(quantidades)).values_list('pk', flat=True)
+            )
+            quantidades = {
+                cupcake_id: quantidade
+                for cupcake_id, quantidade in quantidades.items()
+                if cupcake_id in existentes
+            }
+        ArmazenamentoCarrinhoORM._gravar_linhas(usuario_id, quantidades, substituir=True)
+
+    def limpar(self, usuario):
+        ItemCarrinho.objects.filter(carrinho__usuario=usuario).delete()
+
+
+class ArmazenamentoCarrinhoMemoria(ArmazenamentoCarrinho):
+    """
+    Carrinhos em um LRU em memória, com escrita adiada no banco
+
+    Leituras e alterações do carrinho não gravam itens no banco: as linhas
+    alteradas são persistidas quando o carrinho sai do LRU (depois do
+    commit da requisição que o expulsou), por uma thread a cada
+    CARRINHO_PERSISTENCIA_SEGUNDOS (0 desliga) e no checkout (persistir()).
+    Cada carrinho é gravado na sua própria transação: uma falha é
+    registrada no log e o carrinho continua pendente, sem afetar a
+    requisição de outro usuário. O registro em `carrinhos` ainda é criado
+    na primeira leitura do usuário.
+
+    O LRU é do processo: use com um único processo (ou com as requisições
+    de cada usuário sempre no mesmo processo). Alterações ainda não
+    persistidas se perdem se o processo terminar.
+    """
+
+    def __init__(self, maximo=None, intervalo=None):
+        self.maximo = maximo or settings.CARRINHO_MEMORIA_MAXIMO
+        self.intervalo = settings.CARRINHO_PERSISTENCIA_SEGUNDOS if intervalo is None else intervalo
+        # usuario_id -> {'itens': {cupcake_id: quantidade}, 'versao': n, 'persistida': n}
+        self._carrinhos = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _entrada(self, usuario_id):
+        """
+        Entrada do usuário no LRU, lida do banco se ainda não estiver nele
+
+        Deve ser chamado fora do lock; devolve a entrada já como a mais
+        recente.
+        """
+        with self._lock:
+            entrada = self._carrinhos.get(usuario_id)
+            if entrada is not None:
+                self._carrinhos.move_to_end(usuario_id)
+                return entrada
+
+        itens = ArmazenamentoCarrinhoORM.linhas_do_usuario(usuario_id)
+        with self._lock:
+            entrada = self._carrinhos.setdefault(
+                usuario_id, {'itens': itens, 'versao': 0, 'persistida': 0}
+            )
+            self._carrinhos.move_to_end(usuario_id)
+            excedentes = list(islice(self._carrinhos.items(), max(len(self._carrinhos) - self.maximo, 0)))
+            pendentes = []
+            for removido_id, removida in excedentes:
+                if removida['versao'] == removida['persistida']:
+                    del self._carrinhos[removido_id]
+                else:
+                    pendentes.append((removido_id, removida))
+
+        # Carrinhos com alterações só saem do LRU depois de gravados, fora
+        # da transação desta requisição: se ela ou a gravação falharem, o
+        # carrinho expulso continua em memória
+        for removido_id, removida in pendentes:
+            transaction.on_commit(partial(self._persistir_isolado, removido_id, removida, remover=True))
+        return entrada
+
+    def _alterado(self, entrada):
+        """Marca a entrada como alterada (chamado dentro do lock)"""
+        entrada['versao'] += 1
+        if self._thread is None and self.intervalo > 0:
+            self._thread = threading.Thread(
+                target=self._persistir_periodicamente,
+                name='carrinho-persistencia',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _persistir_periodicamente(self):
+        """Laço da thread que grava os carrinhos pendentes fora das requisições"""
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                self.persistir_pendentes()
+            except Exception:
+                # A thread não pode morrer: os carrinhos seguiriam sem gravação
+                logger.exception('Falha na gravação periódica dos carrinhos em memória')
+            finally:
+                # A thread abre a sua própria conexão com o banco
+                connection.close()
+
+    def carregar(self, usuario, campos=None):
+        linhas = self.linhas(usuario)
+        carrinho = Carrinho.objects.filter(usuario=usuario).first()
+        if carrinho is None:
+            carrinho, _ = Carrinho.objects.get_or_create(usuario=usuario)
+
+        cupcakes = Cupcake.objects.in_bulk(list(linhas))
+        # O id do item é o do cupcake: as linhas só existem aqui
+        itens = [
+            ItemCarrinho(id=cupcake_id, carrinho=carrinho, cupcake=cupcakes[cupcake_id], quantidade=quantidade)
+            for cupcake_id, quantidade in linhas.items()
+            if cupcake_id in cupcakes
+        ]
+        queryset = carrinho.itens.all()
+        queryset._result_cache = itens
+        queryset._prefetch_done = True
+        carrinho._prefetched_objects_cache = {
+            ItemCarrinho._meta.get_field('carrinho').remote_field.get_cache_name(): queryset
+        }
+        return carrinho
+
+    def linhas(self, usuario):
+        entrada = self._entrada(usuario.pk)
+        with self._lock:
+            return dict(entrada['itens'])
+
+    def cupcake_do_item(self, usuario, item_id):
+        item_id = int(item_id)
+        return item_id if item_id in self.linhas(usuario) else None
+
+    def adicionar(self, usuario, cupcake_id, quantidade):
+        cupcake = Cupcake.objects.filter(pk=cupcake_id, disponivel=True).values('nome', 'estoque').first()
+        if cupcake is None:
+            return None
+
+        entrada = self._entrada(usuario.pk)
+        with self._lock:
+            total = entrada['itens'].get(cupcake_id, 0) + quantidade
+            if total > cupcake['estoque']:
+                return None
+            entrada['itens'][cupcake_id] = total
+            self._alterado(entrada)
+
+        return total, cupcake['nome']
+
+    def gravar(self, usuario, quantidades):
+        entrada = self._entrada(usuario.pk)
+        with self._lock:
+            for cupcake_id, quantidade in quantidades.items():
+                if quantidade > 0:
+                    entrada['itens'][cupcake_id] = quantidade
+                else:
+                    entrada['itens'].pop(cupcake_id, None)
+            self._alterado(entrada)
+
+    def limpar(self, usuario):
+        entrada = self._entrada(usuario.pk)
+        with self._lock:
+            entrada['itens'].clear()
+            self._alterado(entrada)
+
+    def _persistir_entrada(self, usuario_id, entrada, remover=False):
+        """
+        Grava a entrada no banco; ela só é considerada persistida depois do
+        commit, para que um rollback não descarte a alteração
+
+        Args:
+            usuario_id (int): ID do usuário
+            entrada (dict): Entrada do LRU
+            remover (bool): Tira a entrada do LRU depois do commit, se ela
+                não tiver mudado desde a gravação
+        """
+        with self._lock:
+            versao = entrada['versao']
+            itens = dict(entrada['itens'])
+            pendente = versao != entrada['persistida']
+
+        if pendente:
+            with transaction.atomic():
+                ArmazenamentoCarrinhoORM.substituir(usuario_id, itens)
+
+        def marcar():
+            with self._lock:
+                entrada['persistida'] = max(entrada['persistida'], versao)
+                if (
+                    remover
+                    and entrada['versao'] == entrada['persistida']
+                    and self._carrinhos.get(usuario_id) is entrada
+                    and len(self._carrinhos) > self.maximo
+                ):
+                    del self._carrinhos[usuario_id]
+
+        transaction.on_commit(marcar)
+
+    def _persistir_isolado(self, usuario_id, entrada, remover=False):
+        """
+        Grava a entrada sem propagar erros: a falha fica no log e a entrada
+        continua pendente para a próxima tentativa
+
+        Returns:
+            bool: Se a gravação foi concluída
+        """
+        try:
+            self._persistir_entrada(usuario_id, entrada, remover)
+        except DatabaseError:
+            logger.exception('Falha ao gravar o carrinho em memória do usuário %s', usuario_id)
+            return False
+        return True
+
+    def persistir(self, usuario):
+        with self._lock:
+            entrada = self._carrinhos.get(usuario.pk)
+        if entrada is not None:
+            self._persistir_entrada(usuario.pk, entrada)
+
+    def persistir_pendentes(self):
+        """Persiste todos os carrinhos com alterações pendentes"""
+        with self._lock:
+            pendentes = [
+                (usuario_id, entrada)
+                for usuario_id, entrada in self._carrinhos.items()
+                if entrada['versao'] != entrada['persistida']
+            ]
+        for usuario_id, entrada in pendentes:
+            self._persistir_isolado(usuario_id, entrada)
+
+    def esquecer(self, usuario_id):
+        with self._lock:
+            self._carrinhos.pop(usuario_id, None)
+
+
+# Valor de CARRINHO_ARMAZENAMENTO -> implementação
+ARMAZENAMENTOS = {
+    'orm': ArmazenamentoCarrinhoORM,
+    'memoria': ArmazenamentoCarrinhoMemoria,
+}
@@ -1,13 +1,33 @@
 from decimal import Decimal
-from cupcakes_api.models import Carrinho, ItemCarrinho, Cupcake
+from django.conf import settings
 from django.db import transaction
+from cupcakes_api.models import Carrinho, Cupcake
+from .carrinho_armazenamento import ARMAZENAMENTOS
 
 
 class CarrinhoService:
     """
     Serviço para gerenciar operações do carrinho
+
+    Os itens ficam no armazenamento escolhido em CARRINHO_ARMAZENAMENTO
+    ('orm': tabelas do carrinho; 'memoria': LRU com escrita adiada).
     """
 
+    _armazenamentos = {}
+
+    @classmethod
+    def armazenamento(cls):
+        """
+        Instância (única por processo) do armazenamento configurado
+
+        Returns:
+            ArmazenamentoCarrinho: Armazenamento dos itens
+        """
+        nome = settings.CARRINHO_ARMAZENAMENTO
+        if nome not in cls._armazenamentos:
+            cls._armazenamentos[nome] = ARMAZENAMENTOS[nome]()
+        return cls._armazenamentos[nome]
+
     @staticmethod
     def obter_ou_criar_carrinho(usuario):
         """
@@ -22,11 +42,62 @@ class CarrinhoService:
         carrinho, created = Carrinho.objects.get_or_create(usuario=usuario)
         return carrinho
 
+    @staticmethod
+    def carregar_carrinho(usuario, campos=None):
+        """
+        Carrega o carrinho para leitura, com totais e itens
+
+        O custo não depende do número de itens.
+
+        Args:
+            usuario (User): Instância do usuário
+            campos (list, optional): Campos que serão serializados
+
+        Returns:
+            Carrinho: Carrinho com os itens (e cupcakes) já carregados
+        """
+        return CarrinhoService.armazenamento().carregar(usuario, campos)
+
+    @staticmethod
+    def persistir(usuario):
+        """
+        Garante que o banco tenha o carrinho atual (usado no checkout)
+
+        Args:
+            usuario (User): Instância do usuário
+        """
+        CarrinhoService.armazenamento().persistir(usuario)
+
+    @staticmethod
+    def _motivo_recusa(cupcake_id, no_carrinho):
+        """
+        Explica por que o item não foi adicionado (só no caminho de falha)
+
+        Args:
+            cupcake_id (int): ID do cupcake
+            no_carrinho (int|None): Quantidade que já estava no carrinho
+
+        Returns:
+            str: Mensagem de erro
+        """
+        cupcake = Cupcake.objects.filter(pk=cupcake_id).values('disponivel', 'estoque').first()
+        if cupcake is None:
+            return 'Cupcake não encontrado'
+        if not cupcake['disponivel']:
+            return 'Cupcake não disponível'
+        if no_carrinho:
+            return f'Estoque insuficiente. Disponível: {cupcake["estoque"]} (no carrinho: {no_carrinho})'
+        return f'Estoque insuficiente. Disponível: {cupcake["estoque"]}'
+
     @staticmethod
     @transaction.atomic
     def adicionar_item(usuario, cupcake_id, quantidade=1):
         """
         Adiciona um item ao carrinho
+
+        A inclusão (ou a soma à quantidade já existente) e a checagem de
+        disponibilidade e estoque são feitas pelo armazenamento em uma única
+        operação (no ORM, um único comando no banco).
         
         Args:
             usuario (User): Instância do usuário
@@ -36,52 +107,175 @@ class CarrinhoService:
         Returns:
             dict: Resultado da operação
         """
-        try:
-            cupcake = Cupcake.objects.get(id=cupcake_id)
-        except Cupcake.DoesNotExist:
-            return {
-                'sucesso': False,
-                'mensagem': 'Cupcake não encontrado'
-            }
+        armazenamento = CarrinhoService.armazenamento()
+        resultado = armazenamento.adicionar(usuario, cupcake_id, quantidade)
 
-        # Verifica disponibilidade
-        if not cupcake.disponivel:
+        if resultado is None:
             return {
                 'sucesso': False,
-                'mensagem': 'Cupcake não disponível'
+                'mensagem': CarrinhoService._motivo_recusa(
+                    cupcake_id, armazenamento.linhas(usuario).get(cupcake_id)
+                )
             }
 
-        # Verifica estoque
-        carrinho = CarrinhoService.obter_ou_criar_carrinho(usuario)
-        item_existente = carrinho.itens.filter(cupcake=cupcake).first()
-        
-        quantidade_total = quantidade
-        if item_existente:
-            quantidade_total += item_existente.quantidade
+        quantidade_total, nome = resultado
+        return {
+            'sucesso': True,
+            'mensagem': f'{nome} adicionado ao carrinho',
+            'quantidade': quantidade_total
+        }
 
-        if cupcake.estoque < quantidade_total:
+    @staticmethod
+    def aplicar_operacoes(atuais, operacoes, substituir=False):
+        """
+        Calcula as linhas alteradas por uma lista de operações
+
+        Args:
+            atuais (dict): cupcake_id -> quantidade atual
+            operacoes (list): Dicts {'op': 'set'|'add'|'remove', 'cupcake_id', 'quantidade'}
+            substituir (bool): Remove os cupcakes que não aparecem nas operações
+
+        Returns:
+            dict: cupcake_id -> nova quantidade (0 remove), só das linhas
+                que mudaram
+        """
+        quantidades = {} if substituir else dict(atuais)
+        for operacao in operacoes:
+            cupcake_id = operacao['cupcake_id']
+            if operacao['op'] == 'add':
+                quantidades[cupcake_id] = quantidades.get(cupcake_id, 0) + operacao['quantidade']
+            elif operacao['op'] == 'set':
+                quantidades[cupcake_id] = operacao['quantidade']
+            else:
+                quantidades[cupcake_id] = 0
+
+        alteracoes = {
+            cupcake_id: max(quantidade, 0)
+            for cupcake_id, quantidade in quantidades.items()
+            if max(quantidade, 0) != atuais.get(cupcake_id, 0)
+        }
+        for cupcake_id in atuais:
+            if cupcake_id not in quantidades:
+                alteracoes[cupcake_id] = 0
+        return alteracoes
+
+    @staticmethod
+    def validar_quantidades(quantidades, cupcakes):
+        """
+        Confere disponibilidade e estoque das linhas com quantidade
+
+        Args:
+            quantidades (dict): cupcake_id -> quantidade
+            cupcakes (dict): cupcake_id -> {'nome', 'disponivel', 'estoque'}
+
+        Returns:
+            list: Erros {'cupcake_id', 'mensagem'} (vazia se tudo for válido)
+        """
+        erros = []
+        for cupcake_id, quantidade in quantidades.items():
+            if quantidade <= 0:
+                continue
+            cupcake = cupcakes.get(cupcake_id)
+            if cupcake is None:
+                mensagem = 'Cupcake não encontrado'
+            elif not cupcake['disponivel']:
+                mensagem = f'{cupcake["nome"]} não está disponível'
+            elif cupcake['estoque'] < quantidade:
+                mensagem = f'Estoque insuficiente para {cupcake["nome"]}. Disponível: {cupcake["estoque"]}'
+            else:
+                continue
+            erros.append({'cupcake_id': cupcake_id, 'mensagem': mensagem})
+        return erros
+
+    @staticmethod
+    @transaction.atomic
+    def sincronizar(usuario, operacoes, substituir=False):
+        """
+        Aplica várias operações no carrinho em uma única transação
+
+        As quantidades finais são calculadas em memória, validadas contra
+        disponibilidade e estoque com uma consulta para todos os cupcakes e
+        gravadas de uma vez (no ORM, um DELETE e um upsert em lote). Se
+        alguma linha for inválida nada é gravado.
+
+        Args:
+            usuario (User): Instância do usuário
+            operacoes (list): Dicts {'op': 'set'|'add'|'remove', 'cupcake_id', 'quantidade'}
+            substituir (bool): Remove os cupcakes que não aparecem nas operações
+
+        Returns:
+            dict: Resultado da operação (com 'erros' por cupcake em caso de falha)
+        """
+        armazenamento = CarrinhoService.armazenamento()
+        atuais = armazenamento.linhas(usuario)
+
+        alteracoes = CarrinhoService.aplicar_operacoes(atuais, operacoes, substituir)
+        com_quantidade = [cupcake_id for cupcake_id, quantidade in alteracoes.items() if quantidade > 0]
+        cupcakes = {
+            cupcake['id']: cupcake
+            for cupcake in Cupcake.objects.filter(id__in=com_quantidade).values('id', 'nome', 'disponivel', 'estoque')
+        }
+        erros = CarrinhoService.validar_quantidades(alteracoes, cupcakes)
+
+        if erros:
             return {
                 'sucesso': False,
-                'mensagem': f'Estoque insuficiente. Disponível: {cupcake.estoque}'
+                'mensagem': 'Carrinho não sincronizado',
+                'erros': erros
             }
 
-        # Adiciona ou atualiza item
-        if item_existente:
-            item_existente.quantidade += quantidade
-            item_existente.save()
-        else:
-            ItemCarrinho.objects.create(
-                carrinho=carrinho,
-                cupcake=cupcake,
-                quantidade=quantidade
-            )
+        if alteracoes:
+            armazenamento.gravar(usuario, alteracoes)
 
         return {
             'sucesso': True,
-            'mensagem': f'{cupcake.nome} adicionado ao carrinho',
-            'carrinho': carrinho
+            'mensagem': 'Carrinho sincronizado'
         }
 
+    @staticmethod
+    @transaction.atomic
+    def mesclar_anonimo(usuario, linhas):
+        """
+        Junta o carrinho anônimo (cookie) ao carrinho do usuário
+
+        As quantidades são somadas e limitadas ao estoque; cupcakes
+        indisponíveis são descartados. Tudo é gravado de uma vez.
+
+        Args:
+            usuario (User): Instância do usuário
+            linhas (dict): cupcake_id -> quantidade do carrinho anônimo
+
+        Returns:
+            int: Número de linhas alteradas no carrinho do usuário
+        """
+        if not linhas:
+            return 0
+
+        armazenamento = CarrinhoService.armazenamento()
+        atuais = armazenamento.linhas(usuario)
+        estoques = dict(
+            Cupcake.objects.filter(id__in=list(linhas), disponivel=True).values_list('id', 'estoque')
+        )
+
+        alteracoes = {}
+        for cupcake_id, quantidade in linhas.items():
+            if cupcake_id not in estoques:
+                continue
+            total = min(atuais.get(cupcake_id, 0) + quantidade, estoques[cupcake_id])
+            if total != atuais.get(cupcake_id, 0):
+                alteracoes[cupcake_id] = total
+
+        if alteracoes:
+            armazenamento.gravar(usuario, alteracoes)
+        return len(alteracoes)
+
+    @staticmethod
+    def _cupcake_do_item(usuario, item_id):
+        try:
+            return CarrinhoService.armazenamento().cupcake_do_item(usuario, int(item_id))
+        except (TypeError, ValueError):
+            return None
+
     @staticmethod
     @transaction.atomic
     def remover_item(usuario, item_id):
@@ -95,21 +289,19 @@ class CarrinhoService:
         Returns:
             dict: Resultado da operação
         """
-        carrinho = CarrinhoService.obter_ou_criar_carrinho(usuario)
-        
-        try:
-            item = carrinho.itens.get(id=item_id)
-            item.delete()
-            return {
-                'sucesso': True,
-                'mensagem': 'Item removido do carrinho'
-            }
-        except ItemCarrinho.DoesNotExist:
+        cupcake_id = CarrinhoService._cupcake_do_item(usuario, item_id)
+        if cupcake_id is None:
             return {
                 'sucesso': False,
                 'mensagem': 'Item não encontrado no carrinho'
             }
 
+        CarrinhoService.armazenamento().gravar(usuario, {cupcake_id: 0})
+        return {
+            'sucesso': True,
+            'mensagem': 'Item removido do carrinho'
+        }
+
     @staticmethod
     @transaction.atomic
     def atualizar_quantidade(usuario, item_id, quantidade):
@@ -127,32 +319,31 @@ class CarrinhoService:
         if quantidade < 1:
             return CarrinhoService.remover_item(usuario, item_id)
 
-        carrinho = CarrinhoService.obter_ou_criar_carrinho(usuario)
-        
-        try:
-            item = carrinho.itens.get(id=item_id)
-            
-            # Verifica estoque
-            if item.cupcake.estoque < quantidade:
-                return {
-                    'sucesso': False,
-                    'mensagem': f'Estoque insuficiente. Disponível: {item.cupcake.estoque}'
-                }
-            
-            item.quantidade = quantidade
-            item.save()
-            
+        cupcake_id = CarrinhoService._cupcake_do_item(usuario, item_id)
+        if cupcake_id is None:
             return {
-                'sucesso': True,
-                'mensagem': 'Quantidade atualizada',
-                'item': item
+                'sucesso': False,
+                'mensagem': 'Item não encontrado no carrinho'
             }
-        except ItemCarrinho.DoesNotExist:
+
+        # Mesmas regras da sincronização: disponibilidade e estoque
+        cupcakes = {
+            cupcake['id']: cupcake
+            for cupcake in Cupcake.objects.filter(pk=cupcake_id).values('id', 'nome', 'disponivel', 'estoque')
+        }
+        erros = CarrinhoService.validar_quantidades({cupcake_id: quantidade}, cupcakes)
+        if erros:
             return {
                 'sucesso': False,
-                'mensagem': 'Item não encontrado no carrinho'
+                'mensagem': erros[0]['mensagem']
             }
 
+        CarrinhoService.armazenamento().gravar(usuario, {cupcake_id: quantidade})
+        return {
+            'sucesso': True,
+            'mensagem': 'Quantidade atualizada'
+        }
+
     @staticmethod
     @transaction.atomic
     def limpar_carrinho(usuario):
@@ -165,8 +356,7 @@ class CarrinhoService:
         Returns:
             dict: Resultado da operação
         """
-        carrinho = CarrinhoService.obter_ou_criar_carrinho(usuario)
-        carrinho.limpar()
+        CarrinhoService.armazenamento().limpar(usuario)
         
         return {
             'sucesso': True,
@@ -203,24 +393,29 @@ class CarrinhoService:
         }
 
     @staticmethod
-    def validar_carrinho(carrinho):
+    def validar_carrinho(carrinho, itens=None):
         """
         Valida se o carrinho pode ser processado
         
         Args:
             carrinho (Carrinho): Instância do carrinho
+            itens (list, optional): Itens já carregados (com cupcake), para
+                evitar uma nova consulta
             
         Returns:
             dict: Resultado da validação
         """
-        if not carrinho.itens.exists():
+        if itens is None:
+            itens = list(carrinho.itens.select_related('cupcake'))
+
+        if not itens:
             return {
                 'valido': False,
                 'mensagem': 'Carrinho vazio'
             }
 
         # Verifica disponibilidade e estoque de cada item
-        for item in carrinho.itens.all():
+        for item in itens:
             if not item.cupcake.disponivel:
                 return {
                     'valido': False,
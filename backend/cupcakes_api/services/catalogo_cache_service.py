@@ -0,0 +1,112 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class CatalogoCacheService:
+    """
+    Serviço de cache de leitura do catálogo (cupcakes e categorias)
+
+    Mantém uma versão global do catálogo no cache. Toda alteração em
+    Cupcake ou Categoria incrementa a versão, o que invalida de uma só vez
+    todas as páginas serializadas que foram guardadas com a versão anterior.
+    """
+
+    CHAVE_VERSAO = 'catalogo:versao'
+
+    @staticmethod
+    def obter_versao(chave=CHAVE_VERSAO):
+        """
+        Obtém a versão atual do catálogo
+
+        Args:
+            chave (str, optional): Chave de outra versão mantida da mesma
+                forma (ex: a da trie do autocompletar)
+
+        Returns:
+            int: Versão atual
+        """
+        versao = cache.get(chave)
+        if versao is None:
+            cache.add(chave, 1, timeout=None)
+            versao = cache.get(chave, 1)
+        return versao
+
+    @staticmethod
+    def invalidar(chave=CHAVE_VERSAO):
+        """
+        Incrementa a versão do catálogo, invalidando as entradas em cache
+
+        Args:
+            chave (str, optional): Chave da versão incrementada
+
+        Returns:
+            int: Nova versão
+        """
+        try:
+            return cache.incr(chave)
+        except ValueError:
+            # Chave ausente (cache reiniciado ou expulsa pelo LRU)
+            cache.add(chave, 1, timeout=None)
+            return cache.incr(chave)
+
+    @staticmethod
+    def invalidar_apos_commit(chave=CHAVE_VERSAO):
+        """
+        Invalida o cache agora e novamente quando a transação for confirmada
+
+        A segunda invalidação impede que uma leitura concorrente, feita antes
+        do commit, guarde dados antigos sob a nova versão.
+
+        Args:
+            chave (str, optional): Chave da versão incrementada
+        """
+        CatalogoCacheService.invalidar(chave)
+        transaction.on_commit(lambda: CatalogoCacheService.invalidar(chave))
+
+    @staticmethod
+    def montar_chave(prefixo, parametros=None, staff=False):
+        """
+        Monta a chave de cache para uma consulta do catálogo
+
+        Args:
+            prefixo (str): Identificador da consulta (ex: 'cupcakes:list')
+            parametros (QueryDict|dict, optional): Parâmetros da requisição
+            staff (bool): Se a consulta foi feita por um usuário admin
+
+        Returns:
+            str: Chave de cache vinculada à versão atual do catálogo
+        """
+        itens = []
+        if parametros:
+            if hasattr(parametros, 'lists'):
+                itens = sorted((chave, tuple(valores)) for chave, valores in parametros.lists())
+            else:
+                itens = sorted(parametros.items())
+        resumo = hashlib.md5(repr(itens).encode('utf-8')).hexdigest()
+        versao = CatalogoCacheService.obter_versao()
+        return f"catalogo:{versao}:{prefixo}:{int(bool(staff))}:{resumo}"
+
+    @staticmethod
+    def obter_ou_calcular(chave, calcular, timeout=None):
+        """
+        Retorna o valor em cache ou calcula e armazena
+
+        Args:
+            chave (str): Chave gerada por montar_chave
+            calcular (callable): Função que produz o valor quando não há cache
+            timeout (int): Validade em segundos (padrão CATALOGO_CACHE_TIMEOUT)
+
+        Returns:
+            object: Valor em cache ou recém-calculado
+        """
+        valor = cache.get(chave)
+        if valor is None:
+            valor = calcular()
+            cache.set(
+                chave,
+                valor,
+                timeout=settings.CATALOGO_CACHE_TIMEOUT if timeout is None else timeout
+            )
+        return valor
@@ -0,0 +1,95 @@
+from decimal import Decimal
+from django.db.models import Count, Q
+
+
+class FacetaService:
+    """
+    Serviço de facetas do catálogo (contagens para os filtros da vitrine)
+    """
+
+    # Faixas de preço: (chave, rótulo, mínimo inclusivo, máximo exclusivo)
+    FAIXAS_PRECO = [
+        ('ate_8', 'Até R$ 8,00', None, Decimal('8.00')),
+        ('8_a_10', 'R$ 8,00 a R$ 9,99', Decimal('8.00'), Decimal('10.00')),
+        ('acima_10', 'A partir de R$ 10,00', Decimal('10.00'), None),
+    ]
+
+    @staticmethod
+    def _filtro_faixa(minimo, maximo):
+        filtro = Q()
+        if minimo is not None:
+            filtro &= Q(preco__gte=minimo)
+        if maximo is not None:
+            filtro &= Q(preco__lt=maximo)
+        return filtro
+
+    @staticmethod
+    def calcular_facetas(queryset, categoria_id=None):
+        """
+        Calcula as contagens por categoria, faixa de preço e disponibilidade
+
+        Uma única consulta agrupada por categoria traz, em cada linha, o
+        total e as contagens condicionais das demais facetas. A faceta de
+        categoria ignora o próprio filtro de categoria (para mostrar as
+        alternativas); as demais consideram apenas a categoria selecionada.
+
+        Args:
+            queryset (QuerySet): Cupcakes com os demais filtros aplicados
+            categoria_id (int, optional): Categoria selecionada
+
+        Returns:
+            dict: Total e facetas de categoria, preço e disponibilidade
+        """
+        faixas = FacetaService.FAIXAS_PRECO
+        linhas = (
+            queryset
+            .order_by()
+            .values('categoria_id', 'categoria__nome', 'categoria__slug')
+            .annotate(
+                total=Count('id'),
+                disponiveis=Count('id', filter=Q(disponivel=True)),
+                **{
+                    f'faixa_{chave}': Count('id', filter=FacetaService._filtro_faixa(minimo, maximo))
+                    for chave, _, minimo, maximo in faixas
+                }
+            )
+            .order_by('categoria__nome')
+        )
+
+        categorias = []
+        total = 0
+        disponiveis = 0
+        por_faixa = {chave: 0 for chave, _, _, _ in faixas}
+
+        for linha in linhas:
+            categorias.append({
+                'id': linha['categoria_id'],
+                'nome': linha['categoria__nome'],
+                'slug': linha['categoria__slug'],
+                'count': linha['total']
+            })
+            if categoria_id is not None and linha['categoria_id'] != categoria_id:
+                continue
+            total += linha['total']
+            disponiveis += linha['disponiveis']
+            for chave in por_faixa:
+                por_faixa[chave] += linha[f'faixa_{chave}']
+
+        return {
+            'total': total,
+            'categorias': categorias,
+            'faixas_preco': [
+                {
+                    'chave': chave,
+                    'rotulo': rotulo,
+                    'minimo': None if minimo is None else str(minimo),
+                    'maximo': None if maximo is None else str(maximo),
+                    'count': por_faixa[chave]
+                }
+                for chave, rotulo, minimo, maximo in faixas
+            ],
+            'disponibilidade': {
+                'disponivel': disponiveis,
+                'indisponivel': total - disponiveis
+            }
+        }
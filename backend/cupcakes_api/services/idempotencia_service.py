@@ -0,0 +1,134 @@
+import hashlib
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from cupcakes_api.models import ChaveIdempotencia
+
+
+class IdempotenciaService:
+    """
+    Serviço para execução idempotente de requisições (Idempotency-Key)
+    """
+
+    @staticmethod
+    def calcular_hash(dados):
+        """
+        Calcula o hash canônico do corpo da requisição
+
+        Args:
+            dados (dict): Dados validados da requisição
+
+        Returns:
+            str: Hash SHA-256 em hexadecimal
+        """
+        conteudo = json.dumps(dados, sort_keys=True, cls=DjangoJSONEncoder)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def executar(usuario, chave, endpoint, dados, operacao):
+        """
+        Executa a operação uma única vez por chave de idempotência
+
+        A chave é reservada com um INSERT protegido pelo índice único
+        (usuario, endpoint, chave) na mesma transação da operação. Uma
+        repetição concorrente fica bloqueada nesse índice até a primeira
+        terminar e então recebe a resposta armazenada. Respostas de erro
+        (status >= 400) não são guardadas, permitindo nova tentativa.
+
+        Args:
+            usuario (User): Usuário autenticado
+            chave (str): Valor do header Idempotency-Key
+            endpoint (str): Identificador do endpoint
+            dados (dict): Dados validados da requisição
+            operacao (callable): Função que executa a operação e retorna
+                uma tupla (status_code, corpo_da_resposta)
+
+        Returns:
+            dict: status, resposta e se a resposta foi reproduzida
+        """
+        hash_requisicao = IdempotenciaService.calcular_hash(dados)
+        agora = timezone.now()
+
+        with transaction.atomic():
+            # Chaves expiradas podem ser reutilizadas
+            ChaveIdempotencia.objects.filter(
+                usuario=usuario,
+                endpoint=endpoint,
+                chave=chave,
+                expira_em__lte=agora
+            ).delete()
+
+            try:
+                with transaction.atomic():
+                    registro = ChaveIdempotencia.objects.create(
+                        usuario=usuario,
+                        endpoint=endpoint,
+                        chave=chave,
+                        hash_requisicao=hash_requisicao,
+                        expira_em=agora + timedelta(hours=settings.IDEMPOTENCIA_TTL_HORAS)
+                    )
+            except IntegrityError:
+                registro = ChaveIdempotencia.objects.get(
+                    usuario=usuario,
+                    endpoint=endpoint,
+                    chave=chave
+                )
+                return IdempotenciaService._resposta_armazenada(registro, hash_requisicao)
+
+            status_code, resposta = operacao()
+
+            if status_code >= 400:
+                transaction.set_rollback(True)
+            else:
+                registro.status_code = status_code
+                registro.resposta = resposta
+                registro.save(update_fields=['status_code', 'resposta'])
+
+        return {
+            'status': status_code,
+            'resposta': resposta,
+            'reproduzida': False
+        }
+
+    @staticmethod
+    def _resposta_armazenada(registro, hash_requisicao):
+        """
+        Monta o resultado para uma chave já utilizada
+        """
+        if registro.hash_requisicao != hash_requisicao:
+            return {
+                'status': 422,
+                'resposta': {
+                    'mensagem': 'Idempotency-Key já utilizada com outros dados de requisição'
+                },
+                'reproduzida': False
+            }
+
+        if registro.status_code is None:
+            return {
+                'status': 409,
+                'resposta': {
+                    'mensagem': 'Requisição com esta Idempotency-Key ainda em processamento'
+                },
+                'reproduzida': False
+            }
+
+        return {
+            'status': registro.status_code,
+            'resposta': registro.resposta,
+            'reproduzida': True
+        }
+
+    @staticmethod
+    def limpar_expiradas():
+        """
+        Remove as chaves de idempotência expiradas
+
+        Returns:
+            int: Quantidade de chaves removidas
+        """
+        removidas, _ = ChaveIdempotencia.objects.filter(expira_em__lte=timezone.now()).delete()
+        return removidas
@@ -0,0 +1,259 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+from cupcakes_api.models import Cupcake
+from cupcakes_api.services.catalogo_cache_service import CatalogoCacheService
+from cupcakes_api.services.snapshot_catalogo_service import SnapshotCatalogoService
+
+
+class ImagemService:
+    """
+    Serviço de variantes (miniaturas WebP/JPEG) das imagens dos cupcakes
+
+    As variantes ficam ao lado do original no storage de mídia
+    (ex: cupcakes/red-velvet-320w.webp) e seus nomes são guardados em
+    Cupcake.imagem_variantes. A geração roda em um pool de threads depois
+    do commit, para não atrasar o upload.
+    """
+
+    # Formato das settings -> (formato do Pillow, extensão do arquivo)
+    FORMATOS = {
+        'webp': ('WEBP', 'webp'),
+        'jpeg': ('JPEG', 'jpg'),
+    }
+
+    _executor = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def storage():
+        return Cupcake._meta.get_field('imagem').storage
+
+    @classmethod
+    def _obter_executor(cls):
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=settings.IMAGEM_THREADS,
+                    thread_name_prefix='imagem-variantes'
+                )
+            return cls._executor
+
+    @staticmethod
+    def nome_variante(nome, largura, extensao):
+        """
+        Nome do arquivo da variante, no mesmo diretório do original
+
+        Args:
+            nome (str): Nome do arquivo original no storage
+            largura (int): Largura da variante
+            extensao (str): Extensão do formato
+
+        Returns:
+            str: Nome da variante
+        """
+        base, _ = os.path.splitext(nome)
+        return f'{base}-{largura}w.{extensao}'
+
+    @staticmethod
+    def _converter(imagem, formato_pillow):
+        """Ajusta o modo de cor ao formato de destino"""
+        transparente = imagem.mode in ('RGBA', 'LA', 'PA') or 'transparency' in imagem.info
+        if formato_pillow == 'JPEG':
+            if transparente:
+                # JPEG não tem transparência: aplica sobre fundo branco
+                imagem = imagem.convert('RGBA')
+                fundo = Image.new('RGB', imagem.size, (255, 255, 255))
+                fundo.paste(imagem, mask=imagem.getchannel('A'))
+                return fundo
+            return imagem.convert('RGB')
+        if imagem.mode in ('RGB', 'RGBA'):
+            return imagem
+        return imagem.convert('RGBA' if transparente else 'RGB')
+
+    @staticmethod
+    def gerar_variantes(nome):
+        """
+        Gera as variantes de um arquivo de imagem
+
+        Larguras maiores que a do original não são geradas (sem ampliação);
+        se o original for menor que todas, é gerada uma variante na largura
+        original.
+
+        Args:
+            nome (str): Nome do arquivo original no storage
+
+        Returns:
+            dict: Variantes no formato de Cupcake.imagem_variantes
+        """
+        storage = ImagemService.storage()
+        with storage.open(nome, 'rb') as arquivo:
+            original = Image.open(arquivo)
+            original = ImageOps.exif_transpose(original)
+            original.load()
+
+        larguras = [largura for largura in settings.IMAGEM_LARGURAS if largura < original.width]
+        if len(larguras) < len(settings.IMAGEM_LARGURAS):
+            larguras.append(original.width)
+
+        variantes = {'origem': nome}
+        for formato in settings.IMAGEM_FORMATOS:
+            formato_pillow, extensao = ImagemService.FORMATOS[formato]
+            convertida = ImagemService._converter(original, formato_pillow)
+            variantes[formato] = {}
+
+            for largura in larguras:
+                altura = max(1, round(original.height * largura / original.width))
+                redimensionada = convertida.resize((largura, altura), Image.LANCZOS)
+
+                conteudo = BytesIO()
+                redimensionada.save(
+                    conteudo,
+                    formato_pillow,
+                    quality=settings.IMAGEM_QUALIDADE,
+                    optimize=True
+                )
+
+                nome_variante = ImagemService.nome_variante(nome, largura, extensao)
+                if storage.exists(nome_variante):
+                    storage.delete(nome_variante)
+                variantes[formato][str(largura)] = storage.save(
+                    nome_variante, ContentFile(conteudo.getvalue())
+                )
+
+        return variantes
+
+    @staticmethod
+    def montar_srcset(variantes, url):
+        """
+        Monta o mapa formato -> srcset a partir de Cupcake.imagem_variantes
+
+        Args:
+            variantes (dict): Valor de Cupcake.imagem_variantes
+            url (callable): Converte o nome do arquivo em URL
+
+        Returns:
+            dict: Ex: {'webp': '.../a-320w.webp 320w, .../a-640w.webp 640w'}
+        """
+        srcset = {}
+        for formato in ImagemService.FORMATOS:
+            arquivos = (variantes or {}).get(formato)
+            if arquivos:
+                srcset[formato] = ', '.join(
+                    f'{url(nome)} {largura}w'
+                    for largura, nome in sorted(arquivos.items(), key=lambda item: int(item[0]))
+                )
+        return srcset
+
+    @staticmethod
+    def remover_variantes(variantes):
+        """
+        Apaga do storage os arquivos de variantes
+
+        Args:
+            variantes (dict): Valor de Cupcake.imagem_variantes
+        """
+        storage = ImagemService.storage()
+        for formato in ImagemService.FORMATOS:
+            for nome in (variantes or {}).get(formato, {}).values():
+                storage.delete(nome)
+
+    @staticmethod
+    def processar_cupcake(cupcake_id, forcar=False):
+        """
+        Gera (ou remove) as variantes da imagem atual de um cupcake
+
+        A gravação só acontece se a imagem não tiver mudado durante a
+        geração, evitando sobrescrever variantes de um upload mais novo.
+
+        Args:
+            cupcake_id (int): ID do cupcake
+            forcar (bool): Regenera mesmo se as variantes estiverem em dia
+
+        Returns:
+            dict: Resultado da operação
+        """
+        cupcake = Cupcake.objects.filter(pk=cupcake_id).values('imagem', 'imagem_variantes').first()
+        if cupcake is None:
+            return {'sucesso': False, 'mensagem': 'Cupcake não encontrado'}
+
+        nome = cupcake['imagem'] or ''
+        anteriores = cupcake['imagem_variantes'] or {}
+        if not forcar and anteriores.get('origem', '') == nome:
+            return {'sucesso': True, 'mensagem': 'Variantes já atualizadas'}
+
+        try:
+            variantes = ImagemService.gerar_variantes(nome) if nome else {}
+        except (OSError, Image.DecompressionBombError) as erro:
+            return {'sucesso': False, 'mensagem': f'Erro ao gerar variantes: {erro}'}
+
+        imagem_atual = Q(imagem=nome) if nome else Q(imagem='') | Q(imagem__isnull=True)
+        atualizados = Cupcake.objects.filter(imagem_atual, pk=cupcake_id).update(
+            imagem_variantes=variantes,
+            updated_at=timezone.now()
+        )
+        if not atualizados:
+            ImagemService.remover_variantes(variantes)
+            return {'sucesso': False, 'mensagem': 'Imagem alterada durante a geração'}
+
+        # Arquivos do upload anterior que não foram sobrescritos
+        atuais = {
+            nome_variante
+            for formato in ImagemService.FORMATOS
+            for nome_variante in variantes.get(formato, {}).values()
+        }
+        ImagemService.remover_variantes({
+            formato: {
+                largura: nome_variante
+                for largura, nome_variante in anteriores.get(formato, {}).items()
+                if nome_variante not in atuais
+            }
+            for formato in ImagemService.FORMATOS
+        })
+        CatalogoCacheService.invalidar()
+        if settings.CATALOGO_SNAPSHOT_AUTOMATICO:
+            # O update() acima não dispara os signals do model
+            SnapshotCatalogoService.agendar(cupcake_ids=[cupcake_id])
+
+        return {
+            'sucesso': True,
+            'mensagem': 'Variantes geradas' if variantes else 'Variantes removidas',
+            'variantes': variantes
+        }
+
+    @staticmethod
+    def _processar_em_thread(cupcake_id):
+        try:
+            ImagemService.processar_cupcake(cupcake_id)
+        finally:
+            # Cada thread abre a sua conexão com o banco
+            connection.close()
+
+    @staticmethod
+    def agendar(cupcake):
+        """
+        Agenda a geração das variantes para depois do commit
+
+        Args:
+            cupcake (Cupcake): Cupcake salvo
+        """
+        nome = cupcake.imagem.name if cupcake.imagem else ''
+        if (cupcake.imagem_variantes or {}).get('origem', '') == nome:
+            return
+
+        cupcake_id = cupcake.id
+        if settings.IMAGEM_THREADS > 0:
+            transaction.on_commit(
+                lambda: ImagemService._obter_executor().submit(
+                    ImagemService._processar_em_thread, cupcake_id
+                )
+            )
+        else:
+            transaction.on_commit(lambda: ImagemService.processar_cupcake(cupcake_id))
@@ -1,9 +1,15 @@
 from decimal import Decimal
+from django.conf import settings
 from django.db import transaction
-from cupcakes_api.models import Pedido, ItemPedido, Pagamento, Cupom
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from cupcakes_api.models import Pedido, ItemPedido, Pagamento, Cupom, VendaDiaria
 from .carrinho_service import CarrinhoService
+from .catalogo_cache_service import CatalogoCacheService
+from .snapshot_catalogo_service import SnapshotCatalogoService
 from .cupom_service import CupomService
 from .frete_service import FreteService
+from .venda_diaria_service import VendaDiariaService
 
 
 class PedidoService:
@@ -24,11 +30,16 @@ class PedidoService:
         Returns:
             dict: Resultado da operação com o pedido criado
         """
-        # Obtém o carrinho
+        # Obtém o carrinho e seus itens (com cupcakes) em ordem de cupcake;
+        # alterações ainda fora do banco são gravadas antes
+        CarrinhoService.persistir(usuario)
         carrinho = CarrinhoService.obter_ou_criar_carrinho(usuario)
+        itens_carrinho = list(
+            carrinho.itens.select_related('cupcake').order_by('cupcake_id')
+        )
         
         # Valida o carrinho
-        validacao = CarrinhoService.validar_carrinho(carrinho)
+        validacao = CarrinhoService.validar_carrinho(carrinho, itens_carrinho)
         if not validacao['valido']:
             return {
                 'sucesso': False,
@@ -36,7 +47,7 @@ class PedidoService:
             }
 
         # Calcula subtotal
-        subtotal = carrinho.subtotal
+        subtotal = sum(item.subtotal for item in itens_carrinho)
 
         # Aplica cupom se fornecido
         cupom = None
@@ -64,6 +75,20 @@ class PedidoService:
         # Calcula total
         total = subtotal - valor_desconto + valor_frete
 
+        # Baixa o estoque com um UPDATE condicional por cupcake, sempre em
+        # ordem crescente de id, para que checkouts concorrentes não vendam
+        # além do estoque nem entrem em deadlock
+        for item_carrinho in itens_carrinho:
+            if not item_carrinho.cupcake.reduzir_estoque(item_carrinho.quantidade):
+                transaction.set_rollback(True)
+                return {
+                    'sucesso': False,
+                    'mensagem': f'Estoque insuficiente para {item_carrinho.cupcake.nome}'
+                }
+        CatalogoCacheService.invalidar_apos_commit()
+        if settings.CATALOGO_SNAPSHOT_AUTOMATICO:
+            SnapshotCatalogoService.agendar(cupcake_ids=[item.cupcake_id for item in itens_carrinho])
+
         # Cria o pedido
         pedido = Pedido.objects.create(
             usuario=usuario,
@@ -87,17 +112,19 @@ class PedidoService:
             observacoes=dados_pedido.get('observacoes', '')
         )
 
-        # Cria os itens do pedido
-        for item_carrinho in carrinho.itens.all():
-            ItemPedido.objects.create(
+        # Cria os itens do pedido em um único INSERT
+        # (bulk_create não chama save(), então o subtotal é calculado aqui)
+        ItemPedido.objects.bulk_create([
+            ItemPedido(
                 pedido=pedido,
                 cupcake=item_carrinho.cupcake,
                 quantidade=item_carrinho.quantidade,
-                preco_unitario=item_carrinho.cupcake.preco
+                preco_unitario=item_carrinho.cupcake.preco,
+                subtotal=item_carrinho.subtotal
             )
-            
-            # Reduz o estoque
-            item_carrinho.cupcake.reduzir_estoque(item_carrinho.quantidade)
+            for item_carrinho in itens_carrinho
+        ])
+        itens_vendidos = sum(item.quantidade for item in itens_carrinho)
 
         # Cria o pagamento
         troco = None
@@ -116,12 +143,17 @@ class PedidoService:
         # Processa o pagamento
         pagamento.processar()
 
+        # Contabiliza na consolidação diária de vendas
+        VendaDiariaService.registrar_pedido(pedido, itens_vendidos)
+
         # Marca o cupom como usado
         if cupom:
             CupomService.aplicar_cupom(cupom)
 
         # Limpa o carrinho
-        CarrinhoService.limpar_carrinho(usuario)
+        carrinho.limpar()
+        usuario_id = usuario.pk
+        transaction.on_commit(lambda: CarrinhoService.armazenamento().esquecer(usuario_id))
 
         return {
             'sucesso': True,
@@ -192,7 +224,9 @@ class PedidoService:
                 'mensagem': 'Pedido não encontrado'
             }
 
+        status_anterior = pedido.status
         if pedido.atualizar_status(novo_status):
+            VendaDiariaService.mover_status(pedido, status_anterior)
             return {
                 'sucesso': True,
                 'mensagem': f'Status atualizado para {pedido.get_status_display()}',
@@ -232,16 +266,25 @@ class PedidoService:
                 'mensagem': 'Não é possível cancelar este pedido'
             }
 
-        # Devolve estoque
-        for item in pedido.itens.all():
-            item.cupcake.estoque += item.quantidade
-            item.cupcake.save()
+        status_anterior = pedido.status
+
+        # Devolve estoque (mesma ordem de cupcakes usada no checkout)
+        itens_vendidos = 0
+        for item in pedido.itens.select_related('cupcake').order_by('cupcake_id'):
+            itens_vendidos += item.quantidade
+            item.cupcake.repor_estoque(item.quantidade)
+        CatalogoCacheService.invalidar_apos_commit()
+        if settings.CATALOGO_SNAPSHOT_AUTOMATICO:
+            SnapshotCatalogoService.agendar(
+                cupcake_ids=pedido.itens.values_list('cupcake_id', flat=True)
+            )
 
         # Cancela pagamento
         if hasattr(pedido, 'pagamento'):
             pedido.pagamento.cancelar()
 
         pedido.atualizar_status('cancelado')
+        VendaDiariaService.mover_status(pedido, status_anterior, itens_vendidos)
 
         return {
             'sucesso': True,
@@ -249,31 +292,87 @@ class PedidoService:
             'pedido': pedido
         }
 
+    GRANULARIDADES = {
+        'semana': TruncWeek,
+        'mes': TruncMonth
+    }
+
     @staticmethod
-    def calcular_estatisticas_pedidos(data_inicio=None, data_fim=None):
+    def calcular_estatisticas_pedidos(data_inicio=None, data_fim=None, granularidade=None):
         """
         Calcula estatísticas de pedidos
-        
+
+        Lê a consolidação diária (VendaDiaria) em vez de varrer a tabela de
+        pedidos: totais e contagens por status e por tipo de entrega saem de
+        uma única consulta com agregação condicional.
+
         Args:
-            data_inicio (datetime, optional): Data inicial
-            data_fim (datetime, optional): Data final
-            
+            data_inicio (date, optional): Data inicial (inclusive)
+            data_fim (date, optional): Data final (inclusive)
+            granularidade (str, optional): 'dia', 'semana' ou 'mes' para
+                incluir a série temporal de vendas
+
         Returns:
             dict: Estatísticas
         """
-        from django.db.models import Sum, Count, Avg
-        
-        pedidos = Pedido.objects.all()
-        
+        vendas = VendaDiaria.objects.all()
+
         if data_inicio:
-            pedidos = pedidos.filter(created_at__gte=data_inicio)
+            vendas = vendas.filter(data__gte=data_inicio)
         if data_fim:
-            pedidos = pedidos.filter(created_at__lte=data_fim)
+            vendas = vendas.filter(data__lte=data_fim)
 
-        return {
-            'total_pedidos': pedidos.count(),
-            'total_vendas': pedidos.aggregate(Sum('total'))['total__sum'] or Decimal('0.00'),
-            'ticket_medio': pedidos.aggregate(Avg('total'))['total__avg'] or Decimal('0.00'),
-            'por_status': pedidos.values('status').annotate(count=Count('id')),
-            'por_tipo_entrega': pedidos.values('tipo_entrega').annotate(count=Count('id'))
+        agregados = {
+            'soma_pedidos': Sum('total_pedidos'),
+            'soma_vendas': Sum('total_vendas'),
         }
+        for valor, _ in Pedido.STATUS_CHOICES:
+            agregados[f'status_{valor}'] = Sum('total_pedidos', filter=Q(status=valor))
+        for valor, _ in Pedido.TIPO_ENTREGA_CHOICES:
+            agregados[f'entrega_{valor}'] = Sum('total_pedidos', filter=Q(tipo_entrega=valor))
+
+        resultado = vendas.aggregate(**agregados)
+
+        total_pedidos = resultado['soma_pedidos'] or 0
+        total_vendas = resultado['soma_vendas'] or Decimal('0.00')
+        ticket_medio = Decimal('0.00')
+        if total_pedidos:
+            ticket_medio = (total_vendas / total_pedidos).quantize(Decimal('0.01'))
+
+        estatisticas = {
+            'total_pedidos': total_pedidos,
+            'total_vendas': total_vendas,
+            'ticket_medio': ticket_medio,
+            'por_status': [
+                {'status': valor, 'count': resultado[f'status_{valor}']}
+                for valor, _ in Pedido.STATUS_CHOICES
+                if resultado[f'status_{valor}']
+            ],
+            'por_tipo_entrega': [
+                {'tipo_entrega': valor, 'count': resultado[f'entrega_{valor}']}
+                for valor, _ in Pedido.TIPO_ENTREGA_CHOICES
+                if resultado[f'entrega_{valor}']
+            ]
+        }
+
+        if granularidade:
+            if granularidade == 'dia':
+                vendas = vendas.annotate(periodo=F('data'))
+            else:
+                vendas = vendas.annotate(periodo=PedidoService.GRANULARIDADES[granularidade]('data'))
+            serie = (
+                vendas
+                .values('periodo')
+                .annotate(soma_pedidos=Sum('total_pedidos'), soma_vendas=Sum('total_vendas'))
+                .order_by('periodo')
+            )
+            estatisticas['serie'] = [
+                {
+                    'periodo': linha['periodo'],
+                    'total_pedidos': linha['soma_pedidos'],
+                    'total_vendas': linha['soma_vendas']
+                }
+                for linha in serie
+            ]
+
+        return estatisticas
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from cupcakes_api.models import Categoria, Cupcake, RemocaoCatalogo
+
+
+class SincronizacaoCatalogoService:
+    """
+    Serviço de sincronização incremental do catálogo
+
+    Informa o que mudou desde um instante: cupcakes e categorias com
+    updated_at mais recente e os IDs que o cliente deve apagar da cópia
+    local (excluídos, desativados ou não mais visíveis).
+    """
+
+    # Sobreposição entre sincronizações: cobre transações que gravaram o
+    # updated_at antes da consulta anterior, mas só confirmaram depois dela
+    MARGEM = timedelta(seconds=5)
+
+    @staticmethod
+    def registrar_remocao(tipo, objeto_id, categoria_id=None):
+        """
+        Registra a exclusão de um cupcake ou categoria
+
+        Args:
+            tipo (str): 'cupcake' ou 'categoria'
+            objeto_id (int): ID do objeto excluído
+            categoria_id (int, optional): Categoria do cupcake excluído
+        """
+        RemocaoCatalogo.objects.update_or_create(
+            tipo=tipo,
+            objeto_id=objeto_id,
+            defaults={'categoria_id': categoria_id, 'removido_em': timezone.now()}
+        )
+
+    @staticmethod
+    def limite_historico():
+        """
+        Instante mais antigo a partir do qual as remoções ainda são conhecidas
+        """
+        return timezone.now() - timedelta(days=settings.CATALOGO_REMOCOES_RETENCAO_DIAS)
+
+    @staticmethod
+    def obter_mudancas(desde, cupcakes, categorias):
+        """
+        Calcula as mudanças do catálogo desde um instante
+
+        Args:
+            desde (datetime): Valor de "ate" da sincronização anterior
+            cupcakes (QuerySet): Cupcakes visíveis para o usuário
+            categorias (QuerySet): Categorias visíveis para o usuário
+
+        Returns:
+            dict: {'sucesso', 'ate', 'cupcakes', 'categorias', 'removidos'},
+                com os querysets alterados e os IDs a remover
+        """
+        ate = timezone.now()
+        if desde < SincronizacaoCatalogoService.limite_historico():
+            return {
+                'sucesso': False,
+                'mensagem': 'Histórico de remoções expirado. Baixe o catálogo completo'
+            }
+
+        inicio = desde - SincronizacaoCatalogoService.MARGEM
+        remocoes = RemocaoCatalogo.objects.filter(removido_em__gte=inicio)
+
+        # Nome e slug da categoria fazem parte da representação do cupcake
+        cupcakes_alterados = Cupcake.objects.filter(
+            Q(updated_at__gte=inicio) | Q(categoria__updated_at__gte=inicio)
+        )
+        # Totais da categoria mudam junto com os seus cupcakes
+        categorias_alteradas = Categoria.objects.filter(
+            Q(updated_at__gte=inicio)
+            | Q(cupcakes__updated_at__gte=inicio)
+            | Q(pk__in=remocoes.filter(tipo='cupcake').values('categoria_id'))
+        )
+
+        cupcakes_removidos = set(
+            remocoes.filter(tipo='cupcake').values_list('objeto_id', flat=True)
+        ) | set(
+            cupcakes_alterados.exclude(pk__in=cupcakes.values('pk')).values_list('pk', flat=True)
+        )
+        categorias_removidas = set(
+            remocoes.filter(tipo='categoria').values_list('objeto_id', flat=True)
+        ) | set(
+            categorias_alteradas.exclude(pk__in=categorias.values('pk')).values_list('pk', flat=True)
+        )
+
+        return {
+            'sucesso': True,
+            'ate': ate,
+            'cupcakes': cupcakes.filter(pk__in=cupcakes_alterados.values('pk')),
+            'categorias': categorias.filter(pk__in=categorias_alteradas.values('pk')),
+            'removidos': {
+                'cupcakes': sorted(cupcakes_removidos),
+                'categorias': sorted(categorias_removidas),
+            }
+        }
+
+    @staticmethod
+    def limpar_remocoes_antigas():
+        """
+        Remove os registros de remoção fora do período de retenção
+
+        Returns:
+            int: Quantidade de registros removidos
+        """
+        removidos, _ = RemocaoCatalogo.objects.filter(
+            removido_em__lt=SincronizacaoCatalogoService.limite_historico()
+        ).delete()
+        return removidos
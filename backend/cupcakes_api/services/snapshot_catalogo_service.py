@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from cupcakes_api.middleware import brotli, comprimir
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.renderers import JSONRapidoRenderer
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class SnapshotCatalogoService:
+    """
+    Serviço de publicação do catálogo como arquivo estático
+
+    Gera em STATIC_ROOT/catalogo/ um JSON com os cupcakes e as categorias
+    ativos, nomeado pelo hash do conteúdo (catalogo.<hash>.json) e com as
+    versões .gz/.br ao lado, para o WhiteNoise servir sem passar pelo Django.
+    O arquivo atual.json aponta para o snapshot vigente.
+
+    A publicação incremental reaproveita o snapshot anterior e só
+    serializa de novo os cupcakes alterados; as categorias (poucas, com
+    totais agregados) são sempre recalculadas.
+    """
+
+    DIRETORIO = 'catalogo'
+    PONTEIRO = 'atual.json'
+    # Snapshots anteriores mantidos para clientes que ainda os referenciam
+    MANTER = 3
+
+    _lock = threading.Lock()
+    _pendentes = threading.local()
+
+    @staticmethod
+    def diretorio():
+        return Path(settings.STATIC_ROOT) / SnapshotCatalogoService.DIRETORIO
+
+    @staticmethod
+    def url(arquivo):
+        return f'{settings.STATIC_URL}{SnapshotCatalogoService.DIRETORIO}/{arquivo}'
+
+    @staticmethod
+    def obter_atual():
+        """
+        Lê o ponteiro do snapshot vigente
+
+        Returns:
+            dict|None: Dados do snapshot atual ou None se nunca foi publicado
+        """
+        try:
+            with open(SnapshotCatalogoService.diretorio() / SnapshotCatalogoService.PONTEIRO, 'rb') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _serializar_cupcakes(queryset):
+        """
+        Serializa cupcakes como na listagem pública (caminho rápido)
+
+        Returns:
+            dict: ID -> cupcake serializado
+        """
+        # Import local: os serializers importam serviços
+        from cupcakes_api.serializers import CupcakeListSerializer
+
+        dados = CupcakeListSerializer(queryset, many=True).data
+        return {cupcake['id']: cupcake for cupcake in dados}
+
+    @staticmethod
+    def _serializar_categorias():
+        from cupcakes_api.serializers import CategoriaSerializer
+
+        queryset = CategoriaSerializer.otimizar_queryset(Categoria.objects.filter(ativo=True))
+        return CategoriaSerializer(queryset, many=True).data
+
+    @staticmethod
+    def _ler_snapshot(arquivo):
+        try:
+            with open(SnapshotCatalogoService.diretorio() / arquivo, 'rb') as conteudo:
+                return json.load(conteudo)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _montar_conteudo(cupcake_ids=None, categoria_ids=None):
+        """
+        Monta o conteúdo do snapshot, reaproveitando o anterior se possível
+
+        Args:
+            cupcake_ids (iterable, optional): Cupcakes alterados
+            categoria_ids (iterable, optional): Categorias alteradas
+
+        Returns:
+            tuple: (conteúdo, publicação incremental?)
+        """
+        atual = SnapshotCatalogoService.obter_atual()
+        anterior = None
+        if atual and (cupcake_ids is not None or categoria_ids is not None):
+            anterior = SnapshotCatalogoService._ler_snapshot(atual['arquivo'])
+
+        ativos = Cupcake.objects.filter(ativo=True)
+        if anterior is None:
+            cupcakes = SnapshotCatalogoService._serializar_cupcakes(ativos)
+            ordem = list(cupcakes)
+        else:
+            # A ordem (e quem continua ativo) vem do banco, só com os IDs
+            ordem = list(ativos.values_list('id', flat=True))
+            cupcakes = {cupcake['id']: cupcake for cupcake in anterior['cupcakes']}
+
+            alterados = set(cupcake_ids or ()) | (set(ordem) - set(cupcakes))
+            if categoria_ids:
+                # Nome e slug da categoria estão em cada cupcake
+                alterados.update(
+                    Cupcake.objects.filter(categoria_id__in=categoria_ids).values_list('id', flat=True)
+                )
+            for cupcake_id in alterados:
+                cupcakes.pop(cupcake_id, None)
+            cupcakes.update(SnapshotCatalogoService._serializar_cupcakes(ativos.filter(id__in=alterados)))
+
+        conteudo = {
+            'categorias': SnapshotCatalogoService._serializar_categorias(),
+            'cupcakes': [cupcakes[cupcake_id] for cupcake_id in ordem if cupcake_id in cupcakes],
+        }
+        return conteudo, anterior is not None
+
+    @staticmethod
+    def _gravar(caminho, conteudo):
+        """Grava de forma atômica (arquivo temporário + rename)"""
+        temporario = caminho.with_name(f'.{caminho.name}.{os.getpid()}.tmp')
+        temporario.write_bytes(conteudo)
+        os.replace(temporario, caminho)
+
+    @staticmethod
+    def _limpar_antigos(diretorio, atual):
+        """
+        Remove snapshots antigos, mantendo o atual e os MANTER mais recentes
+        """
+        anteriores = sorted(
+            (caminho for caminho in diretorio.glob('catalogo.*.json') if caminho.name != atual),
+            key=lambda caminho: caminho.stat().st_mtime,
+            reverse=True
+        )
+        for caminho in anteriores[SnapshotCatalogoService.MANTER:]:
+            for variante in (caminho, Path(f'{caminho}.gz'), Path(f'{caminho}.br')):
+                variante.unlink(missing_ok=True)
+
+    @staticmethod
+    def publicar(cupcake_ids=None, categoria_ids=None):
+        """
+        Publica o snapshot do catálogo
+
+        Sem IDs (ou sem snapshot anterior) o catálogo é gerado por completo.
+
+        Args:
+            cupcake_ids (iterable, optional): Cupcakes alterados
+            categoria_ids (iterable, optional): Categorias alteradas
+
+        Returns:
+            dict: Resultado da operação
+        """
+        diretorio = SnapshotCatalogoService.diretorio()
+        diretorio.mkdir(parents=True, exist_ok=True)
+
+        with SnapshotCatalogoService._lock, open(diretorio / '.lock', 'a') as trava:
+            # Serializa também publicações de outros processos da máquina
+            if fcntl is not None:
+                fcntl.flock(trava, fcntl.LOCK_EX)
+
+            conteudo, incremental = SnapshotCatalogoService._montar_conteudo(cupcake_ids, categoria_ids)
+            corpo = JSONRapidoRenderer().render(conteudo)
+            resumo = hashlib.sha256(corpo).hexdigest()[:12]
+            arquivo = f'catalogo.{resumo}.json'
+
+            atual = SnapshotCatalogoService.obter_atual()
+            if atual and atual['arquivo'] == arquivo and (diretorio / arquivo).exists():
+                return {
+                    'sucesso': True,
+                    'mensagem': 'Catálogo sem alterações',
+                    'arquivo': arquivo,
+                    'alterado': False
+                }
+
+            caminho = diretorio / arquivo
+            SnapshotCatalogoService._gravar(caminho, corpo)
+            SnapshotCatalogoService._gravar(Path(f'{caminho}.gz'), comprimir(corpo, 'gzip', nivel=9))
+            if brotli is not None:
+                SnapshotCatalogoService._gravar(Path(f'{caminho}.br'), comprimir(corpo, 'br', nivel=11))
+
+            ponteiro = {
+                'arquivo': arquivo,
+                'url': SnapshotCatalogoService.url(arquivo),
+                'hash': resumo,
+                'gerado_em': timezone.now().isoformat(),
+                'cupcakes': len(conteudo['cupcakes']),
+                'categorias': len(conteudo['categorias']),
+            }
+            SnapshotCatalogoService._gravar(
+                diretorio / SnapshotCatalogoService.PONTEIRO,
+                json.dumps(ponteiro).encode('utf-8')
+            )
+            SnapshotCatalogoService._limpar_antigos(diretorio, arquivo)
+
+        return {
+            'sucesso': True,
+            'mensagem': 'Snapshot incremental publicado' if incremental else 'Snapshot publicado',
+            'arquivo': arquivo,
+            'alterado': True
+        }
+
+    @classmethod
+    def agendar(cls, cupcake_ids=(), categoria_ids=()):
+        """
+        Agenda a publicação incremental para depois do commit
+
+        Alterações da mesma transação são publicadas de uma só vez.
+
+        Args:
+            cupcake_ids (iterable): Cupcakes alterados
+            categoria_ids (iterable): Categorias alteradas
+        """
+        pendentes = getattr(cls._pendentes, 'ids', None)
+        if pendentes is None:
+            pendentes = cls._pendentes.ids = {'cupcakes': set(), 'categorias': set()}
+        pendentes['cupcakes'].update(cupcake_ids)
+        pendentes['categorias'].update(categoria_ids)
+        transaction.on_commit(cls._publicar_pendentes)
+
+    @classmethod
+    def _publicar_pendentes(cls):
+        pendentes = getattr(cls._pendentes, 'ids', None)
+        cls._pendentes.ids = None
+        if not pendentes:
+            return
+        cls.publicar(cupcake_ids=pendentes['cupcakes'], categoria_ids=pendentes['categorias'])
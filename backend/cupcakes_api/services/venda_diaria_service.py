@@ -0,0 +1,172 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from cupcakes_api.models import Pedido, VendaDiaria
+
+
+def inicio_do_dia(data):
+    """Retorna o início do dia (timezone local) como datetime aware"""
+    return timezone.make_aware(datetime.combine(data, time.min))
+
+
+class VendaDiariaService:
+    """
+    Serviço para manter a consolidação diária de vendas (VendaDiaria)
+    """
+
+    @staticmethod
+    def _contar_itens(pedido):
+        """Soma a quantidade de itens de um pedido"""
+        return pedido.itens.aggregate(total=Sum('quantidade'))['total'] or 0
+
+    @staticmethod
+    def _acumular(pedido, status, sinal, itens_vendidos):
+        """
+        Soma (sinal=1) ou subtrai (sinal=-1) um pedido da linha do seu dia
+
+        Args:
+            pedido (Pedido): Instância do pedido
+            status (str): Status sob o qual o pedido é contabilizado
+            sinal (int): 1 para somar, -1 para subtrair
+            itens_vendidos (int): Quantidade de itens do pedido
+        """
+        linha, _ = VendaDiaria.objects.get_or_create(
+            data=timezone.localdate(pedido.created_at),
+            status=status,
+            tipo_entrega=pedido.tipo_entrega
+        )
+        VendaDiaria.objects.filter(pk=linha.pk).update(
+            total_pedidos=F('total_pedidos') + sinal,
+            total_vendas=F('total_vendas') + sinal * pedido.total,
+            total_descontos=F('total_descontos') + sinal * pedido.valor_desconto,
+            total_frete=F('total_frete') + sinal * pedido.valor_frete,
+            itens_vendidos=F('itens_vendidos') + sinal * itens_vendidos,
+            updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def registrar_pedido(pedido, itens_vendidos=None):
+        """
+        Contabiliza um novo pedido na consolidação do seu dia
+
+        Args:
+            pedido (Pedido): Pedido recém-criado
+            itens_vendidos (int, optional): Quantidade de itens, se já conhecida
+        """
+        if itens_vendidos is None:
+            itens_vendidos = VendaDiariaService._contar_itens(pedido)
+        VendaDiariaService._acumular(pedido, pedido.status, 1, itens_vendidos)
+
+    @staticmethod
+    def mover_status(pedido, status_anterior, itens_vendidos=None):
+        """
+        Move um pedido da linha do status anterior para a do status atual
+
+        Args:
+            pedido (Pedido): Pedido com o status já atualizado
+            status_anterior (str): Status antes da alteração
+            itens_vendidos (int, optional): Quantidade de itens, se já conhecida
+        """
+        if status_anterior == pedido.status:
+            return
+        if itens_vendidos is None:
+            itens_vendidos = VendaDiariaService._contar_itens(pedido)
+        VendaDiariaService._acumular(pedido, status_anterior, -1, itens_vendidos)
+        VendaDiariaService._acumular(pedido, pedido.status, 1, itens_vendidos)
+
+    @staticmethod
+    def remover_pedido(pedido, itens_vendidos=None):
+        """
+        Tira da consolidação um pedido que será excluído
+
+        Args:
+            pedido (Pedido): Pedido ainda com os itens
+            itens_vendidos (int, optional): Quantidade de itens, se já conhecida
+        """
+        if itens_vendidos is None:
+            itens_vendidos = VendaDiariaService._contar_itens(pedido)
+        VendaDiariaService._acumular(pedido, pedido.status, -1, itens_vendidos)
+
+    @staticmethod
+    def recalcular(data_inicio=None, data_fim=None, tamanho_lote=2000, modelos=None):
+        """
+        Reconstrói a consolidação a partir de Pedido/ItemPedido
+
+        Os pedidos são lidos em lotes ordenados por id (keyset), de modo que a
+        memória usada não depende do tamanho do histórico.
+
+        Args:
+            data_inicio (date, optional): Primeiro dia a recalcular
+            data_fim (date, optional): Último dia a recalcular
+            tamanho_lote (int): Quantidade de pedidos lidos por consulta
+            modelos (tuple, optional): (Pedido, VendaDiaria) históricos,
+                para uso em migrações
+
+        Returns:
+            dict: Quantidade de pedidos lidos e de linhas geradas
+        """
+        modelo_pedido, modelo_venda = modelos or (Pedido, VendaDiaria)
+        pedidos = modelo_pedido.objects.all()
+        linhas_existentes = modelo_venda.objects.all()
+
+        if data_inicio:
+            pedidos = pedidos.filter(created_at__gte=inicio_do_dia(data_inicio))
+            linhas_existentes = linhas_existentes.filter(data__gte=data_inicio)
+        if data_fim:
+            pedidos = pedidos.filter(created_at__lt=inicio_do_dia(data_fim + timedelta(days=1)))
+            linhas_existentes = linhas_existentes.filter(data__lte=data_fim)
+
+        acumulado = defaultdict(lambda: {
+            'total_pedidos': 0,
+            'total_vendas': Decimal('0.00'),
+            'total_descontos': Decimal('0.00'),
+            'total_frete': Decimal('0.00'),
+            'itens_vendidos': 0
+        })
+
+        total_lidos = 0
+        ultimo_id = 0
+        while True:
+            lote = list(
+                pedidos
+                .filter(id__gt=ultimo_id)
+                .order_by('id')
+                .values(
+                    'id', 'created_at', 'status', 'tipo_entrega',
+                    'total', 'valor_desconto', 'valor_frete'
+                )
+                .annotate(itens=Sum('itens__quantidade'))[:tamanho_lote]
+            )
+            if not lote:
+                break
+
+            for pedido in lote:
+                chave = (
+                    timezone.localdate(pedido['created_at']),
+                    pedido['status'],
+                    pedido['tipo_entrega']
+                )
+                linha = acumulado[chave]
+                linha['total_pedidos'] += 1
+                linha['total_vendas'] += pedido['total']
+                linha['total_descontos'] += pedido['valor_desconto']
+                linha['total_frete'] += pedido['valor_frete']
+                linha['itens_vendidos'] += pedido['itens'] or 0
+
+            total_lidos += len(lote)
+            ultimo_id = lote[-1]['id']
+
+        with transaction.atomic():
+            linhas_existentes.delete()
+            modelo_venda.objects.bulk_create([
+                modelo_venda(data=data, status=status, tipo_entrega=tipo_entrega, **valores)
+                for (data, status, tipo_entrega), valores in acumulado.items()
+            ], batch_size=tamanho_lote)
+
+        return {
+            'pedidos': total_lidos,
+            'linhas': len(acumulado)
+        }
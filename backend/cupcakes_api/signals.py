@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from cupcakes_api.models import Cupcake, Categoria
+from cupcakes_api.services.autocompletar_service import AutocompletarService
+from cupcakes_api.services.busca_service import BuscaService
+from cupcakes_api.services.catalogo_cache_service import CatalogoCacheService
+from cupcakes_api.services.imagem_service import ImagemService
+from cupcakes_api.services.snapshot_catalogo_service import SnapshotCatalogoService
+from cupcakes_api.services.sincronizacao_catalogo_service import SincronizacaoCatalogoService
+
+
+@receiver(post_save, sender=Cupcake)
+@receiver(post_delete, sender=Cupcake)
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def invalidar_cache_catalogo(sender, **kwargs):
+    """
+    Invalida o cache do catálogo quando um cupcake ou categoria muda
+
+    Cobre também as edições em massa do admin (list_editable), que salvam
+    cada objeto individualmente.
+    """
+    CatalogoCacheService.invalidar_apos_commit()
+
+
+@receiver(post_save, sender=Cupcake)
+@receiver(post_delete, sender=Cupcake)
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def invalidar_autocompletar(sender, update_fields=None, **kwargs):
+    """
+    Reconstrói a trie do autocompletar só quando nome/ativo/destaque mudam
+    """
+    AutocompletarService.invalidar_apos_commit(sender, update_fields)
+
+
+@receiver(post_save, sender=Cupcake)
+def indexar_cupcake(sender, instance, **kwargs):
+    """
+    Atualiza o índice de busca depois que a transação for confirmada
+    """
+    transaction.on_commit(lambda: BuscaService.indexar_cupcake(instance))
+
+
+@receiver(post_delete, sender=Cupcake)
+def remover_cupcake_do_indice(sender, instance, **kwargs):
+    """
+    Remove o cupcake do índice de busca depois da confirmação
+    """
+    cupcake_id = instance.id
+    transaction.on_commit(lambda: BuscaService.remover_cupcake(cupcake_id))
+
+
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def reindexar_categoria(sender, **kwargs):
+    """
+    O nome da categoria faz parte dos documentos: reconstrói o índice
+    """
+    transaction.on_commit(BuscaService.marcar_desatualizado)
+
+
+@receiver(post_save, sender=Cupcake)
+def gerar_variantes_imagem(sender, instance, **kwargs):
+    """
+    Agenda a geração das miniaturas quando a imagem enviada muda
+    """
+    ImagemService.agendar(instance)
+
+
+@receiver(post_delete, sender=Cupcake)
+def remover_variantes_imagem(sender, instance, **kwargs):
+    """
+    Apaga os arquivos de variantes do cupcake removido
+    """
+    variantes = instance.imagem_variantes
+    transaction.on_commit(lambda: ImagemService.remover_variantes(variantes))
+
+
+@receiver(post_save, sender=Cupcake)
+@receiver(post_delete, sender=Cupcake)
+def publicar_snapshot_cupcake(sender, instance, **kwargs):
+    """
+    Republica o snapshot estático com o cupcake alterado
+    """
+    if settings.CATALOGO_SNAPSHOT_AUTOMATICO:
+        SnapshotCatalogoService.agendar(cupcake_ids=[instance.id])
+
+
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def publicar_snapshot_categoria(sender, instance, **kwargs):
+    """
+    Republica o snapshot estático com a categoria alterada
+    """
+    if settings.CATALOGO_SNAPSHOT_AUTOMATICO:
+        SnapshotCatalogoService.agendar(categoria_ids=[instance.id])
+
+
+@receiver(post_delete, sender=Cupcake)
+def registrar_remocao_cupcake(sender, instance, **kwargs):
+    """
+    Registra a exclusão para a sincronização incremental
+    """
+    SincronizacaoCatalogoService.registrar_remocao('cupcake', instance.id, instance.categoria_id)
+
+
+@receiver(post_delete, sender=Categoria)
+def registrar_remocao_categoria(sender, instance, **kwargs):
+    """
+    Registra a exclusão para a sincronização incremental
+    """
+    SincronizacaoCatalogoService.registrar_remocao('categoria', instance.id)
@@ -0,0 +1,146 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from cupcakes_api.busca import TriePrefixos
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.services import AutocompletarService, CarrinhoService, PedidoService
+
+
+class TriePrefixosTestCase(TestCase):
+    """
+    Testes da trie de prefixos
+    """
+
+    def test_mantem_as_melhores_sugestoes_por_prefixo(self):
+        """
+        Testa que cada nó guarda só as k sugestões de menor prioridade
+        """
+        trie = TriePrefixos(limite=2)
+        trie.adicionar('bolo', 1, (3,), 'bolo')
+        trie.adicionar('bombom', 2, (1,), 'bombom')
+        trie.adicionar('boneca', 3, (2,), 'boneca')
+
+        self.assertEqual(trie.buscar('bo'), ['bombom', 'boneca'])
+        self.assertEqual(trie.buscar('bol'), ['bolo'])
+        self.assertEqual(trie.buscar('x'), [])
+
+    def test_chave_repetida_mantem_melhor_prioridade(self):
+        """
+        Testa que a mesma sugestão não aparece duas vezes no nó
+        """
+        trie = TriePrefixos()
+        trie.adicionar('canela', 1, (1,), 'maca com canela')
+        trie.adicionar('canela', 1, (0,), 'maca com canela')
+
+        self.assertEqual(trie.buscar('can'), ['maca com canela'])
+
+
+class AutocompletarTestCase(TestCase):
+    """
+    Testes do endpoint /api/cupcakes/autocomplete/
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        AutocompletarService._trie = None
+        self.client = APIClient()
+        self.categoria = Categoria.objects.create(nome='Frutas', slug='frutas')
+        self.maca = Cupcake.objects.create(
+            nome='Maçã com Canela',
+            slug='maca-com-canela',
+            descricao='Maçã caramelizada',
+            preco=Decimal('7.50'),
+            categoria=self.categoria,
+            estoque=5
+        )
+        self.morango = Cupcake.objects.create(
+            nome='Morango',
+            slug='morango',
+            descricao='Morango fresco',
+            preco=Decimal('8.00'),
+            categoria=self.categoria,
+            estoque=5
+        )
+
+    def sugerir(self, termo, **parametros):
+        resposta = self.client.get('/api/cupcakes/autocomplete/', {'q': termo, **parametros})
+        self.assertEqual(resposta.status_code, 200)
+        return resposta.json()
+
+    def test_prefixo_sem_acento(self):
+        """
+        Testa que 'MAC' encontra 'Maçã com Canela'
+        """
+        self.assertEqual(
+            self.sugerir('MAC'),
+            [{'tipo': 'cupcake', 'id': self.maca.id, 'nome': 'Maçã com Canela'}]
+        )
+
+    def test_prefixo_de_palavra_interna_e_categoria(self):
+        """
+        Testa sugestões por palavra interna do nome e por categoria
+        """
+        self.assertEqual(self.sugerir('can')[0]['id'], self.maca.id)
+        self.assertEqual(
+            self.sugerir('fru'),
+            [{'tipo': 'categoria', 'id': self.categoria.id, 'nome': 'Frutas'}]
+        )
+
+    def test_nao_acessa_banco_com_catalogo_inalterado(self):
+        """
+        Testa que, com a trie montada, a consulta não faz queries
+        """
+        self.sugerir('m')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(self.sugerir('m', limite=1)), 1)
+
+    def test_reconstroi_apos_alteracao_do_catalogo(self):
+        """
+        Testa que renomear e desativar cupcakes reflete nas sugestões
+        """
+        self.sugerir('mor')
+
+        self.morango.nome = 'Amora'
+        self.morango.save()
+        self.maca.ativo = False
+        self.maca.save()
+
+        self.assertEqual(self.sugerir('mor'), [])
+        self.assertEqual(self.sugerir('mac'), [])
+        self.assertEqual(self.sugerir('amo')[0]['nome'], 'Amora')
+
+    def test_pedido_nao_reconstroi_a_trie(self):
+        """
+        Testa que baixas de estoque (pedido e save só do estoque) mantêm a trie
+        """
+        usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        CarrinhoService.adicionar_item(usuario, self.morango.id, 2)
+        self.sugerir('m')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resultado = PedidoService.criar_pedido(usuario, {
+                'nome_cliente': 'Cliente',
+                'email_cliente': 'cliente@teste.com',
+                'telefone_cliente': '51999999999',
+                'tipo_entrega': 'retirada',
+                'metodo_pagamento': 'pix'
+            })
+            self.maca.estoque = 10
+            self.maca.save(update_fields=['estoque'])
+        self.assertTrue(resultado['sucesso'])
+
+        with self.assertNumQueries(0):
+            self.sugerir('m')
+
+    def test_limite_invalido(self):
+        """
+        Testa a validação do parâmetro limite
+        """
+        resposta = self.client.get('/api/cupcakes/autocomplete/', {'q': 'm', 'limite': 'x'})
+        self.assertEqual(resposta.status_code, 400)
@@ -0,0 +1,181 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from cupcakes_api.busca import IndiceInvertido, extrair_termos, normalizar
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.services import BuscaService
+
+
+class NormalizadorTestCase(TestCase):
+    """
+    Testes da normalização de termos da busca
+    """
+
+    def test_remove_acentos_e_caixa(self):
+        """
+        Testa que acentos e maiúsculas são ignorados
+        """
+        self.assertEqual(normalizar('Maçã CARAMELIZADA'), 'maca caramelizada')
+
+    def test_plural_e_diminutivo_tem_mesmo_radical(self):
+        """
+        Testa que variações de número e grau geram o mesmo termo
+        """
+        self.assertEqual(extrair_termos('morangos'), extrair_termos('moranguinho'))
+        self.assertEqual(extrair_termos('limões'), extrair_termos('limão'))
+
+    def test_remove_stopwords(self):
+        """
+        Testa que palavras vazias não viram termos
+        """
+        self.assertEqual(extrair_termos('bolo de cenoura'), extrair_termos('bolo cenoura'))
+
+
+class IndiceInvertidoTestCase(TestCase):
+    """
+    Testes do índice invertido com BM25
+    """
+
+    def test_termo_mais_frequente_ranqueia_primeiro(self):
+        """
+        Testa que o documento com mais ocorrências do termo vem antes
+        """
+        indice = IndiceInvertido()
+        indice.adicionar(1, ['choc', 'bolo'])
+        indice.adicionar(2, ['choc', 'choc', 'choc'])
+        indice.adicionar(3, ['baunilh'])
+
+        resultado = [doc_id for doc_id, _ in indice.buscar(['choc'])]
+
+        self.assertEqual(resultado, [2, 1])
+
+    def test_remover_e_readicionar_documento(self):
+        """
+        Testa que remover um documento tira seus termos do índice
+        """
+        indice = IndiceInvertido()
+        indice.adicionar(1, ['choc'])
+        indice.adicionar(1, ['baunilh'])
+
+        self.assertEqual(indice.buscar(['choc']), [])
+        self.assertEqual([doc_id for doc_id, _ in indice.buscar(['baunilh'])], [1])
+
+        indice.remover(1)
+        self.assertEqual(indice.buscar(['baunilh']), [])
+
+
+class BuscaCupcakesTestCase(TestCase):
+    """
+    Testes da busca de cupcakes pela API (?search=)
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        BuscaService._indice = None
+        BuscaService._versao = None
+        self.client = APIClient()
+        self.frutas = Categoria.objects.create(nome='Frutas', slug='frutas')
+        self.chocolate = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        self.morango = Cupcake.objects.create(
+            nome='Morango Silvestre',
+            slug='morango-silvestre',
+            descricao='Massa de baunilha com cobertura de frutas vermelhas',
+            preco=Decimal('9.00'),
+            categoria=self.frutas,
+            estoque=5
+        )
+        self.brigadeiro = Cupcake.objects.create(
+            nome='Brigadeiro',
+            slug='brigadeiro',
+            descricao='Chocolate com morangos picados',
+            preco=Decimal('8.50'),
+            categoria=self.chocolate,
+            estoque=5
+        )
+        self.maca = Cupcake.objects.create(
+            nome='Maçã com Canela',
+            slug='maca-com-canela',
+            descricao='Pedaços de maçã caramelizada',
+            preco=Decimal('7.50'),
+            categoria=self.frutas,
+            estoque=5
+        )
+
+    def buscar(self, termo, **parametros):
+        resposta = self.client.get('/api/cupcakes/', {'search': termo, **parametros})
+        self.assertEqual(resposta.status_code, 200)
+        return [cupcake['nome'] for cupcake in resposta.json()['results']]
+
+    def test_busca_sem_acentos(self):
+        """
+        Testa que 'maca' encontra 'Maçã com Canela'
+        """
+        self.assertEqual(self.buscar('maca'), ['Maçã com Canela'])
+
+    def test_nome_ranqueia_acima_da_descricao(self):
+        """
+        Testa que o termo no nome pesa mais do que na descrição
+        """
+        self.assertEqual(self.buscar('moranguinhos'), ['Morango Silvestre', 'Brigadeiro'])
+
+    def test_busca_por_nome_da_categoria(self):
+        """
+        Testa que o nome da categoria faz parte do documento
+        """
+        self.assertEqual(set(self.buscar('fruta')), {'Morango Silvestre', 'Maçã com Canela'})
+
+    def test_ordering_explicito_tem_prioridade(self):
+        """
+        Testa que ?ordering= substitui a ordenação por relevância
+        """
+        self.assertEqual(
+            self.buscar('morango', ordering='preco'),
+            ['Brigadeiro', 'Morango Silvestre']
+        )
+
+    def test_sem_resultados(self):
+        """
+        Testa que termos inexistentes retornam lista vazia
+        """
+        self.assertEqual(self.buscar('pistache'), [])
+
+    def test_indice_atualizado_incrementalmente(self):
+        """
+        Testa que salvar e remover cupcakes atualiza o índice sem reconstruí-lo
+        """
+        indice = BuscaService.obter_indice()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            pistache = Cupcake.objects.create(
+                nome='Pistache',
+                slug='pistache',
+                descricao='Creme de pistache',
+                preco=Decimal('10.00'),
+                categoria=self.chocolate,
+                estoque=5
+            )
+
+        self.assertIs(BuscaService.obter_indice(), indice)
+        self.assertEqual(BuscaService.buscar('pistaches'), [pistache.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            pistache.delete()
+
+        self.assertIs(BuscaService.obter_indice(), indice)
+        self.assertEqual(BuscaService.buscar('pistache'), [])
+
+    def test_renomear_categoria_reconstroi_indice(self):
+        """
+        Testa que renomear a categoria reflete na busca
+        """
+        BuscaService.obter_indice()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.chocolate.nome = 'Cacau'
+            self.chocolate.save()
+
+        self.assertEqual(BuscaService.buscar('cacau'), [self.brigadeiro.id])
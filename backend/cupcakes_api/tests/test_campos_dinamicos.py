@@ -0,0 +1,144 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.serializers.mixins import arvore_campos
+from cupcakes_api.services import CarrinhoService, PedidoService
+
+
+class CamposDinamicosTestCase(TestCase):
+    """
+    Testes dos campos esparsos (?fields= / ?omit=)
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.categoria = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        self.cupcake = Cupcake.objects.create(
+            nome='Brigadeiro',
+            slug='brigadeiro',
+            descricao='Cupcake de brigadeiro',
+            preco=Decimal('8.50'),
+            categoria=self.categoria,
+            imagem_url='https://cdn.exemplo.com/brigadeiro.jpg',
+            estoque=10
+        )
+        Cupcake.objects.create(
+            nome='Beijinho',
+            slug='beijinho',
+            descricao='Cupcake de coco',
+            preco=Decimal('7.50'),
+            categoria=self.categoria,
+            estoque=0
+        )
+
+        self.usuario = User.objects.create_user(username='cliente', password='senha123')
+        CarrinhoService.adicionar_item(self.usuario, self.cupcake.id, 2)
+        PedidoService.criar_pedido(self.usuario, {
+            'nome_cliente': 'Cliente',
+            'email_cliente': 'cliente@teste.com',
+            'telefone_cliente': '51999999999',
+            'tipo_entrega': 'retirada',
+            'metodo_pagamento': 'pix'
+        })
+
+    def test_arvore_campos(self):
+        """
+        Testa a leitura da notação com ponto
+        """
+        self.assertEqual(
+            arvore_campos('id, status,itens.quantidade,,itens.subtotal'),
+            {'id': {}, 'status': {}, 'itens': {'quantidade': {}, 'subtotal': {}}}
+        )
+        self.assertEqual(arvore_campos(None), {})
+
+    def test_listagem_de_cupcakes_com_fields(self):
+        """
+        Testa que o caminho rápido devolve só os campos pedidos, com os
+        mesmos valores da resposta completa
+        """
+        completos = self.client.get('/api/cupcakes/').json()['results']
+        esparsos = self.client.get('/api/cupcakes/?fields=id,preco,disponivel,imagem').json()['results']
+
+        self.assertEqual(
+            esparsos,
+            [
+                {campo: cupcake[campo] for campo in ('id', 'preco', 'imagem', 'disponivel')}
+                for cupcake in completos
+            ]
+        )
+
+    def test_listagem_de_cupcakes_com_omit(self):
+        """
+        Testa a remoção de campos e a projeção sem as colunas omitidas
+        """
+        with CaptureQueriesContext(connection) as consultas:
+            dados = self.client.get('/api/cupcakes/?omit=descricao,imagem_srcset').json()
+
+        self.assertNotIn('descricao', dados['results'][0])
+        self.assertNotIn('imagem_srcset', dados['results'][0])
+        self.assertIn('nome', dados['results'][0])
+        self.assertFalse(any('"descricao"' in consulta['sql'] for consulta in consultas))
+
+    def test_detalhe_carrega_so_as_colunas_usadas(self):
+        """
+        Testa o .only() no detalhe do cupcake
+        """
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.get(f'/api/cupcakes/{self.cupcake.id}/?fields=id,preco,disponivel')
+
+        self.assertEqual(resposta.json(), {'id': self.cupcake.id, 'preco': '8.50', 'disponivel': True})
+        select = [consulta['sql'] for consulta in consultas if '"cupcakes"."disponivel"' in consulta['sql']]
+        self.assertTrue(select)
+        self.assertTrue(all('"descricao"' not in sql for sql in select))
+
+    def test_pedidos_sem_itens_nao_fazem_prefetch(self):
+        """
+        Testa que o prefetch dos itens só acontece quando eles são pedidos
+        """
+        self.client.force_authenticate(user=self.usuario)
+        self.client.get('/api/pedidos/')
+
+        with self.assertNumQueries(2):
+            dados = self.client.get('/api/pedidos/?fields=id,status,status_display').json()
+        self.assertEqual(list(dados['results'][0]), ['id', 'status', 'status_display'])
+
+        dados = self.client.get('/api/pedidos/?fields=id,itens.quantidade,itens.cupcake_nome').json()
+        self.assertEqual(
+            dados['results'][0]['itens'],
+            [{'cupcake_nome': 'Brigadeiro', 'quantidade': 2}]
+        )
+
+    def test_meus_pedidos_restringe_consulta(self):
+        """
+        Testa que meus_pedidos também leva a seleção de campos ao queryset
+        """
+        self.client.force_authenticate(user=self.usuario)
+
+        with CaptureQueriesContext(connection) as consultas:
+            dados = self.client.get('/api/pedidos/meus_pedidos/?fields=id,status').json()
+
+        self.assertEqual(dados[0], {'id': dados[0]['id'], 'status': 'recebido'})
+        self.assertEqual(len(consultas), 1)
+        self.assertNotIn('"nome_cliente"', consultas[0]['sql'])
+
+    def test_categorias_sem_totais_nao_agrupam(self):
+        """
+        Testa que os totais só são agregados quando solicitados
+        """
+        with CaptureQueriesContext(connection) as consultas:
+            dados = self.client.get('/api/categorias/?fields=id,nome').json()
+
+        self.assertEqual(dados['results'], [{'id': self.categoria.id, 'nome': 'Chocolate'}])
+        self.assertFalse(any('GROUP BY' in consulta['sql'] for consulta in consultas))
+
+        dados = self.client.get('/api/categorias/?fields=nome,total_cupcakes').json()
+        self.assertEqual(dados['results'], [{'nome': 'Chocolate', 'total_cupcakes': 2}])
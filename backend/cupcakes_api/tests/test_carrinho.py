@@ -0,0 +1,588 @@
+import threading
+from decimal import Decimal
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import IntegrityError, OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from cupcakes_api.models import Carrinho, Categoria, Cupcake, ItemCarrinho, Pedido
+from cupcakes_api.services import ArmazenamentoCarrinhoMemoria, CarrinhoService, PedidoService
+from cupcakes_api.services.carrinho_armazenamento import ArmazenamentoCarrinhoORM
+
+
+@override_settings(CARRINHO_ARMAZENAMENTO='orm')
+class CarrinhoLeituraTestCase(TestCase):
+    """
+    Testes da leitura do carrinho (totais agregados e custo fixo)
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        self.categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        self.cupcakes = [
+            Cupcake.objects.create(
+                nome=f'Cupcake {indice}',
+                slug=f'cupcake-{indice}',
+                descricao='Cupcake de teste',
+                preco=Decimal('8.50') + indice,
+                categoria=self.categoria,
+                estoque=20
+            )
+            for indice in range(6)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.usuario)
+
+    def test_totais_sem_anotacao(self):
+        """
+        Testa que um carrinho comum calcula os totais em uma única consulta
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[2].id, 3)
+        carrinho = Carrinho.objects.get(usuario=self.usuario)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(carrinho.total_itens, 3)
+            self.assertEqual(carrinho.subtotal, Decimal('31.50'))
+
+    def test_carrinho_vazio(self):
+        """
+        Testa os totais de um carrinho ainda não criado
+        """
+        resposta = self.client.get('/api/carrinho/totais/')
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json()['total_itens'], 0)
+        self.assertEqual(Decimal(resposta.json()['subtotal']), Decimal('0.00'))
+
+    def test_consultas_fixas_no_retrieve(self):
+        """
+        Testa que o número de consultas não cresce com o número de itens
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 1)
+        with self.assertNumQueries(2):
+            resposta = self.client.get('/api/carrinho/')
+        self.assertEqual(resposta.json()['total_itens'], 1)
+
+        for cupcake in self.cupcakes[1:]:
+            CarrinhoService.adicionar_item(self.usuario, cupcake.id, 2)
+        with self.assertNumQueries(2):
+            resposta = self.client.get('/api/carrinho/')
+
+        dados = resposta.json()
+        self.assertEqual(len(dados['itens']), 6)
+        self.assertEqual(dados['total_itens'], 11)
+        self.assertEqual(Decimal(dados['subtotal']), sum(
+            Decimal(item['subtotal']) for item in dados['itens']
+        ))
+
+    def test_totais_em_uma_consulta(self):
+        """
+        Testa o endpoint de totais sem carregar os itens
+        """
+        for cupcake in self.cupcakes:
+            CarrinhoService.adicionar_item(self.usuario, cupcake.id, 1)
+
+        with self.assertNumQueries(1):
+            resposta = self.client.get('/api/carrinho/totais/')
+        self.assertEqual(resposta.json()['total_itens'], 6)
+
+
+@override_settings(CARRINHO_ARMAZENAMENTO='orm')
+class CarrinhoServiceTestCase(TestCase):
+    """
+    Testes do CarrinhoService independentes do armazenamento
+
+    Leem o carrinho por CarrinhoService.armazenamento().linhas e rodam
+    também com o armazenamento em memória (CarrinhoServiceMemoriaTestCase).
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        CarrinhoService._armazenamentos.clear()
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        self.cupcakes = [
+            Cupcake.objects.create(
+                nome=f'Cupcake {indice}',
+                slug=f'cupcake-{indice}',
+                descricao='Cupcake de teste',
+                preco=Decimal('8.50') + indice,
+                categoria=categoria,
+                estoque=5
+            )
+            for indice in range(4)
+        ]
+
+    def linhas(self):
+        return CarrinhoService.armazenamento().linhas(self.usuario)
+
+    def item_id(self, cupcake):
+        carrinho = CarrinhoService.carregar_carrinho(self.usuario)
+        return next(item.id for item in carrinho.itens.all() if item.cupcake_id == cupcake.id)
+
+    def test_totais_agregados(self):
+        """
+        Testa total de itens e subtotal do carrinho carregado, sem novas consultas
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 2)
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[1].id, 1)
+
+        carrinho = CarrinhoService.carregar_carrinho(self.usuario)
+        with self.assertNumQueries(0):
+            self.assertEqual(carrinho.total_itens, 3)
+            self.assertEqual(carrinho.subtotal, Decimal('26.50'))
+            self.assertEqual(sum(item.subtotal for item in carrinho.itens.all()), Decimal('26.50'))
+
+    def test_recusa_acima_do_estoque(self):
+        """
+        Testa que a soma não passa do estoque
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 4)
+        resultado = CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 2)
+
+        self.assertFalse(resultado['sucesso'])
+        self.assertIn('Estoque insuficiente', resultado['mensagem'])
+        self.assertEqual(self.linhas(), {self.cupcakes[0].id: 4})
+
+    def test_recusa_indisponivel_e_inexistente(self):
+        """
+        Testa as mensagens de cupcake indisponível e inexistente
+        """
+        self.cupcakes[0].ativo = False
+        self.cupcakes[0].save()
+
+        resultado = CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 1)
+        self.assertEqual(resultado['mensagem'], 'Cupcake não disponível')
+
+        resultado = CarrinhoService.adicionar_item(self.usuario, 9999, 1)
+        self.assertEqual(resultado['mensagem'], 'Cupcake não encontrado')
+        self.assertEqual(self.linhas(), {})
+
+    def test_atualizar_quantidade(self):
+        """
+        Testa a atualização com estoque e a recusa de cupcake desativado
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 1)
+        item_id = self.item_id(self.cupcakes[0])
+
+        self.assertTrue(CarrinhoService.atualizar_quantidade(self.usuario, item_id, 4)['sucesso'])
+        resultado = CarrinhoService.atualizar_quantidade(self.usuario, item_id, 6)
+        self.assertIn('Estoque insuficiente', resultado['mensagem'])
+
+        self.cupcakes[0].ativo = False
+        self.cupcakes[0].save()
+        resultado = CarrinhoService.atualizar_quantidade(self.usuario, item_id, 2)
+
+        self.assertFalse(resultado['sucesso'])
+        self.assertIn('não está disponível', resultado['mensagem'])
+        self.assertEqual(self.linhas(), {self.cupcakes[0].id: 4})
+
+    def test_remover_e_limpar(self):
+        """
+        Testa a remoção de um item e a limpeza do carrinho
+        """
+        for cupcake in self.cupcakes[:3]:
+            CarrinhoService.adicionar_item(self.usuario, cupcake.id, 1)
+
+        self.assertTrue(CarrinhoService.remover_item(self.usuario, self.item_id(self.cupcakes[1]))['sucesso'])
+        self.assertFalse(CarrinhoService.remover_item(self.usuario, 9999)['sucesso'])
+        self.assertEqual(self.linhas(), {self.cupcakes[0].id: 1, self.cupcakes[2].id: 1})
+
+        CarrinhoService.limpar_carrinho(self.usuario)
+        self.assertEqual(self.linhas(), {})
+
+    def test_sincronizar_operacoes_em_ordem(self):
+        """
+        Testa add, set e remove sobre o carrinho existente
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 1)
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[1].id, 1)
+
+        resultado = CarrinhoService.sincronizar(self.usuario, [
+            {'op': 'add', 'cupcake_id': self.cupcakes[0].id, 'quantidade': 2},
+            {'op': 'remove', 'cupcake_id': self.cupcakes[1].id, 'quantidade': 1},
+            {'op': 'set', 'cupcake_id': self.cupcakes[2].id, 'quantidade': 4},
+            {'op': 'add', 'cupcake_id': self.cupcakes[2].id, 'quantidade': 1},
+        ])
+
+        self.assertTrue(resultado['sucesso'])
+        self.assertEqual(self.linhas(), {self.cupcakes[0].id: 3, self.cupcakes[2].id: 5})
+
+    def test_sincronizar_substituir(self):
+        """
+        Testa que substituir remove os cupcakes fora da lista
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 1)
+
+        CarrinhoService.sincronizar(
+            self.usuario,
+            [{'op': 'set', 'cupcake_id': self.cupcakes[3].id, 'quantidade': 1}],
+            substituir=True
+        )
+
+        self.assertEqual(self.linhas(), {self.cupcakes[3].id: 1})
+
+    def test_sincronizar_linha_invalida(self):
+        """
+        Testa que uma linha inválida recusa o lote inteiro
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 1)
+
+        resultado = CarrinhoService.sincronizar(self.usuario, [
+            {'op': 'set', 'cupcake_id': self.cupcakes[1].id, 'quantidade': 2},
+            {'op': 'set', 'cupcake_id': self.cupcakes[2].id, 'quantidade': 6},
+        ])
+
+        self.assertFalse(resultado['sucesso'])
+        self.assertEqual(self.linhas(), {self.cupcakes[0].id: 1})
+
+
+@override_settings(CARRINHO_ARMAZENAMENTO='memoria', CARRINHO_PERSISTENCIA_SEGUNDOS=0)
+class CarrinhoServiceMemoriaTestCase(CarrinhoServiceTestCase):
+    """
+    Os mesmos testes do CarrinhoService com o armazenamento em memória
+    """
+
+
+@override_settings(CARRINHO_ARMAZENAMENTO='orm')
+class AdicionarItemTestCase(TestCase):
+    """
+    Testes do upsert de itens no carrinho
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        self.cupcake = Cupcake.objects.create(
+            nome='Chocolate',
+            slug='chocolate',
+            descricao='Cupcake de chocolate',
+            preco=Decimal('8.50'),
+            categoria=categoria,
+            estoque=5
+        )
+        CarrinhoService.obter_ou_criar_carrinho(self.usuario)
+
+    def test_insere_e_soma(self):
+        """
+        Testa que adicionar de novo soma à quantidade, em um único comando
+        """
+        with CaptureQueriesContext(connection) as consultas:
+            resultado = CarrinhoService.adicionar_item(self.usuario, self.cupcake.id, 2)
+        comandos = [
+            consulta['sql'] for consulta in consultas if 'SAVEPOINT' not in consulta['sql']
+        ]
+        # Busca do carrinho + upsert do item
+        self.assertEqual(len(comandos), 2)
+        self.assertIn('ON CONFLICT', comandos[1])
+        self.assertTrue(resultado['sucesso'])
+        self.assertEqual(resultado['mensagem'], 'Chocolate adicionado ao carrinho')
+
+        resultado = CarrinhoService.adicionar_item(self.usuario, self.cupcake.id, 3)
+        self.assertEqual(resultado['quantidade'], 5)
+        self.assertEqual(self.usuario.carrinho.itens.get().quantidade, 5)
+
+@override_settings(CARRINHO_ARMAZENAMENTO='orm')
+class AdicionarItemConcorrenteTestCase(TransactionTestCase):
+    """
+    Testa adições simultâneas do mesmo cupcake (ex: clique duplo)
+    """
+
+    def test_adicoes_paralelas_respeitam_o_estoque(self):
+        """
+        Testa que adições paralelas não perdem incrementos nem passam do estoque
+        """
+        usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        cupcake = Cupcake.objects.create(
+            nome='Chocolate',
+            slug='chocolate',
+            descricao='Cupcake de chocolate',
+            preco=Decimal('8.50'),
+            categoria=categoria,
+            estoque=6
+        )
+        # O carrinho já existe: a disputa é só pela linha do item
+        Carrinho.objects.create(usuario=usuario)
+
+        barreira = threading.Barrier(10)
+        adicionados = []
+
+        def adicionar():
+            try:
+                barreira.wait()
+                try:
+                    resultado = CarrinhoService.adicionar_item(usuario, cupcake.id, 1)
+                except OperationalError:
+                    # SQLite pode recusar a escrita concorrente (tabela travada)
+                    return
+                if resultado['sucesso']:
+                    adicionados.append(1)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=adicionar) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        itens = list(Carrinho.objects.get(usuario=usuario).itens.all())
+        self.assertEqual(len(itens), 1)
+        self.assertEqual(itens[0].quantidade, len(adicionados))
+        self.assertLessEqual(itens[0].quantidade, cupcake.estoque)
+
+
+@override_settings(CARRINHO_ARMAZENAMENTO='orm')
+class SincronizarCarrinhoTestCase(TestCase):
+    """
+    Testes da sincronização do carrinho em lote
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        self.cupcakes = [
+            Cupcake.objects.create(
+                nome=f'Cupcake {indice}',
+                slug=f'cupcake-{indice}',
+                descricao='Cupcake de teste',
+                preco=Decimal('5.00'),
+                categoria=categoria,
+                estoque=10
+            )
+            for indice in range(15)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.usuario)
+
+    def sincronizar(self, operacoes, substituir=False):
+        return self.client.post(
+            '/api/carrinho/sincronizar/',
+            {'operacoes': operacoes, 'substituir': substituir},
+            format='json'
+        )
+
+    def test_sincroniza_carrinho_inteiro(self):
+        """
+        Testa um carrinho de 15 linhas em uma requisição com consultas fixas
+        """
+        CarrinhoService.obter_ou_criar_carrinho(self.usuario)
+        operacoes = [
+            {'op': 'set', 'cupcake_id': cupcake.id, 'quantidade': 2}
+            for cupcake in self.cupcakes
+        ]
+        with CaptureQueriesContext(connection) as uma_linha:
+            self.sincronizar(operacoes[:1])
+        with CaptureQueriesContext(connection) as quinze_linhas:
+            resposta = self.sincronizar(operacoes)
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(len(resposta.json()['carrinho']['itens']), 15)
+        self.assertEqual(resposta.json()['carrinho']['total_itens'], 30)
+        self.assertEqual(len(quinze_linhas), len(uma_linha))
+
+    def test_linha_invalida_nao_grava_nada(self):
+        """
+        Testa que estoque insuficiente em uma linha recusa o lote inteiro
+        """
+        resposta = self.sincronizar([
+            {'op': 'set', 'cupcake_id': self.cupcakes[0].id, 'quantidade': 2},
+            {'op': 'set', 'cupcake_id': self.cupcakes[1].id, 'quantidade': 11},
+            {'op': 'add', 'cupcake_id': 9999, 'quantidade': 1},
+        ])
+
+        self.assertEqual(resposta.status_code, 400)
+        self.assertEqual(
+            {erro['cupcake_id'] for erro in resposta.json()['erros']},
+            {self.cupcakes[1].id, 9999}
+        )
+        self.assertFalse(ItemCarrinho.objects.exists())
+
+
+@override_settings(CARRINHO_ARMAZENAMENTO='memoria', CARRINHO_PERSISTENCIA_SEGUNDOS=0)
+class ArmazenamentoMemoriaTestCase(TestCase):
+    """
+    Testes do carrinho em memória com escrita adiada
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        CarrinhoService._armazenamentos.pop('memoria', None)
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        self.outro = User.objects.create_user('outro', 'outro@teste.com', 'senha123')
+        categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        self.cupcakes = [
+            Cupcake.objects.create(
+                nome=f'Cupcake {indice}',
+                slug=f'cupcake-{indice}',
+                descricao='Cupcake de teste',
+                preco=Decimal('5.00'),
+                categoria=categoria,
+                estoque=10
+            )
+            for indice in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.usuario)
+
+    def test_alteracoes_nao_gravam_itens(self):
+        """
+        Testa que adicionar, sincronizar e remover não escrevem itens no banco
+        """
+        self.client.post(
+            '/api/carrinho/adicionar_item/',
+            {'cupcake_id': self.cupcakes[0].id, 'quantidade': 2},
+            format='json'
+        )
+        self.client.post('/api/carrinho/sincronizar/', {'operacoes': [
+            {'op': 'set', 'cupcake_id': self.cupcakes[1].id, 'quantidade': 3},
+            {'op': 'set', 'cupcake_id': self.cupcakes[2].id, 'quantidade': 1},
+        ]}, format='json')
+        # Com o armazenamento em memória o id do item é o do cupcake
+        self.client.delete(f'/api/carrinho/remover-item/{self.cupcakes[2].id}/')
+
+        resposta = self.client.get('/api/carrinho/')
+        dados = resposta.json()
+        self.assertEqual(
+            {item['cupcake']: item['quantidade'] for item in dados['itens']},
+            {self.cupcakes[0].id: 2, self.cupcakes[1].id: 3}
+        )
+        self.assertEqual(dados['total_itens'], 5)
+        self.assertEqual(Decimal(dados['subtotal']), Decimal('25.00'))
+        self.assertFalse(ItemCarrinho.objects.exists())
+
+    def test_estoque_respeitado(self):
+        """
+        Testa que a soma em memória também é limitada ao estoque
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 8)
+        resultado = CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 3)
+
+        self.assertFalse(resultado['sucesso'])
+        self.assertIn('no carrinho: 8', resultado['mensagem'])
+
+    def test_checkout_persiste_e_esquece(self):
+        """
+        Testa que o checkout grava o carrinho antes de criar o pedido
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcakes[0].id, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resultado = PedidoService.criar_pedido(self.usuario, {
+                'nome_cliente': 'Cliente',
+                'email_cliente': 'cliente@teste.com',
+                'telefone_cliente': '51999999999',
+                'tipo_entrega': 'retirada',
+                'metodo_pagamento': 'pix'
+            })
+
+        self.assertTrue(resultado['sucesso'])
+        self.assertEqual(Pedido.objects.get().itens.get().quantidade, 2)
+        self.assertEqual(CarrinhoService.armazenamento().linhas(self.usuario), {})
+
+    def test_lru_persiste_ao_remover(self):
+        """
+        Testa que o carrinho alterado é gravado depois do commit quando sai do LRU
+        """
+        armazenamento = ArmazenamentoCarrinhoMemoria(maximo=1, intervalo=0)
+        armazenamento.adicionar(self.usuario, self.cupcakes[0].id, 2)
+        self.assertFalse(ItemCarrinho.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            armazenamento.linhas(self.outro)
+            # Nada é gravado na transação de quem causou a expulsão
+            self.assertFalse(ItemCarrinho.objects.exists())
+
+        item = ItemCarrinho.objects.get()
+        self.assertEqual((item.carrinho.usuario, item.quantidade), (self.usuario, 2))
+        # De volta ao LRU, o carrinho é lido do banco
+        self.assertEqual(armazenamento.linhas(self.usuario), {self.cupcakes[0].id: 2})
+
+    def test_lru_mantem_carrinho_se_gravacao_falhar(self):
+        """
+        Testa que o carrinho expulso continua em memória se a gravação falhar
+        """
+        armazenamento = ArmazenamentoCarrinhoMemoria(maximo=1, intervalo=0)
+        armazenamento.adicionar(self.usuario, self.cupcakes[0].id, 2)
+
+        with mock.patch.object(ArmazenamentoCarrinhoORM, 'substituir', side_effect=IntegrityError):
+            with self.assertLogs('cupcakes_api.services.carrinho_armazenamento', 'ERROR'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    armazenamento.linhas(self.outro)
+
+        self.assertFalse(ItemCarrinho.objects.exists())
+        self.assertEqual(armazenamento.linhas(self.usuario), {self.cupcakes[0].id: 2})
+
+    def test_persistir_pendentes(self):
+        """
+        Testa a gravação de todos os pendentes, fora das requisições
+        """
+        armazenamento = ArmazenamentoCarrinhoMemoria(maximo=10, intervalo=0)
+        armazenamento.gravar(self.usuario, {self.cupcakes[1].id: 4})
+        # As alterações não disparam gravações no caminho da requisição
+        self.assertFalse(ItemCarrinho.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            armazenamento.persistir_pendentes()
+
+        self.assertEqual(ItemCarrinho.objects.get().quantidade, 4)
+        with self.assertNumQueries(0):
+            armazenamento.persistir_pendentes()
+
+    def test_cupcake_excluido_nao_impede_gravacao(self):
+        """
+        Testa que um cupcake excluído é descartado e não afeta outros carrinhos
+        """
+        armazenamento = ArmazenamentoCarrinhoMemoria(maximo=10, intervalo=0)
+        armazenamento.adicionar(self.usuario, self.cupcakes[0].id, 1)
+        armazenamento.adicionar(self.usuario, self.cupcakes[1].id, 2)
+        armazenamento.adicionar(self.outro, self.cupcakes[2].id, 3)
+        self.cupcakes[1].delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            armazenamento.persistir_pendentes()
+
+        self.assertEqual(
+            dict(ItemCarrinho.objects.values_list('cupcake_id', 'quantidade')),
+            {self.cupcakes[0].id: 1, self.cupcakes[2].id: 3}
+        )
+
+    def test_falha_de_um_carrinho_nao_afeta_os_outros(self):
+        """
+        Testa que a falha ao gravar um carrinho fica no log e os demais são gravados
+        """
+        armazenamento = ArmazenamentoCarrinhoMemoria(maximo=10, intervalo=0)
+        armazenamento.adicionar(self.usuario, self.cupcakes[0].id, 1)
+        armazenamento.adicionar(self.outro, self.cupcakes[1].id, 2)
+        substituir = ArmazenamentoCarrinhoORM.substituir
+
+        def falhar_para_usuario(usuario_id, quantidades):
+            if usuario_id == self.usuario.pk:
+                raise IntegrityError('FOREIGN KEY constraint failed')
+            substituir(usuario_id, quantidades)
+
+        with mock.patch.object(ArmazenamentoCarrinhoORM, 'substituir', side_effect=falhar_para_usuario):
+            with self.assertLogs('cupcakes_api.services.carrinho_armazenamento', 'ERROR'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    armazenamento.persistir_pendentes()
+
+        self.assertEqual(ItemCarrinho.objects.get().carrinho.usuario, self.outro)
+        # O carrinho que falhou continua pendente para a próxima tentativa
+        with self.captureOnCommitCallbacks(execute=True):
+            armazenamento.persistir_pendentes()
+        self.assertEqual(ItemCarrinho.objects.count(), 2)
@@ -0,0 +1,125 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake, ItemCarrinho
+from cupcakes_api.services import CarrinhoAnonimoService, CarrinhoService
+
+
+class CarrinhoAnonimoTestCase(TestCase):
+    """
+    Testes do carrinho de visitantes em cookie assinado
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        self.chocolate = Cupcake.objects.create(
+            nome='Chocolate',
+            slug='chocolate',
+            descricao='Cupcake de chocolate',
+            preco=Decimal('8.50'),
+            categoria=categoria,
+            estoque=5
+        )
+        self.baunilha = Cupcake.objects.create(
+            nome='Baunilha',
+            slug='baunilha',
+            descricao='Cupcake de baunilha',
+            preco=Decimal('7.00'),
+            categoria=categoria,
+            estoque=3
+        )
+        self.client = APIClient()
+
+    def adicionar(self, cupcake, quantidade):
+        return self.client.post(
+            '/api/carrinho-anonimo/adicionar_item/',
+            {'cupcake_id': cupcake.id, 'quantidade': quantidade},
+            format='json'
+        )
+
+    def test_carrinho_no_cookie_sem_banco(self):
+        """
+        Testa que, com o mapa em cache, o carrinho anônimo não consulta o banco
+        """
+        self.client.get('/api/carrinho-anonimo/')
+
+        with self.assertNumQueries(0):
+            self.adicionar(self.chocolate, 2)
+            resposta = self.adicionar(self.baunilha, 1)
+            self.client.get('/api/carrinho-anonimo/')
+
+        self.assertEqual(resposta.status_code, 201)
+        carrinho = resposta.json()['carrinho']
+        self.assertEqual(carrinho['total_itens'], 3)
+        self.assertEqual(carrinho['subtotal'], '24.00')
+        self.assertIn(CarrinhoAnonimoService.COOKIE, resposta.cookies)
+        self.assertTrue(resposta.cookies[CarrinhoAnonimoService.COOKIE]['httponly'])
+
+    def test_estoque_validado(self):
+        """
+        Testa a recusa acima do estoque e o ajuste quando o estoque cai
+        """
+        resposta = self.adicionar(self.baunilha, 4)
+        self.assertEqual(resposta.status_code, 400)
+
+        self.adicionar(self.chocolate, 4)
+        self.chocolate.estoque = 2
+        self.chocolate.save()
+
+        carrinho = self.client.get('/api/carrinho-anonimo/').json()['carrinho']
+        self.assertEqual(carrinho['itens'][0]['quantidade'], 2)
+        self.assertEqual(len(carrinho['avisos']), 1)
+
+    @override_settings(CARRINHO_ANONIMO_MAPA_SEGUNDOS=0)
+    def test_baixa_de_estoque_expira_o_mapa(self):
+        """
+        Testa que o checkout de outro cliente, que não muda a versão do
+        catálogo, aparece quando o mapa expira
+        """
+        self.adicionar(self.chocolate, 4)
+        self.chocolate.reduzir_estoque(3)
+
+        carrinho = self.client.get('/api/carrinho-anonimo/').json()['carrinho']
+
+        self.assertEqual(carrinho['itens'][0]['quantidade'], 2)
+        self.assertEqual(len(carrinho['avisos']), 1)
+
+    def test_cookie_adulterado_e_ignorado(self):
+        """
+        Testa que um cookie com assinatura inválida vira carrinho vazio
+        """
+        self.adicionar(self.chocolate, 1)
+        valor = self.client.cookies[CarrinhoAnonimoService.COOKIE].value
+        self.client.cookies[CarrinhoAnonimoService.COOKIE] = valor[:-2] + 'xx'
+
+        carrinho = self.client.get('/api/carrinho-anonimo/').json()['carrinho']
+        self.assertEqual(carrinho['itens'], [])
+
+    def test_login_mescla_carrinho(self):
+        """
+        Testa que o login junta o cookie ao carrinho do usuário e o remove
+        """
+        usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        CarrinhoService.adicionar_item(usuario, self.chocolate.id, 4)
+        self.adicionar(self.chocolate, 3)
+        self.adicionar(self.baunilha, 2)
+
+        resposta = self.client.post(
+            '/api/auth/login/',
+            {'username': 'cliente', 'password': 'senha123'},
+            format='json'
+        )
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.cookies[CarrinhoAnonimoService.COOKIE].value, '')
+        itens = dict(
+            ItemCarrinho.objects.filter(carrinho__usuario=usuario).values_list('cupcake_id', 'quantidade')
+        )
+        # 4 + 3 limitado ao estoque (5)
+        self.assertEqual(itens, {self.chocolate.id: 5, self.baunilha.id: 2})
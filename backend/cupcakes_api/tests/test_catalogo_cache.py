@@ -0,0 +1,129 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from cupcakes_api.checks import verificar_cache_compartilhado
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.services import CatalogoCacheService
+
+
+class CatalogoCacheTestCase(TestCase):
+    """
+    Testes do cache versionado do catálogo
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.categoria = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        self.cupcake = Cupcake.objects.create(
+            nome='Brigadeiro',
+            slug='brigadeiro',
+            descricao='Cupcake de brigadeiro',
+            preco=Decimal('8.50'),
+            categoria=self.categoria,
+            destaque=True,
+            estoque=10
+        )
+
+    def test_listagem_servida_do_cache(self):
+        """
+        Testa que a segunda listagem não acessa o banco
+        """
+        primeira = self.client.get('/api/cupcakes/')
+
+        with self.assertNumQueries(0):
+            segunda = self.client.get('/api/cupcakes/')
+
+        self.assertEqual(primeira.json(), segunda.json())
+
+    def test_alteracao_de_cupcake_invalida_cache(self):
+        """
+        Testa que salvar um cupcake incrementa a versão e atualiza a listagem
+        """
+        self.client.get('/api/cupcakes/destaques/')
+        versao = CatalogoCacheService.obter_versao()
+
+        self.cupcake.preco = Decimal('9.90')
+        self.cupcake.save()
+
+        self.assertGreater(CatalogoCacheService.obter_versao(), versao)
+        resposta = self.client.get('/api/cupcakes/destaques/')
+        self.assertEqual(resposta.json()[0]['preco'], '9.90')
+
+    def test_remocao_de_categoria_invalida_cache(self):
+        """
+        Testa que remover uma categoria incrementa a versão do catálogo
+        """
+        categoria = Categoria.objects.create(nome='Frutas', slug='frutas')
+        versao = CatalogoCacheService.obter_versao()
+
+        categoria.delete()
+
+        self.assertGreater(CatalogoCacheService.obter_versao(), versao)
+
+    def test_chave_considera_parametros_e_staff(self):
+        """
+        Testa que parâmetros e perfil admin geram chaves distintas
+        """
+        chave_anonima = CatalogoCacheService.montar_chave('cupcakes:list', {'page': '1'})
+        chave_staff = CatalogoCacheService.montar_chave('cupcakes:list', {'page': '1'}, staff=True)
+        chave_pagina = CatalogoCacheService.montar_chave('cupcakes:list', {'page': '2'})
+
+        self.assertNotEqual(chave_anonima, chave_staff)
+        self.assertNotEqual(chave_anonima, chave_pagina)
+
+    def test_list_editable_do_admin_invalida_cache(self):
+        """
+        Testa que a edição em massa do admin invalida o cache do catálogo
+        """
+        admin = User.objects.create_superuser('admin', 'admin@teste.com', 'senha123')
+        self.client.force_login(admin)
+        versao = CatalogoCacheService.obter_versao()
+
+        self.client.post('/admin/cupcakes_api/cupcake/', {
+            'form-TOTAL_FORMS': '1',
+            'form-INITIAL_FORMS': '1',
+            'form-MIN_NUM_FORMS': '0',
+            'form-MAX_NUM_FORMS': '1000',
+            'form-0-id': str(self.cupcake.id),
+            'form-0-preco': '12.00',
+            'form-0-estoque': '3',
+            'form-0-destaque': 'on',
+            'form-0-ativo': 'on',
+            '_save': 'Salvar',
+        })
+
+        self.cupcake.refresh_from_db()
+        self.assertEqual(self.cupcake.preco, Decimal('12.00'))
+        self.assertGreater(CatalogoCacheService.obter_versao(), versao)
+
+
+class CacheCompartilhadoCheckTestCase(TestCase):
+    """
+    Testes da verificação do backend de cache
+    """
+
+    LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    BANCO = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache_teste'}}
+
+    def test_cache_local_sem_permissao(self):
+        """
+        Testa que o cache em memória do processo é recusado fora de CACHE_LOCAL
+        """
+        with override_settings(CACHES=self.LOCMEM, CACHE_LOCAL=False):
+            erros = verificar_cache_compartilhado(None)
+        self.assertEqual([erro.id for erro in erros], ['cupcakes_api.E001'])
+
+    def test_cache_compartilhado(self):
+        """
+        Testa que o cache no banco e o local permitido passam na verificação
+        """
+        with override_settings(CACHES=self.BANCO, CACHE_LOCAL=False):
+            self.assertEqual(verificar_cache_compartilhado(None), [])
+        with override_settings(CACHES=self.LOCMEM, CACHE_LOCAL=True):
+            self.assertEqual(verificar_cache_compartilhado(None), [])
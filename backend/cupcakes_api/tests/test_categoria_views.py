@@ -0,0 +1,64 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake
+
+
+class CategoriaTotaisTestCase(TestCase):
+    """
+    Testes dos totais anotados na listagem de categorias
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.chocolate = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        self.frutas = Categoria.objects.create(nome='Frutas', slug='frutas')
+        for indice, (preco, estoque, ativo) in enumerate([
+            ('8.00', 5, True),
+            ('12.50', 0, True),
+            ('20.00', 3, False),
+        ]):
+            Cupcake.objects.create(
+                nome=f'Chocolate {indice}',
+                slug=f'chocolate-{indice}',
+                descricao='Cupcake',
+                preco=Decimal(preco),
+                categoria=self.chocolate,
+                estoque=estoque,
+                ativo=ativo
+            )
+
+    def test_totais_em_uma_consulta(self):
+        """
+        Testa que a listagem não faz uma consulta por categoria
+        """
+        with self.assertNumQueries(3):
+            # Agregado da ETag, COUNT da paginação e a listagem anotada
+            resposta = self.client.get('/api/categorias/')
+
+        self.assertEqual(
+            [categoria['nome'] for categoria in resposta.json()['results']],
+            ['Chocolate', 'Frutas']
+        )
+        categorias = {categoria['slug']: categoria for categoria in resposta.json()['results']}
+        self.assertEqual(categorias['chocolate']['total_cupcakes'], 2)
+        self.assertEqual(categorias['chocolate']['cupcakes_em_estoque'], 1)
+        self.assertEqual(categorias['chocolate']['preco_minimo'], '8.00')
+        self.assertEqual(categorias['chocolate']['preco_maximo'], '12.50')
+        self.assertEqual(categorias['frutas']['total_cupcakes'], 0)
+        self.assertIsNone(categorias['frutas']['preco_minimo'])
+
+    def test_cupcakes_da_categoria_sem_consulta_por_linha(self):
+        """
+        Testa que a action cupcakes carrega a categoria junto
+        """
+        with self.assertNumQueries(2):
+            resposta = self.client.get(f'/api/categorias/{self.chocolate.id}/cupcakes/')
+
+        self.assertEqual(len(resposta.json()), 2)
+        self.assertEqual(resposta.json()[0]['categoria_nome'], 'Chocolate')
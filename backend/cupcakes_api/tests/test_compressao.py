@@ -0,0 +1,90 @@
+import gzip
+from unittest import skipIf
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from cupcakes_api import middleware
+from cupcakes_api.middleware import CompressaoRespostaMiddleware, escolher_codificacao
+
+CONTEUDO = b'{"results":[' + b','.join([b'{"nome":"Red Velvet","preco":"8.50"}'] * 100) + b']}'
+
+
+@override_settings(COMPRESSAO_TAMANHO_MINIMO=200)
+class CompressaoRespostaTestCase(SimpleTestCase):
+    """
+    Testes do middleware de compressão das respostas
+    """
+
+    def responder(self, resposta, accept_encoding='gzip', request=None):
+        if request is None:
+            request = RequestFactory().get('/api/cupcakes/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressaoRespostaMiddleware(lambda request: resposta)(request)
+
+    def test_negociacao_da_codificacao(self):
+        """
+        Testa a escolha pela lista e pelos pesos do Accept-Encoding
+        """
+        self.assertEqual(escolher_codificacao('gzip, deflate'), 'gzip')
+        self.assertIsNone(escolher_codificacao('identity'))
+        self.assertIsNone(escolher_codificacao('gzip;q=0'))
+        self.assertIsNone(escolher_codificacao(''))
+        self.assertEqual(escolher_codificacao('br;q=0, *'), 'gzip')
+
+    @skipIf(middleware.brotli is None, 'Brotli não instalado')
+    def test_prefere_brotli(self):
+        """
+        Testa que brotli é usado quando aceito com o mesmo peso do gzip
+        """
+        self.assertEqual(escolher_codificacao('gzip, deflate, br'), 'br')
+        self.assertEqual(escolher_codificacao('gzip;q=1, br;q=0.5'), 'gzip')
+
+        resposta = self.responder(HttpResponse(CONTEUDO, content_type='application/json'), 'br')
+
+        self.assertEqual(resposta['Content-Encoding'], 'br')
+        self.assertEqual(middleware.brotli.decompress(resposta.content), CONTEUDO)
+
+    def test_comprime_json_com_gzip(self):
+        """
+        Testa a compressão, os headers e a ETag enfraquecida
+        """
+        original = HttpResponse(CONTEUDO, content_type='application/json')
+        original['ETag'] = '"abc"'
+
+        resposta = self.responder(original)
+
+        self.assertEqual(resposta['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(resposta.content), CONTEUDO)
+        self.assertEqual(resposta['Content-Length'], str(len(resposta.content)))
+        self.assertEqual(resposta['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', resposta['Vary'])
+
+    def test_ignora_respostas_pequenas_streaming_e_outros_tipos(self):
+        """
+        Testa os casos em que a resposta sai sem compressão
+        """
+        pequena = self.responder(HttpResponse(b'{"a":1}', content_type='application/json'))
+        streaming = self.responder(StreamingHttpResponse([CONTEUDO], content_type='application/json'))
+        imagem = self.responder(HttpResponse(CONTEUDO, content_type='image/png'))
+        html = self.responder(HttpResponse(CONTEUDO, content_type='text/html'))
+
+        for resposta in (pequena, streaming, imagem, html):
+            self.assertFalse(resposta.has_header('Content-Encoding'))
+
+    def test_ignora_respostas_com_token_csrf(self):
+        """
+        Testa que respostas que usaram o token CSRF saem sem compressão
+        """
+        request = RequestFactory().get('/api/cupcakes/', HTTP_ACCEPT_ENCODING='gzip')
+        get_token(request)
+
+        resposta = self.responder(HttpResponse(CONTEUDO, content_type='application/json'), request=request)
+
+        self.assertFalse(resposta.has_header('Content-Encoding'))
+
+    @override_settings(COMPRESSAO_NIVEL_GZIP=1)
+    def test_nivel_configuravel(self):
+        """
+        Testa que o nível das settings é aplicado
+        """
+        resposta = self.responder(HttpResponse(CONTEUDO, content_type='application/json'))
+        self.assertEqual(resposta.content, gzip.compress(CONTEUDO, compresslevel=1, mtime=0))
@@ -0,0 +1,74 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.serializers import CupcakeListSerializer
+
+
+class CupcakeListaRapidaTestCase(TestCase):
+    """
+    Testes do caminho rápido do CupcakeListSerializer
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        Cupcake.objects.create(
+            nome='Maçã & Canela',
+            slug='maca-canela',
+            descricao='Com "aspas" e acentuação',
+            preco=Decimal('7.5'),
+            categoria=categoria,
+            imagem='cupcakes/maçã com canela.jpg',
+            estoque=3
+        )
+        Cupcake.objects.create(
+            nome='Red Velvet',
+            slug='red-velvet',
+            descricao='Cream cheese',
+            preco=Decimal('10.00'),
+            categoria=categoria,
+            imagem_url='https://cdn.exemplo.com/red.jpg',
+            destaque=True,
+            estoque=0
+        )
+        Cupcake.objects.create(
+            nome='Sem Imagem',
+            slug='sem-imagem',
+            descricao='Inativo',
+            preco=Decimal('9.99'),
+            categoria=categoria,
+            ativo=False,
+            estoque=5
+        )
+
+    def renderizar(self, dados):
+        return JSONRenderer().render(dados)
+
+    def test_saida_identica_ao_caminho_por_instancias(self):
+        """
+        Testa que o caminho rápido gera os mesmos bytes, com e sem request
+        """
+        request = RequestFactory().get('/api/cupcakes/')
+        for contexto in ({'request': request}, {}):
+            queryset = Cupcake.objects.order_by('id')
+            por_instancias = CupcakeListSerializer(list(queryset), many=True, context=contexto).data
+            rapido = CupcakeListSerializer(queryset, many=True, context=contexto).data
+
+            self.assertEqual(self.renderizar(rapido), self.renderizar(por_instancias))
+
+    def test_listagem_sem_consultas_por_linha(self):
+        """
+        Testa que a listagem não faz consultas por linha
+        """
+        with self.assertNumQueries(3):
+            # Agregado da ETag, COUNT da paginação e a página projetada
+            resposta = APIClient().get('/api/cupcakes/')
+
+        imagem = resposta.json()['results'][1]['imagem']
+        self.assertEqual(imagem, 'http://testserver/media/cupcakes/ma%C3%A7%C3%A3%20com%20canela.jpg')
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake
+
+
+class DisponivelTestCase(TestCase):
+    """
+    Testes da coluna materializada Cupcake.disponivel
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        self.categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        self.cupcake = self.criar_cupcake('Chocolate', estoque=2)
+
+    def criar_cupcake(self, nome, **kwargs):
+        dados = {
+            'nome': nome,
+            'slug': nome.lower(),
+            'descricao': f'Cupcake de {nome}',
+            'preco': Decimal('8.50'),
+            'categoria': self.categoria,
+        }
+        dados.update(kwargs)
+        return Cupcake.objects.create(**dados)
+
+    def disponivel_no_banco(self, cupcake):
+        return Cupcake.objects.values_list('disponivel', flat=True).get(pk=cupcake.pk)
+
+    def test_save_calcula_disponivel(self):
+        """
+        Testa que save() grava ativo and estoque > 0
+        """
+        self.assertTrue(self.disponivel_no_banco(self.cupcake))
+        self.assertFalse(self.disponivel_no_banco(self.criar_cupcake('Baunilha', estoque=0)))
+        self.assertFalse(self.disponivel_no_banco(self.criar_cupcake('Limão', estoque=5, ativo=False)))
+
+    def test_save_com_update_fields(self):
+        """
+        Testa que salvar só ativo/estoque também atualiza a coluna
+        """
+        self.cupcake.ativo = False
+        self.cupcake.save(update_fields=['ativo'])
+
+        self.assertFalse(self.disponivel_no_banco(self.cupcake))
+
+    def test_reduzir_e_repor_estoque(self):
+        """
+        Testa que os UPDATEs de estoque mantêm a coluna em dia
+        """
+        self.assertTrue(self.cupcake.reduzir_estoque(2))
+        self.assertFalse(self.cupcake.disponivel)
+        self.assertFalse(self.disponivel_no_banco(self.cupcake))
+
+        self.cupcake.repor_estoque(1)
+        self.assertTrue(self.cupcake.disponivel)
+        self.assertTrue(self.disponivel_no_banco(self.cupcake))
+
+    def test_repor_estoque_de_inativo(self):
+        """
+        Testa que repor o estoque de um cupcake inativo não o torna disponível
+        """
+        inativo = self.criar_cupcake('Limão', estoque=0, ativo=False)
+        inativo.repor_estoque(3)
+
+        self.assertFalse(self.disponivel_no_banco(inativo))
+
+    def test_endpoint_disponiveis(self):
+        """
+        Testa a listagem de disponíveis e o filtro ?disponivel=
+        """
+        self.criar_cupcake('Baunilha', estoque=0)
+        client = APIClient()
+
+        resposta = client.get('/api/cupcakes/disponiveis/')
+        self.assertEqual([cupcake['nome'] for cupcake in resposta.json()], ['Chocolate'])
+
+        resposta = client.get('/api/cupcakes/', {'disponivel': 'false'})
+        self.assertEqual([cupcake['nome'] for cupcake in resposta.json()['results']], ['Baunilha'])
@@ -0,0 +1,95 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.services import BuscaService
+
+
+class FacetasTestCase(TestCase):
+    """
+    Testes do endpoint /api/cupcakes/facetas/
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        BuscaService._indice = None
+        self.client = APIClient()
+        self.chocolate = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        self.frutas = Categoria.objects.create(nome='Frutas', slug='frutas')
+        for nome, categoria, preco, estoque, destaque in [
+            ('Brigadeiro', self.chocolate, '7.50', 10, True),
+            ('Belga', self.chocolate, '9.00', 0, False),
+            ('Gourmet', self.chocolate, '12.00', 5, True),
+            ('Morango', self.frutas, '8.00', 3, False),
+        ]:
+            Cupcake.objects.create(
+                nome=nome,
+                slug=nome.lower(),
+                descricao=f'Cupcake {nome}',
+                preco=Decimal(preco),
+                categoria=categoria,
+                estoque=estoque,
+                destaque=destaque
+            )
+
+    def facetas(self, **parametros):
+        resposta = self.client.get('/api/cupcakes/facetas/', parametros)
+        self.assertEqual(resposta.status_code, 200)
+        return resposta.json()
+
+    def test_contagens_sem_filtro(self):
+        """
+        Testa as contagens de todas as facetas em uma consulta
+        """
+        with self.assertNumQueries(1):
+            facetas = self.facetas()
+
+        self.assertEqual(facetas['total'], 4)
+        self.assertEqual(
+            [(categoria['slug'], categoria['count']) for categoria in facetas['categorias']],
+            [('chocolate', 3), ('frutas', 1)]
+        )
+        self.assertEqual(
+            [faixa['count'] for faixa in facetas['faixas_preco']],
+            [1, 2, 1]
+        )
+        self.assertEqual(facetas['disponibilidade'], {'disponivel': 3, 'indisponivel': 1})
+
+    def test_categoria_selecionada_mantem_alternativas(self):
+        """
+        Testa que a faceta de categoria ignora o próprio filtro
+        """
+        facetas = self.facetas(categoria=self.frutas.id)
+
+        self.assertEqual(len(facetas['categorias']), 2)
+        self.assertEqual(facetas['total'], 1)
+        self.assertEqual([faixa['count'] for faixa in facetas['faixas_preco']], [0, 1, 0])
+
+    def test_demais_filtros_aplicados(self):
+        """
+        Testa que destaque e busca restringem as contagens
+        """
+        self.assertEqual(self.facetas(destaque='true')['total'], 2)
+        self.assertEqual(self.facetas(search='morango')['total'], 1)
+
+    def test_cache_por_versao_do_catalogo(self):
+        """
+        Testa que a resposta vem do cache até o catálogo mudar
+        """
+        self.facetas()
+        with self.assertNumQueries(0):
+            self.facetas()
+
+        Cupcake.objects.filter(nome='Morango').get().delete()
+        self.assertEqual(self.facetas()['total'], 3)
+
+    def test_categoria_invalida(self):
+        """
+        Testa a validação do parâmetro categoria
+        """
+        resposta = self.client.get('/api/cupcakes/facetas/', {'categoria': 'x'})
+        self.assertEqual(resposta.status_code, 400)
@@ -0,0 +1,166 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.services import CarrinhoService, PedidoService
+
+
+class GetCondicionalCatalogoTestCase(TestCase):
+    """
+    Testes de ETag / Last-Modified no catálogo
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.categoria = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        self.cupcake = Cupcake.objects.create(
+            nome='Brigadeiro',
+            slug='brigadeiro',
+            descricao='Cupcake de brigadeiro',
+            preco=Decimal('8.50'),
+            categoria=self.categoria,
+            estoque=10
+        )
+
+    def test_listagem_devolve_304_sem_consultas(self):
+        """
+        Testa que If-None-Match com a ETag atual devolve 304 sem corpo
+        """
+        primeira = self.client.get('/api/cupcakes/')
+        self.assertEqual(primeira.status_code, 200)
+        self.assertTrue(primeira['ETag'].startswith('"'))
+        self.assertNotIn('Last-Modified', primeira)
+
+        with self.assertNumQueries(0):
+            segunda = self.client.get('/api/cupcakes/', HTTP_IF_NONE_MATCH=primeira['ETag'])
+
+        self.assertEqual(segunda.status_code, 304)
+        self.assertEqual(segunda.content, b'')
+        self.assertEqual(segunda['ETag'], primeira['ETag'])
+
+    def test_etag_muda_com_alteracao_e_parametros(self):
+        """
+        Testa que a ETag muda quando os dados ou os filtros mudam
+        """
+        etag = self.client.get('/api/cupcakes/')['ETag']
+        self.assertNotEqual(self.client.get('/api/cupcakes/?destaque=true')['ETag'], etag)
+
+        self.categoria.nome = 'Chocolates'
+        self.categoria.save()
+
+        resposta = self.client.get('/api/cupcakes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertNotEqual(resposta['ETag'], etag)
+
+    def test_if_modified_since(self):
+        """
+        Testa o 304 por data quando não há If-None-Match
+        """
+        primeira = self.client.get(f'/api/cupcakes/{self.cupcake.id}/')
+
+        segunda = self.client.get(
+            f'/api/cupcakes/{self.cupcake.id}/',
+            HTTP_IF_MODIFIED_SINCE=primeira['Last-Modified']
+        )
+
+        self.assertEqual(segunda.status_code, 304)
+
+    def test_listagem_sem_last_modified(self):
+        """
+        Testa que a exclusão não gera 304 falso para quem só envia If-Modified-Since
+        """
+        outro = Cupcake.objects.create(
+            nome='Beijinho',
+            slug='beijinho',
+            descricao='Cupcake de beijinho',
+            preco=Decimal('8.50'),
+            categoria=self.categoria,
+            estoque=10
+        )
+        detalhe = self.client.get(f'/api/cupcakes/{self.cupcake.id}/')['Last-Modified']
+        primeira = self.client.get('/api/cupcakes/')
+        self.assertNotIn('Last-Modified', primeira)
+        self.assertNotIn('Last-Modified', self.client.get(f'/api/categorias/{self.categoria.id}/'))
+
+        outro.delete()
+
+        resposta = self.client.get('/api/cupcakes/', HTTP_IF_MODIFIED_SINCE=detalhe)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(len(resposta.json()['results']), 1)
+
+    def test_remocao_de_cupcake_muda_etag_da_categoria(self):
+        """
+        Testa que a contagem de cupcakes faz parte da ETag das categorias
+        """
+        etag = self.client.get('/api/categorias/')['ETag']
+        self.assertEqual(
+            self.client.get('/api/categorias/', HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        self.cupcake.delete()
+
+        self.assertEqual(
+            self.client.get('/api/categorias/', HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
+
+    def test_detalhe_inexistente_continua_404(self):
+        """
+        Testa que IDs inexistentes ou inválidos não recebem ETag
+        """
+        self.assertEqual(self.client.get('/api/cupcakes/999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/categorias/abc/').status_code, 404)
+
+
+class GetCondicionalPedidoTestCase(TestCase):
+    """
+    Testes de ETag no detalhe do pedido
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.usuario)
+        categoria = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        cupcake = Cupcake.objects.create(
+            nome='Brigadeiro',
+            slug='brigadeiro',
+            descricao='Cupcake de brigadeiro',
+            preco=Decimal('10.00'),
+            categoria=categoria,
+            estoque=10
+        )
+        CarrinhoService.adicionar_item(self.usuario, cupcake.id, 1)
+        resultado = PedidoService.criar_pedido(self.usuario, {
+            'nome_cliente': 'Cliente',
+            'email_cliente': 'cliente@teste.com',
+            'telefone_cliente': '51999999999',
+            'tipo_entrega': 'retirada',
+            'metodo_pagamento': 'pix'
+        })
+        self.pedido = resultado['pedido']
+        self.url = f'/api/pedidos/{self.pedido.id}/'
+
+    def test_304_ate_mudanca_de_status(self):
+        """
+        Testa que a ETag do pedido muda quando o status é atualizado
+        """
+        primeira = self.client.get(self.url)
+        self.assertIn('private', primeira['Cache-Control'])
+
+        segunda = self.client.get(self.url, HTTP_IF_NONE_MATCH=primeira['ETag'])
+        self.assertEqual(segunda.status_code, 304)
+
+        PedidoService.atualizar_status_pedido(self.pedido.id, 'em_preparo')
+
+        terceira = self.client.get(self.url, HTTP_IF_NONE_MATCH=primeira['ETag'])
+        self.assertEqual(terceira.status_code, 200)
+        self.assertEqual(terceira.json()['status'], 'em_preparo')
@@ -0,0 +1,88 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, ChaveIdempotencia, Cupcake, Pedido
+from cupcakes_api.services import CarrinhoService
+
+
+class IdempotenciaPedidoTestCase(TestCase):
+    """
+    Testes do header Idempotency-Key em POST /api/pedidos/criar/
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.usuario)
+        categoria = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        self.cupcake = Cupcake.objects.create(
+            nome='Brigadeiro',
+            slug='brigadeiro',
+            descricao='Cupcake de brigadeiro',
+            preco=Decimal('10.00'),
+            categoria=categoria,
+            estoque=10
+        )
+        self.dados = {
+            'nome_cliente': 'Cliente',
+            'email_cliente': 'cliente@teste.com',
+            'telefone_cliente': '51999999999',
+            'tipo_entrega': 'retirada',
+            'metodo_pagamento': 'pix'
+        }
+
+    def criar(self, chave, dados=None):
+        return self.client.post(
+            '/api/pedidos/criar/',
+            dados or self.dados,
+            format='json',
+            HTTP_IDEMPOTENCY_KEY=chave
+        )
+
+    def test_repeticao_devolve_pedido_original(self):
+        """
+        Testa que a repetição não cria outro pedido nem baixa estoque de novo
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcake.id, 2)
+
+        primeira = self.criar('tentativa-1')
+        # O cliente volta a encher o carrinho e repete a mesma tentativa
+        CarrinhoService.adicionar_item(self.usuario, self.cupcake.id, 2)
+        segunda = self.criar('tentativa-1')
+
+        self.assertEqual(primeira.status_code, 201)
+        self.assertEqual(segunda.status_code, 201)
+        self.assertEqual(segunda['Idempotent-Replayed'], 'true')
+        self.assertEqual(primeira.json(), segunda.json())
+        self.assertEqual(Pedido.objects.count(), 1)
+        self.cupcake.refresh_from_db()
+        self.assertEqual(self.cupcake.estoque, 8)
+
+    def test_chave_reutilizada_com_outros_dados(self):
+        """
+        Testa que reutilizar a chave com outro corpo é rejeitado
+        """
+        CarrinhoService.adicionar_item(self.usuario, self.cupcake.id, 1)
+        self.criar('tentativa-2')
+
+        resposta = self.criar('tentativa-2', dict(self.dados, nome_cliente='Outro'))
+
+        self.assertEqual(resposta.status_code, 422)
+
+    def test_falha_nao_consome_a_chave(self):
+        """
+        Testa que uma falha (carrinho vazio) permite tentar de novo
+        """
+        falha = self.criar('tentativa-3')
+        self.assertEqual(falha.status_code, 400)
+        self.assertFalse(ChaveIdempotencia.objects.exists())
+
+        CarrinhoService.adicionar_item(self.usuario, self.cupcake.id, 1)
+        sucesso = self.criar('tentativa-3')
+
+        self.assertEqual(sucesso.status_code, 201)
+        self.assertEqual(Pedido.objects.count(), 1)
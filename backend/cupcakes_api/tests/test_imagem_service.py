@@ -0,0 +1,144 @@
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.services import ImagemService
+
+
+def criar_imagem(nome='cupcake.png', largura=800, altura=600, modo='RGBA'):
+    """
+    Gera um arquivo de imagem em memória para upload
+    """
+    conteudo = BytesIO()
+    Image.new(modo, (largura, altura), (200, 50, 80, 128) if modo == 'RGBA' else (200, 50, 80)).save(conteudo, 'PNG')
+    return SimpleUploadedFile(nome, conteudo.getvalue(), content_type='image/png')
+
+
+class ImagemServiceTestCase(TestCase):
+    """
+    Testes da geração de variantes das imagens dos cupcakes
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste com um MEDIA_ROOT temporário
+        """
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        configuracoes = override_settings(MEDIA_ROOT=self.media_root, IMAGEM_THREADS=0)
+        configuracoes.enable()
+        self.addCleanup(configuracoes.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        self.categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+
+    def criar_cupcake(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            dados = {
+                'nome': 'Red Velvet',
+                'slug': 'red-velvet',
+                'descricao': 'Cream cheese',
+                'preco': Decimal('10.00'),
+                'categoria': self.categoria,
+                'estoque': 5,
+            }
+            dados.update(kwargs)
+            cupcake = Cupcake.objects.create(**dados)
+        cupcake.refresh_from_db()
+        return cupcake
+
+    def test_gera_variantes_apos_upload(self):
+        """
+        Testa a geração das larguras configuradas nos dois formatos
+        """
+        cupcake = self.criar_cupcake(imagem=criar_imagem())
+        variantes = cupcake.imagem_variantes
+
+        self.assertEqual(variantes['origem'], cupcake.imagem.name)
+        self.assertEqual(sorted(variantes['webp'], key=int), ['320', '640', '800'])
+        self.assertEqual(sorted(variantes['jpeg'], key=int), ['320', '640', '800'])
+
+        storage = ImagemService.storage()
+        with storage.open(variantes['jpeg']['320']) as arquivo:
+            imagem = Image.open(arquivo)
+            self.assertEqual(imagem.format, 'JPEG')
+            self.assertEqual(imagem.size, (320, 240))
+        with storage.open(variantes['webp']['640']) as arquivo:
+            self.assertEqual(Image.open(arquivo).format, 'WEBP')
+
+    def test_imagem_pequena_nao_e_ampliada(self):
+        """
+        Testa que a única variante de uma imagem pequena tem a largura original
+        """
+        cupcake = self.criar_cupcake(imagem=criar_imagem(largura=200, altura=200, modo='RGB'))
+
+        self.assertEqual(list(cupcake.imagem_variantes['webp']), ['200'])
+
+    def test_troca_de_imagem_remove_variantes_antigas(self):
+        """
+        Testa que as variantes do upload anterior são apagadas
+        """
+        cupcake = self.criar_cupcake(imagem=criar_imagem('antiga.png'))
+        antigas = list(cupcake.imagem_variantes['webp'].values())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cupcake.imagem = criar_imagem('nova.png', largura=400, altura=400)
+            cupcake.save()
+        cupcake.refresh_from_db()
+
+        storage = ImagemService.storage()
+        self.assertTrue(all(not storage.exists(nome) for nome in antigas))
+        self.assertEqual(list(cupcake.imagem_variantes['webp']), ['320', '400'])
+
+    def test_remover_cupcake_apaga_variantes(self):
+        """
+        Testa a limpeza dos arquivos quando o cupcake é excluído
+        """
+        cupcake = self.criar_cupcake(imagem=criar_imagem())
+        arquivos = list(cupcake.imagem_variantes['jpeg'].values())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cupcake.delete()
+
+        storage = ImagemService.storage()
+        self.assertTrue(all(not storage.exists(nome) for nome in arquivos))
+
+    def test_srcset_na_listagem(self):
+        """
+        Testa o srcset por formato na listagem e no detalhe
+        """
+        cupcake = self.criar_cupcake(imagem=criar_imagem())
+        self.criar_cupcake(imagem_url='https://cdn.exemplo.com/a.jpg', nome='Sem Upload', slug='sem-upload')
+        client = APIClient()
+
+        resultados = client.get('/api/cupcakes/').json()['results']
+        por_slug = {item['slug']: item for item in resultados}
+        srcset = por_slug['red-velvet']['imagem_srcset']
+
+        self.assertEqual(list(srcset), ['webp', 'jpeg'])
+        self.assertTrue(srcset['webp'].startswith('http://testserver/media/cupcakes/'))
+        self.assertTrue(srcset['webp'].endswith(' 800w'))
+        self.assertEqual(len(srcset['jpeg'].split(', ')), 3)
+        self.assertEqual(por_slug['sem-upload']['imagem_srcset'], {})
+
+        detalhe = client.get(f'/api/cupcakes/{cupcake.pk}/').json()
+        self.assertEqual(detalhe['imagem_srcset'], srcset)
+
+    def test_comando_regenera_variantes(self):
+        """
+        Testa o comando de regeneração em lote
+        """
+        cupcake = self.criar_cupcake(imagem=criar_imagem())
+        Cupcake.objects.filter(pk=cupcake.pk).update(imagem_variantes={})
+
+        call_command('gerar_variantes_imagens', processos=1, stdout=StringIO())
+        cupcake.refresh_from_db()
+
+        self.assertEqual(cupcake.imagem_variantes['origem'], cupcake.imagem.name)
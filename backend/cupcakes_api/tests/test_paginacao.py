@@ -0,0 +1,55 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake
+
+
+class PaginacaoCursorTestCase(TestCase):
+    """
+    Testes da paginação por cursor opcional
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        cache.clear()
+        self.client = APIClient()
+        categoria = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        Cupcake.objects.bulk_create([
+            Cupcake(
+                nome=f'Cupcake {indice:02d}',
+                slug=f'cupcake-{indice:02d}',
+                descricao='Cupcake de teste',
+                preco=Decimal('5.00'),
+                categoria=categoria,
+                estoque=10
+            )
+            for indice in range(25)
+        ])
+
+    def test_paginacao_padrao_mantem_formato(self):
+        """
+        Testa que sem o parâmetro a paginação por número continua igual
+        """
+        resposta = self.client.get('/api/cupcakes/').json()
+
+        self.assertEqual(resposta['count'], 25)
+        self.assertEqual(len(resposta['results']), 20)
+
+    def test_paginacao_por_cursor_percorre_todos(self):
+        """
+        Testa que o modo cursor percorre todos os itens sem repetir
+        """
+        ids = []
+        url = '/api/cupcakes/?paginacao=cursor'
+        while url:
+            resposta = self.client.get(url).json()
+            self.assertNotIn('count', resposta)
+            ids.extend(cupcake['id'] for cupcake in resposta['results'])
+            url = resposta['next']
+
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(len(set(ids)), 25)
+        self.assertEqual(ids, sorted(ids, reverse=True))
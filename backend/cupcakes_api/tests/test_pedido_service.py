@@ -0,0 +1,351 @@
+from datetime import date, timedelta
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+from decimal import Decimal
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.utils import timezone
+from django.core.management import call_command
+from cupcakes_api.models import Categoria, Cupcake, Pedido, ItemPedido, VendaDiaria
+from cupcakes_api.services import CarrinhoService, PedidoService, VendaDiariaService
+
+
+class EstatisticasPedidosTestCase(TestCase):
+    """
+    Testes das estatísticas de pedidos
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        self.criar_pedido('pendente', 'entrega', Decimal('50.00'))
+        self.criar_pedido('entregue', 'entrega', Decimal('30.00'))
+        antigo = self.criar_pedido('cancelado', 'retirada', Decimal('10.00'))
+        Pedido.objects.filter(pk=antigo.pk).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+        VendaDiariaService.recalcular()
+
+    def criar_pedido(self, status, tipo_entrega, total):
+        return Pedido.objects.create(
+            usuario=self.usuario,
+            status=status,
+            tipo_entrega=tipo_entrega,
+            nome_cliente='Cliente',
+            email_cliente='cliente@teste.com',
+            telefone_cliente='51999999999',
+            subtotal=total,
+            total=total
+        )
+
+    def test_estatisticas_em_uma_consulta(self):
+        """
+        Testa que todas as estatísticas saem de uma única consulta
+        """
+        with self.assertNumQueries(1):
+            stats = PedidoService.calcular_estatisticas_pedidos()
+
+        self.assertEqual(stats['total_pedidos'], 3)
+        self.assertEqual(stats['total_vendas'], Decimal('90.00'))
+        self.assertEqual(stats['ticket_medio'], Decimal('30.00'))
+        self.assertIn({'status': 'cancelado', 'count': 1}, stats['por_status'])
+        self.assertIn({'tipo_entrega': 'entrega', 'count': 2}, stats['por_tipo_entrega'])
+
+    def test_estatisticas_por_periodo(self):
+        """
+        Testa o filtro por intervalo de datas e a série por dia
+        """
+        hoje = timezone.localdate()
+        stats = PedidoService.calcular_estatisticas_pedidos(
+            data_inicio=hoje - timedelta(days=1),
+            data_fim=hoje,
+            granularidade='dia'
+        )
+
+        self.assertEqual(stats['total_pedidos'], 2)
+        self.assertEqual(len(stats['serie']), 1)
+        self.assertEqual(stats['serie'][0]['total_vendas'], Decimal('80.00'))
+
+    def test_estatisticas_sem_pedidos(self):
+        """
+        Testa estatísticas em um período sem pedidos
+        """
+        stats = PedidoService.calcular_estatisticas_pedidos(
+            data_inicio=date(2000, 1, 1),
+            data_fim=date(2000, 1, 31)
+        )
+
+        self.assertEqual(stats['total_pedidos'], 0)
+        self.assertEqual(stats['total_vendas'], Decimal('0.00'))
+        self.assertEqual(stats['por_status'], [])
+
+
+class VendaDiariaTestCase(TestCase):
+    """
+    Testes da consolidação diária de vendas
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        categoria = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        self.cupcake = Cupcake.objects.create(
+            nome='Brigadeiro',
+            slug='brigadeiro',
+            descricao='Cupcake de brigadeiro',
+            preco=Decimal('10.00'),
+            categoria=categoria,
+            estoque=20
+        )
+        self.dados_pedido = {
+            'nome_cliente': 'Cliente',
+            'email_cliente': 'cliente@teste.com',
+            'telefone_cliente': '51999999999',
+            'tipo_entrega': 'retirada',
+            'metodo_pagamento': 'pix'
+        }
+
+    def criar_pedido(self, quantidade):
+        CarrinhoService.adicionar_item(self.usuario, self.cupcake.id, quantidade)
+        return PedidoService.criar_pedido(self.usuario, self.dados_pedido)['pedido']
+
+    def test_criar_pedido_atualiza_consolidacao(self):
+        """
+        Testa que criar um pedido soma na linha do dia e do status
+        """
+        self.criar_pedido(3)
+
+        linha = VendaDiaria.objects.get(status='recebido', tipo_entrega='retirada')
+        self.assertEqual(linha.total_pedidos, 1)
+        self.assertEqual(linha.total_vendas, Decimal('30.00'))
+        self.assertEqual(linha.itens_vendidos, 3)
+
+    def test_cancelar_pedido_move_status(self):
+        """
+        Testa que cancelar move o pedido para a linha de cancelados
+        """
+        pedido = self.criar_pedido(2)
+        PedidoService.cancelar_pedido(pedido.id)
+
+        recebidos = VendaDiaria.objects.get(status='recebido')
+        cancelados = VendaDiaria.objects.get(status='cancelado')
+        self.assertEqual(recebidos.total_pedidos, 0)
+        self.assertEqual(cancelados.total_pedidos, 1)
+        self.assertEqual(cancelados.itens_vendidos, 2)
+
+    def test_recalcular_reproduz_consolidacao_incremental(self):
+        """
+        Testa que o comando de recálculo chega aos mesmos números
+        """
+        pedido = self.criar_pedido(2)
+        self.criar_pedido(1)
+        PedidoService.atualizar_status_pedido(pedido.id, 'em_preparo')
+
+        campos = ('data', 'status', 'tipo_entrega', 'total_pedidos', 'total_vendas', 'itens_vendidos')
+        incremental = set(VendaDiaria.objects.filter(total_pedidos__gt=0).values_list(*campos))
+
+        call_command('recalcular_vendas_diarias', '--lote', '1', stdout=StringIO())
+
+        self.assertEqual(set(VendaDiaria.objects.values_list(*campos)), incremental)
+
+
+    def test_excluir_pedido_no_admin(self):
+        """
+        Testa que excluir um pedido (um ou em massa) o tira da consolidação
+        """
+        admin = User.objects.create_superuser('admin', 'admin@teste.com', 'senha123')
+        self.client.force_login(admin)
+        pedido = self.criar_pedido(2)
+        outros = [self.criar_pedido(1), self.criar_pedido(1)]
+
+        self.client.post(f'/admin/cupcakes_api/pedido/{pedido.id}/delete/', {'post': 'yes'})
+        self.assertEqual(VendaDiaria.objects.get().total_pedidos, 2)
+        self.assertEqual(VendaDiaria.objects.get().itens_vendidos, 2)
+
+        self.client.post('/admin/cupcakes_api/pedido/', {
+            'action': 'delete_selected',
+            '_selected_action': [outro.id for outro in outros],
+            'post': 'yes'
+        })
+        self.assertFalse(Pedido.objects.exists())
+        self.assertEqual(VendaDiaria.objects.get().total_pedidos, 0)
+
+    def test_migracao_preenche_consolidacao(self):
+        """
+        Testa que a migração de preenchimento reproduz a consolidação incremental
+        """
+        self.criar_pedido(2)
+        self.criar_pedido(3)
+        campos = ('data', 'status', 'tipo_entrega', 'total_pedidos', 'total_vendas', 'itens_vendidos')
+        incremental = set(VendaDiaria.objects.values_list(*campos))
+        VendaDiaria.objects.all().delete()
+
+        migracao = import_module('cupcakes_api.migrations.0008_preencher_vendas_diarias')
+        migracao.preencher_vendas_diarias(apps, None)
+
+        self.assertEqual(set(VendaDiaria.objects.values_list(*campos)), incremental)
+
+
+class CheckoutTestCase(TestCase):
+    """
+    Testes do checkout em lote (itens em bulk e baixa de estoque condicional)
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        categoria = Categoria.objects.create(nome='Frutas', slug='frutas')
+        self.cupcakes = [
+            Cupcake.objects.create(
+                nome=f'Cupcake {indice}',
+                slug=f'cupcake-{indice}',
+                descricao='Cupcake de teste',
+                preco=Decimal('5.00'),
+                categoria=categoria,
+                estoque=10
+            )
+            for indice in range(6)
+        ]
+        self.dados_pedido = {
+            'nome_cliente': 'Cliente',
+            'email_cliente': 'cliente@teste.com',
+            'telefone_cliente': '51999999999',
+            'tipo_entrega': 'retirada',
+            'metodo_pagamento': 'pix'
+        }
+
+    def encher_carrinho(self, cupcakes, quantidade=2):
+        for cupcake in cupcakes:
+            CarrinhoService.adicionar_item(self.usuario, cupcake.id, quantidade)
+
+    def test_checkout_cria_itens_e_baixa_estoque(self):
+        """
+        Testa que os itens são criados com subtotal e o estoque é baixado
+        """
+        self.encher_carrinho(self.cupcakes[:3], quantidade=4)
+
+        resultado = PedidoService.criar_pedido(self.usuario, self.dados_pedido)
+
+        self.assertTrue(resultado['sucesso'])
+        itens = ItemPedido.objects.filter(pedido=resultado['pedido'])
+        self.assertEqual(itens.count(), 3)
+        self.assertTrue(all(item.subtotal == Decimal('20.00') for item in itens))
+        for cupcake in self.cupcakes[:3]:
+            cupcake.refresh_from_db()
+            self.assertEqual(cupcake.estoque, 6)
+
+    def test_consultas_crescem_apenas_com_um_update_por_cupcake(self):
+        """
+        Testa que cada linha extra do carrinho custa só o UPDATE de estoque
+        """
+        # Primeiro checkout cria as linhas da consolidação diária
+        self.encher_carrinho(self.cupcakes[:1])
+        PedidoService.criar_pedido(self.usuario, self.dados_pedido)
+
+        self.encher_carrinho(self.cupcakes[:1])
+        with CaptureQueriesContext(connection) as uma_linha:
+            PedidoService.criar_pedido(self.usuario, self.dados_pedido)
+
+        self.encher_carrinho(self.cupcakes[1:6])
+        with CaptureQueriesContext(connection) as cinco_linhas:
+            PedidoService.criar_pedido(self.usuario, self.dados_pedido)
+
+        self.assertEqual(len(cinco_linhas) - len(uma_linha), 4)
+
+    def test_estoque_insuficiente_desfaz_checkout(self):
+        """
+        Testa que faltar estoque em um item desfaz toda a operação
+        """
+        self.encher_carrinho(self.cupcakes[:2], quantidade=5)
+        # Outro checkout levou o estoque do segundo cupcake entre a
+        # validação do carrinho e a baixa de estoque
+        Cupcake.objects.filter(pk=self.cupcakes[1].pk).update(estoque=3)
+        self.cupcakes[1].refresh_from_db()
+        with mock.patch.object(CarrinhoService, 'validar_carrinho', return_value={'valido': True}):
+            resultado = PedidoService.criar_pedido(self.usuario, self.dados_pedido)
+
+        self.assertFalse(resultado['sucesso'])
+        self.assertIn('Estoque insuficiente', resultado['mensagem'])
+        self.assertFalse(Pedido.objects.exists())
+        self.cupcakes[0].refresh_from_db()
+        self.assertEqual(self.cupcakes[0].estoque, 10)
+
+
+class PedidoConsultasTestCase(TestCase):
+    """
+    Testes de número de consultas na listagem de pedidos
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste
+        """
+        self.usuario = User.objects.create_user('cliente', 'cliente@teste.com', 'senha123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.usuario)
+        categoria = Categoria.objects.create(nome='Chocolate', slug='chocolate')
+        self.cupcakes = [
+            Cupcake.objects.create(
+                nome=f'Cupcake {indice}',
+                slug=f'cupcake-{indice}',
+                descricao='Cupcake de teste',
+                preco=Decimal('5.00'),
+                categoria=categoria,
+                estoque=100
+            )
+            for indice in range(3)
+        ]
+        self.dados_pedido = {
+            'nome_cliente': 'Cliente',
+            'email_cliente': 'cliente@teste.com',
+            'telefone_cliente': '51999999999',
+            'tipo_entrega': 'retirada',
+            'metodo_pagamento': 'pix'
+        }
+
+    def criar_pedidos(self, quantidade):
+        for _ in range(quantidade):
+            for cupcake in self.cupcakes:
+                CarrinhoService.adicionar_item(self.usuario, cupcake.id, 1)
+            PedidoService.criar_pedido(self.usuario, self.dados_pedido)
+
+    def contar_consultas(self, url):
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.get(url)
+        self.assertEqual(resposta.status_code, 200)
+        return len(consultas)
+
+    def test_listagem_com_numero_constante_de_consultas(self):
+        """
+        Testa que a listagem não faz consultas por pedido ou por item
+        """
+        self.criar_pedidos(1)
+        com_um = self.contar_consultas('/api/pedidos/')
+
+        self.criar_pedidos(4)
+        com_cinco = self.contar_consultas('/api/pedidos/')
+
+        self.assertEqual(com_um, com_cinco)
+
+    def test_historico_com_numero_constante_de_consultas(self):
+        """
+        Testa que meus_pedidos não faz consultas por pedido ou por item
+        """
+        self.criar_pedidos(1)
+        com_um = self.contar_consultas('/api/pedidos/meus_pedidos/')
+
+        self.criar_pedidos(4)
+        com_cinco = self.contar_consultas('/api/pedidos/meus_pedidos/')
+
+        self.assertEqual(com_um, com_cinco)
@@ -0,0 +1,69 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+from cupcakes_api.parsers import JSONRapidoParser
+from cupcakes_api.renderers import JSONRapidoRenderer
+
+
+class JSONRapidoRendererTestCase(SimpleTestCase):
+    """
+    Testes do renderer/parser JSON baseado em orjson
+    """
+
+    def test_mesma_saida_do_json_renderer(self):
+        """
+        Testa que a saída é idêntica à do JSONRenderer para os tipos usados
+        """
+        dados = ReturnDict({
+            'valor': Decimal('8.50'),
+            'texto': 'Maçã linha',
+            'traduzido': gettext_lazy('Pendente'),
+            'data': datetime.date(2024, 5, 1),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            1: [1, 2.5, None, True],
+            'aninhado': {'itens': (Decimal('1.10'), 'a')}
+        }, serializer=None)
+
+        self.assertEqual(
+            JSONRapidoRenderer().render(dados),
+            JSONRenderer().render(dados)
+        )
+
+    def test_datetime_no_formato_da_api(self):
+        """
+        Testa que datetimes saem no DATETIME_FORMAT e no fuso local
+        """
+        momento = datetime.datetime(2024, 5, 1, 15, 30, 0, tzinfo=datetime.timezone.utc)
+
+        resultado = JSONRapidoRenderer().render({'criado': momento})
+
+        local = timezone.localtime(momento).strftime('%d/%m/%Y %H:%M:%S')
+        self.assertEqual(resultado, ('{"criado":"%s"}' % local).encode())
+
+    def test_indentacao_usa_renderer_padrao(self):
+        """
+        Testa que saídas indentadas continuam suportadas
+        """
+        resultado = JSONRapidoRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(resultado, b'{\n    "a": 1\n}')
+
+    def test_parser(self):
+        """
+        Testa a leitura do corpo e o erro de JSON inválido
+        """
+        corpo = '{"nome": "Maçã", "quantidade": 2, "preco": 8.5}'.encode()
+
+        self.assertEqual(
+            JSONRapidoParser().parse(io.BytesIO(corpo)),
+            JSONParser().parse(io.BytesIO(corpo))
+        )
+        with self.assertRaises(ParseError):
+            JSONRapidoParser().parse(io.BytesIO(b'{"nome": '))
@@ -0,0 +1,133 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake, RemocaoCatalogo
+
+
+class SincronizacaoCatalogoTestCase(TestCase):
+    """
+    Testes do endpoint /api/cupcakes/mudancas/
+    """
+
+    def setUp(self):
+        """
+        Configura um catálogo "antigo" (alterado há um dia)
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.classicos = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        self.frutas = Categoria.objects.create(nome='Frutas', slug='frutas')
+        self.red_velvet = Cupcake.objects.create(
+            nome='Red Velvet', slug='red-velvet', descricao='Cream cheese',
+            preco=Decimal('10.00'), categoria=self.classicos, estoque=5
+        )
+        self.baunilha = Cupcake.objects.create(
+            nome='Baunilha', slug='baunilha', descricao='Clássico',
+            preco=Decimal('7.00'), categoria=self.classicos, estoque=5
+        )
+        self.morango = Cupcake.objects.create(
+            nome='Morango', slug='morango', descricao='Fresco',
+            preco=Decimal('8.50'), categoria=self.frutas, estoque=3
+        )
+
+        ontem = timezone.now() - timedelta(days=1)
+        Cupcake.objects.update(updated_at=ontem)
+        Categoria.objects.update(updated_at=ontem)
+        self.desde = (timezone.now() - timedelta(hours=1)).isoformat()
+
+    def sincronizar(self, desde=None):
+        return self.client.get('/api/cupcakes/mudancas/', {'desde': desde or self.desde})
+
+    def test_desde_invalido(self):
+        """
+        Testa a validação do parâmetro desde
+        """
+        self.assertEqual(self.client.get('/api/cupcakes/mudancas/').status_code, 400)
+        self.assertEqual(self.sincronizar('ontem').status_code, 400)
+
+    def test_ate_reutilizavel_como_desde(self):
+        """
+        Testa que "ate" sai em UTC com Z e que os formatos Z e +00:00 são aceitos
+        """
+        ate = self.sincronizar().json()['ate']
+        self.assertTrue(ate.endswith('Z'))
+
+        self.assertEqual(self.client.get(f'/api/cupcakes/mudancas/?desde={ate}').status_code, 200)
+        com_offset = ate.replace('Z', '+00:00')
+        self.assertEqual(self.sincronizar(com_offset).status_code, 200)
+        # "+" sem percent-encoding vira espaço na query string
+        self.assertEqual(self.client.get(f'/api/cupcakes/mudancas/?desde={com_offset}').status_code, 200)
+
+    def test_sem_mudancas(self):
+        """
+        Testa a resposta vazia quando nada mudou
+        """
+        dados = self.sincronizar().json()
+
+        self.assertEqual(dados['cupcakes'], [])
+        self.assertEqual(dados['categorias'], [])
+        self.assertEqual(dados['removidos'], {'cupcakes': [], 'categorias': []})
+        self.assertIn('ate', dados)
+
+    def test_retorna_apenas_alterados(self):
+        """
+        Testa que só o cupcake alterado (e a sua categoria) são retornados
+        """
+        self.morango.preco = Decimal('9.00')
+        self.morango.save()
+
+        dados = self.sincronizar().json()
+
+        self.assertEqual([cupcake['slug'] for cupcake in dados['cupcakes']], ['morango'])
+        self.assertEqual(dados['cupcakes'][0]['preco'], '9.00')
+        self.assertEqual([categoria['slug'] for categoria in dados['categorias']], ['frutas'])
+
+    def test_categoria_renomeada_traz_seus_cupcakes(self):
+        """
+        Testa que os cupcakes de uma categoria renomeada são reenviados
+        """
+        self.classicos.nome = 'Tradicionais'
+        self.classicos.save()
+
+        dados = self.sincronizar().json()
+
+        self.assertEqual(
+            sorted(cupcake['slug'] for cupcake in dados['cupcakes']),
+            ['baunilha', 'red-velvet']
+        )
+        self.assertTrue(all(cupcake['categoria_nome'] == 'Tradicionais' for cupcake in dados['cupcakes']))
+
+    def test_remocoes_e_desativacoes(self):
+        """
+        Testa os IDs a remover: cupcake excluído e cupcake desativado
+        """
+        red_velvet_id = self.red_velvet.id
+        self.red_velvet.delete()
+        self.baunilha.ativo = False
+        self.baunilha.save()
+
+        dados = self.sincronizar().json()
+
+        self.assertTrue(RemocaoCatalogo.objects.filter(tipo='cupcake', objeto_id=red_velvet_id).exists())
+        self.assertEqual(dados['cupcakes'], [])
+        self.assertEqual(sorted(dados['removidos']['cupcakes']), sorted([red_velvet_id, self.baunilha.id]))
+        self.assertEqual([categoria['slug'] for categoria in dados['categorias']], ['classicos'])
+
+        # Para o admin, o cupcake desativado continua visível
+        admin = User.objects.create_user(username='admin', password='senha123', is_staff=True)
+        self.client.force_authenticate(user=admin)
+        dados = self.sincronizar().json()
+        self.assertEqual([cupcake['slug'] for cupcake in dados['cupcakes']], ['baunilha'])
+        self.assertEqual(dados['removidos']['cupcakes'], [red_velvet_id])
+
+    def test_historico_expirado(self):
+        """
+        Testa a resposta 410 para sincronizações anteriores à retenção
+        """
+        resposta = self.sincronizar((timezone.now() - timedelta(days=365)).isoformat())
+
+        self.assertEqual(resposta.status_code, 410)
@@ -0,0 +1,153 @@
+import gzip
+import json
+import shutil
+import tempfile
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.services import SnapshotCatalogoService
+
+
+class SnapshotCatalogoTestCase(TestCase):
+    """
+    Testes do snapshot estático do catálogo
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste com um STATIC_ROOT temporário
+        """
+        cache.clear()
+        self.static_root = tempfile.mkdtemp()
+        configuracoes = override_settings(STATIC_ROOT=self.static_root, CATALOGO_SNAPSHOT_AUTOMATICO=True)
+        configuracoes.enable()
+        self.addCleanup(configuracoes.disable)
+        self.addCleanup(shutil.rmtree, self.static_root, ignore_errors=True)
+
+        self.categoria = Categoria.objects.create(nome='Clássicos', slug='classicos')
+        self.red_velvet = Cupcake.objects.create(
+            nome='Red Velvet',
+            slug='red-velvet',
+            descricao='Cream cheese',
+            preco=Decimal('10.00'),
+            categoria=self.categoria,
+            estoque=5
+        )
+        self.morango = Cupcake.objects.create(
+            nome='Morango',
+            slug='morango',
+            descricao='Morango fresco',
+            preco=Decimal('8.50'),
+            categoria=self.categoria,
+            estoque=3
+        )
+        Cupcake.objects.create(
+            nome='Inativo',
+            slug='inativo',
+            descricao='Fora do cardápio',
+            preco=Decimal('9.00'),
+            categoria=self.categoria,
+            ativo=False
+        )
+        # Descarta as publicações agendadas pelos cadastros acima
+        SnapshotCatalogoService._pendentes.ids = None
+
+    def ler_snapshot(self):
+        atual = SnapshotCatalogoService.obter_atual()
+        with open(SnapshotCatalogoService.diretorio() / atual['arquivo'], 'rb') as arquivo:
+            return json.load(arquivo)
+
+    def test_publicar_gera_arquivo_com_hash(self):
+        """
+        Testa o arquivo publicado, o ponteiro e a versão comprimida
+        """
+        resultado = SnapshotCatalogoService.publicar()
+        atual = SnapshotCatalogoService.obter_atual()
+        caminho = SnapshotCatalogoService.diretorio() / atual['arquivo']
+
+        self.assertTrue(resultado['alterado'])
+        self.assertRegex(atual['arquivo'], r'^catalogo\.[0-9a-f]{12}\.json$')
+        self.assertEqual(atual['url'], f"/static/catalogo/{atual['arquivo']}")
+        self.assertEqual(gzip.decompress((caminho.parent / f"{caminho.name}.gz").read_bytes()), caminho.read_bytes())
+
+        snapshot = self.ler_snapshot()
+        self.assertEqual([cupcake['slug'] for cupcake in snapshot['cupcakes']], ['morango', 'red-velvet'])
+        self.assertEqual(snapshot['categorias'][0]['total_cupcakes'], 2)
+
+    def test_republicar_sem_alteracoes(self):
+        """
+        Testa que o mesmo conteúdo não gera um novo arquivo
+        """
+        SnapshotCatalogoService.publicar()
+        resultado = SnapshotCatalogoService.publicar()
+
+        self.assertFalse(resultado['alterado'])
+
+    def test_publicacao_incremental_igual_a_completa(self):
+        """
+        Testa que a publicação após uma alteração só serializa o cupcake
+        alterado e produz o mesmo conteúdo de uma geração completa
+        """
+        SnapshotCatalogoService.publicar()
+        anterior = SnapshotCatalogoService.obter_atual()['arquivo']
+
+        serializar = SnapshotCatalogoService._serializar_cupcakes
+        with mock.patch.object(
+            SnapshotCatalogoService, '_serializar_cupcakes', side_effect=serializar
+        ) as serializacao:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.red_velvet.preco = Decimal('11.00')
+                self.red_velvet.destaque = True
+                self.red_velvet.save()
+
+        serializados = serializacao.call_args.args[0]
+        self.assertEqual(list(serializados.values_list('id', flat=True)), [self.red_velvet.id])
+
+        atual = SnapshotCatalogoService.obter_atual()
+        self.assertNotEqual(atual['arquivo'], anterior)
+        snapshot = self.ler_snapshot()
+        self.assertEqual(snapshot['cupcakes'][0]['preco'], '11.00')
+
+        completo = SnapshotCatalogoService.publicar()
+        self.assertFalse(completo['alterado'])
+
+    def test_alteracoes_da_transacao_publicadas_uma_vez(self):
+        """
+        Testa que várias alterações na mesma transação geram uma publicação
+        """
+        SnapshotCatalogoService.publicar()
+        morango_id = self.morango.id
+
+        with mock.patch.object(SnapshotCatalogoService, 'publicar') as publicar:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.morango.delete()
+                self.categoria.nome = 'Tradicionais'
+                self.categoria.save()
+
+        publicar.assert_called_once_with(
+            cupcake_ids={morango_id},
+            categoria_ids={self.categoria.id}
+        )
+
+    def test_endpoint_versao(self):
+        """
+        Testa o endpoint de versão, o GET condicional e o arquivo servido
+        """
+        client = APIClient()
+        self.assertEqual(client.get('/api/catalogo/versao/').status_code, 404)
+
+        SnapshotCatalogoService.publicar()
+        resposta = client.get('/api/catalogo/versao/')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json()['cupcakes'], 2)
+
+        nao_modificado = client.get('/api/catalogo/versao/', HTTP_IF_NONE_MATCH=resposta['ETag'])
+        self.assertEqual(nao_modificado.status_code, 304)
+
+        arquivo = client.get(resposta.json()['url'])
+        self.assertEqual(arquivo.status_code, 200)
+        self.assertIn('immutable', arquivo['Cache-Control'])
+        self.assertEqual(json.loads(arquivo.content), self.ler_snapshot())
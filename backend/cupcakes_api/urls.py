@@ -1,12 +1,15 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from cupcakes_api.views import (
     CategoriaViewSet,
     CupcakeViewSet,
     CarrinhoViewSet,
+    CarrinhoAnonimoViewSet,
     CupomViewSet,
     PedidoViewSet,
     PagamentoViewSet,
+    CatalogoVersaoView,
+    CatalogoArquivoView,
     RegistroView,
     LoginView,
     LogoutView,
@@ -18,6 +21,7 @@ router = DefaultRouter()
 router.register(r'categorias', CategoriaViewSet, basename='categoria')
 router.register(r'cupcakes', CupcakeViewSet, basename='cupcake')
 router.register(r'carrinho', CarrinhoViewSet, basename='carrinho')
+router.register(r'carrinho-anonimo', CarrinhoAnonimoViewSet, basename='carrinho-anonimo')
 router.register(r'cupons', CupomViewSet, basename='cupom')
 router.register(r'pedidos', PedidoViewSet, basename='pedido')
 router.register(r'pagamentos', PagamentoViewSet, basename='pagamento')
@@ -32,11 +36,28 @@ urlpatterns = [
     path('api/auth/login/', LoginView.as_view(), name='login'),
     path('api/auth/logout/', LogoutView.as_view(), name='logout'),
     path('api/auth/perfil/', PerfilView.as_view(), name='perfil'),
+
+    # Snapshot estático do catálogo
+    path('api/catalogo/versao/', CatalogoVersaoView.as_view(), name='catalogo-versao'),
+    re_path(
+        r'^static/catalogo/(?P<arquivo>catalogo\.[0-9a-f]{12}\.json)$',
+        CatalogoArquivoView.as_view(),
+        name='catalogo-arquivo'
+    ),
 ]
 
 """
 Documentação das Rotas da API REST:
 
+=== PAGINAÇÃO ===
+Listagens de cupcakes, pedidos e pagamentos aceitam ?paginacao=cursor para
+paginação por cursor (ordenada por -created_at, -id; sem "count"). Siga o
+link "next" da resposta para obter a próxima página.
+
+=== CAMPOS ESPARSOS ===
+Leituras aceitam ?fields=id,status (só esses campos) e ?omit=itens (remove
+campos); use ponto para campos aninhados: ?fields=id,itens.quantidade
+
 === AUTENTICAÇÃO ===
 POST   /api/auth/registro/          - Registrar novo usuário
 POST   /api/auth/login/             - Login (retorna token)
@@ -60,6 +81,14 @@ PUT    /api/cupcakes/{id}/          - Atualizar cupcake (admin)
 DELETE /api/cupcakes/{id}/          - Remover cupcake (admin)
 GET    /api/cupcakes/destaques/     - Listar cupcakes em destaque
 GET    /api/cupcakes/disponiveis/   - Listar cupcakes disponíveis
+GET    /api/cupcakes/mudancas/      - Mudanças do catálogo desde um instante
+        Query: ?desde=<ISO 8601> (use o "ate" da resposta anterior)
+        Retorna { ate, cupcakes, categorias, removidos: { cupcakes, categorias } }
+
+=== CATÁLOGO ESTÁTICO ===
+GET    /api/catalogo/versao/        - Snapshot atual do catálogo
+        Retorna { arquivo, url, hash, gerado_em, cupcakes, categorias };
+        o arquivo em "url" (/static/catalogo/catalogo.<hash>.json) é imutável
 
 === CARRINHO ===
 GET    /api/carrinho/               - Obter carrinho do usuário
@@ -70,6 +99,18 @@ PATCH  /api/carrinho/atualizar-quantidade/{item_id}/ - Atualizar quantidade
         Body: { quantidade }
 POST   /api/carrinho/limpar/        - Limpar carrinho
 GET    /api/carrinho/totais/        - Obter totais do carrinho
+POST   /api/carrinho/sincronizar/   - Aplicar várias operações em uma transação
+        Body: { operacoes: [{ op: set|add|remove, cupcake_id, quantidade }], substituir }
+        Retorna o carrinho resultante; com algum item inválido nada é gravado (400 + erros)
+
+=== CARRINHO ANÔNIMO (cookie assinado, sem autenticação) ===
+GET    /api/carrinho-anonimo/       - Obter carrinho do visitante (itens, totais e avisos)
+POST   /api/carrinho-anonimo/adicionar_item/ - Adicionar item
+        Body: { cupcake_id, quantidade }
+DELETE /api/carrinho-anonimo/remover-item/{cupcake_id}/ - Remover item
+POST   /api/carrinho-anonimo/limpar/ - Limpar carrinho (remove o cookie)
+POST   /api/carrinho-anonimo/sincronizar/ - Mesmo body de /api/carrinho/sincronizar/
+        O carrinho é juntado ao do usuário no login/registro e o cookie é removido
 
 === CUPONS ===
 GET    /api/cupons/                 - Listar cupons (admin)
@@ -88,12 +129,14 @@ POST   /api/pedidos/criar/          - Criar novo pedido
                 tipo_entrega, metodo_pagamento, cep, endereco,
                 numero, bairro, cidade, estado, complemento,
                 valor_pago, codigo_cupom, observacoes }
+        Header opcional: Idempotency-Key (repetições devolvem o pedido original)
 GET    /api/pedidos/{id}/           - Obter pedido específico
 POST   /api/pedidos/{id}/cancelar/  - Cancelar pedido
 PATCH  /api/pedidos/{id}/atualizar_status/ - Atualizar status (admin)
         Body: { status }
 GET    /api/pedidos/meus_pedidos/   - Listar pedidos do usuário
 GET    /api/pedidos/estatisticas/   - Estatísticas de pedidos (admin)
+        Query: ?data_inicio=AAAA-MM-DD&data_fim=AAAA-MM-DD&granularidade=dia|semana|mes
 
 === PAGAMENTOS ===
 GET    /api/pagamentos/             - Listar pagamentos
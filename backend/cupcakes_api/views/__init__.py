@@ -1,18 +1,22 @@
 from .categoria_views import CategoriaViewSet
 from .cupcake_views import CupcakeViewSet
-from .carrinho_views import CarrinhoViewSet
+from .carrinho_views import CarrinhoViewSet, CarrinhoAnonimoViewSet
 from .cupom_views import CupomViewSet
 from .pedido_views import PedidoViewSet
 from .pagamento_views import PagamentoViewSet
+from .catalogo_views import CatalogoVersaoView, CatalogoArquivoView
 from .auth_views import RegistroView, LoginView, LogoutView, PerfilView
 
 __all__ = [
     'CategoriaViewSet',
     'CupcakeViewSet',
     'CarrinhoViewSet',
+    'CarrinhoAnonimoViewSet',
     'CupomViewSet',
     'PedidoViewSet',
     'PagamentoViewSet',
+    'CatalogoVersaoView',
+    'CatalogoArquivoView',
     'RegistroView',
     'LoginView',
     'LogoutView',
@@ -8,6 +8,23 @@ from cupcakes_api.serializers import (
     LoginSerializer,
     UsuarioSerializer
 )
+from cupcakes_api.services import CarrinhoService, CarrinhoAnonimoService
+
+
+def mesclar_carrinho_anonimo(request, usuario, response):
+    """
+    Junta o carrinho do cookie ao do usuário e remove o cookie
+
+    Args:
+        request (Request): Requisição de login/registro
+        usuario (User): Usuário autenticado
+        response (Response): Resposta que será enviada
+    """
+    if CarrinhoAnonimoService.COOKIE not in request.COOKIES:
+        return response
+    CarrinhoService.mesclar_anonimo(usuario, CarrinhoAnonimoService.ler(request))
+    CarrinhoAnonimoService.remover(response)
+    return response
 
 
 class RegistroView(APIView):
@@ -36,11 +53,11 @@ class RegistroView(APIView):
             user = serializer.save()
             token, created = Token.objects.get_or_create(user=user)
             
-            return Response({
+            return mesclar_carrinho_anonimo(request, user, Response({
                 'mensagem': 'Usuário registrado com sucesso',
                 'usuario': UsuarioSerializer(user).data,
                 'token': token.key
-            }, status=status.HTTP_201_CREATED)
+            }, status=status.HTTP_201_CREATED))
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -67,11 +84,11 @@ class LoginView(APIView):
             user = serializer.validated_data['user']
             token, created = Token.objects.get_or_create(user=user)
             
-            return Response({
+            return mesclar_carrinho_anonimo(request, user, Response({
                 'mensagem': 'Login realizado com sucesso',
                 'usuario': UsuarioSerializer(user).data,
                 'token': token.key
-            }, status=status.HTTP_200_OK)
+            }, status=status.HTTP_200_OK))
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -1,34 +1,46 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from cupcakes_api.models import Carrinho, ItemCarrinho
+from cupcakes_api.models import Carrinho, ItemCarrinho, Cupcake
 from cupcakes_api.serializers import (
     CarrinhoSerializer,
     ItemCarrinhoSerializer,
-    AdicionarItemCarrinhoSerializer
+    AdicionarItemCarrinhoSerializer,
+    SincronizarCarrinhoSerializer
 )
-from cupcakes_api.services import CarrinhoService
+from cupcakes_api.services import CarrinhoService, CarrinhoAnonimoService
 
 
 class CarrinhoViewSet(viewsets.ViewSet):
     """
     ViewSet para gerenciar carrinho de compras
     
-    retrieve: Obtém o carrinho do usuário
+    list: Obtém o carrinho do usuário
     adicionar_item: Adiciona um item ao carrinho
     remover_item: Remove um item do carrinho
     atualizar_quantidade: Atualiza quantidade de um item
     limpar: Remove todos os itens do carrinho
+    sincronizar: Aplica várias operações de uma vez
     """
     permission_classes = [permissions.IsAuthenticated]
 
-    def retrieve(self, request):
+    def serializar_carrinho(self, request):
+        """
+        Serializa o carrinho do usuário com um número fixo de consultas
+
+        Returns:
+            dict: Carrinho serializado (respeitando ?fields=/?omit=)
+        """
+        serializer = CarrinhoSerializer(context={'request': request})
+        campos = list(serializer.fields) if serializer.selecao_aplicada else None
+        serializer.instance = CarrinhoService.carregar_carrinho(request.user, campos)
+        return serializer.data
+
+    def list(self, request):
         """
         Obtém o carrinho do usuário autenticado
         """
-        carrinho = CarrinhoService.obter_ou_criar_carrinho(request.user)
-        serializer = CarrinhoSerializer(carrinho, context={'request': request})
-        return Response(serializer.data)
+        return Response(self.serializar_carrinho(request))
 
     @action(detail=False, methods=['post'])
     def adicionar_item(self, request):
@@ -49,19 +61,44 @@ class CarrinhoViewSet(viewsets.ViewSet):
         )
 
         if resultado['sucesso']:
-            carrinho_serializer = CarrinhoSerializer(
-                resultado['carrinho'],
-                context={'request': request}
-            )
             return Response({
                 'mensagem': resultado['mensagem'],
-                'carrinho': carrinho_serializer.data
+                'carrinho': self.serializar_carrinho(request)
             }, status=status.HTTP_201_CREATED)
 
         return Response({
             'mensagem': resultado['mensagem']
         }, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'])
+    def sincronizar(self, request):
+        """
+        Aplica várias operações no carrinho em uma única requisição
+
+        Body:
+            operacoes: [{ op: set|add|remove, cupcake_id, quantidade }]
+            substituir: Remove os cupcakes fora da lista (padrão: false)
+        """
+        serializer = SincronizarCarrinhoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        resultado = CarrinhoService.sincronizar(
+            usuario=request.user,
+            operacoes=serializer.validated_data['operacoes'],
+            substituir=serializer.validated_data['substituir']
+        )
+
+        if resultado['sucesso']:
+            return Response({
+                'mensagem': resultado['mensagem'],
+                'carrinho': self.serializar_carrinho(request)
+            }, status=status.HTTP_200_OK)
+
+        return Response({
+            'mensagem': resultado['mensagem'],
+            'erros': resultado['erros']
+        }, status=status.HTTP_400_BAD_REQUEST)
+
     @action(detail=False, methods=['delete'], url_path='remover-item/(?P<item_id>[^/.]+)')
     def remover_item(self, request, item_id=None):
         """
@@ -130,7 +167,106 @@ class CarrinhoViewSet(viewsets.ViewSet):
         """
         Calcula os totais do carrinho
         """
-        carrinho = CarrinhoService.obter_ou_criar_carrinho(request.user)
+        carrinho = CarrinhoService.carregar_carrinho(request.user, campos=['total_itens', 'subtotal'])
         totais = CarrinhoService.calcular_totais(carrinho)
         
         return Response(totais)
+
+
+class CarrinhoAnonimoViewSet(viewsets.ViewSet):
+    """
+    Carrinho de visitantes não autenticados, em cookie assinado
+
+    Não usa autenticação nem sessão: o carrinho vai e volta no cookie e é
+    validado contra o mapa de preços/estoque em cache. Os itens são
+    identificados pelo ID do cupcake.
+
+    list: Obtém o carrinho
+    adicionar_item: Adiciona um item
+    sincronizar: Aplica várias operações de uma vez
+    remover_item: Remove um cupcake
+    limpar: Esvazia o carrinho
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def responder(self, request, linhas, status_code=status.HTTP_200_OK, mensagem=None):
+        """
+        Monta a resposta com o carrinho validado e regrava o cookie
+        """
+        storage = Cupcake._meta.get_field('imagem').storage
+        validas, carrinho = CarrinhoAnonimoService.montar(
+            linhas,
+            lambda nome: request.build_absolute_uri(storage.url(nome))
+        )
+        dados = {'carrinho': carrinho}
+        if mensagem:
+            dados['mensagem'] = mensagem
+        response = Response(dados, status=status_code)
+        CarrinhoAnonimoService.gravar(response, validas)
+        return response
+
+    def aplicar(self, request, operacoes, substituir=False, status_code=status.HTTP_200_OK):
+        resultado = CarrinhoAnonimoService.aplicar(
+            CarrinhoAnonimoService.ler(request), operacoes, substituir
+        )
+        if not resultado['sucesso']:
+            return Response({
+                'mensagem': resultado['mensagem'],
+                'erros': resultado['erros']
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return self.responder(request, resultado['linhas'], status_code, resultado['mensagem'])
+
+    def list(self, request):
+        """
+        Obtém o carrinho anônimo (com avisos de itens ajustados)
+        """
+        return self.responder(request, CarrinhoAnonimoService.ler(request))
+
+    @action(detail=False, methods=['post'])
+    def adicionar_item(self, request):
+        """
+        Adiciona um item ao carrinho anônimo
+
+        Body:
+            cupcake_id: ID do cupcake
+            quantidade: Quantidade (padrão: 1)
+        """
+        serializer = AdicionarItemCarrinhoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self.aplicar(request, [{
+            'op': 'add',
+            'cupcake_id': serializer.validated_data['cupcake_id'],
+            'quantidade': serializer.validated_data['quantidade']
+        }], status_code=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def sincronizar(self, request):
+        """
+        Aplica várias operações no carrinho anônimo
+
+        Body:
+            operacoes: [{ op: set|add|remove, cupcake_id, quantidade }]
+            substituir: Remove os cupcakes fora da lista (padrão: false)
+        """
+        serializer = SincronizarCarrinhoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self.aplicar(
+            request,
+            serializer.validated_data['operacoes'],
+            serializer.validated_data['substituir']
+        )
+
+    @action(detail=False, methods=['delete'], url_path='remover-item/(?P<cupcake_id>[0-9]+)')
+    def remover_item(self, request, cupcake_id=None):
+        """
+        Remove um cupcake do carrinho anônimo
+        """
+        return self.aplicar(request, [{'op': 'remove', 'cupcake_id': int(cupcake_id)}])
+
+    @action(detail=False, methods=['post'])
+    def limpar(self, request):
+        """
+        Esvazia o carrinho anônimo
+        """
+        return self.responder(request, {}, mensagem='Carrinho limpo')
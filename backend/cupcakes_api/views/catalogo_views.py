@@ -0,0 +1,63 @@
+from datetime import datetime
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views import View
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from cupcakes_api.services import SnapshotCatalogoService
+from cupcakes_api.views.mixins import GetCondicionalMixin
+
+
+class CatalogoVersaoView(GetCondicionalMixin, APIView):
+    """
+    View que aponta para o snapshot estático atual do catálogo
+
+    GET: Retorna o nome, a URL e o hash do arquivo vigente
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def calcular_validadores(self):
+        atual = SnapshotCatalogoService.obter_atual()
+        if atual is None:
+            return None
+        return self.montar_validadores(
+            atual['hash'],
+            ultima_modificacao=datetime.fromisoformat(atual['gerado_em'])
+        )
+
+    def get(self, request):
+        """
+        Retorna o snapshot atual do catálogo
+        """
+        def gerar_resposta():
+            atual = SnapshotCatalogoService.obter_atual()
+            if atual is None:
+                return Response(
+                    {'mensagem': 'Snapshot do catálogo não publicado'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            return Response(atual)
+
+        return self.responder_condicional(gerar_resposta)
+
+
+class CatalogoArquivoView(View):
+    """
+    Serve um snapshot publicado depois da inicialização do processo
+
+    O WhiteNoise só conhece os arquivos existentes quando o processo sobe;
+    snapshots publicados depois chegam aqui. O nome contém o hash do
+    conteúdo, então a resposta pode ficar em cache indefinidamente.
+    """
+
+    def get(self, request, arquivo):
+        try:
+            with open(SnapshotCatalogoService.diretorio() / arquivo, 'rb') as conteudo:
+                resposta = HttpResponse(conteudo.read(), content_type='application/json')
+        except OSError:
+            raise Http404('Snapshot não encontrado')
+
+        patch_cache_control(resposta, public=True, max_age=31536000, immutable=True)
+        return resposta
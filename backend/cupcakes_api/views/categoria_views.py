@@ -3,9 +3,11 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from cupcakes_api.models import Categoria
 from cupcakes_api.serializers import CategoriaSerializer
+from cupcakes_api.services import CatalogoCacheService
+from cupcakes_api.views.mixins import CamposDinamicosViewMixin, GetCondicionalMixin
 
 
-class CategoriaViewSet(viewsets.ModelViewSet):
+class CategoriaViewSet(CamposDinamicosViewMixin, GetCondicionalMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar categorias
     
@@ -26,7 +28,7 @@ class CategoriaViewSet(viewsets.ModelViewSet):
             return [permissions.IsAdminUser()]
         return [permissions.AllowAny()]
 
-    def get_queryset(self):
+    def _categorias_visiveis(self):
         """
         Filtra categorias ativas para usuários não-admin
         """
@@ -35,13 +37,65 @@ class CategoriaViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(ativo=True)
         return queryset
 
+    def get_queryset(self):
+        """
+        Categorias visíveis, com os totais de cupcakes anotados na leitura
+        """
+        queryset = self._categorias_visiveis()
+        if self.action in ('list', 'retrieve'):
+            queryset = CategoriaSerializer.otimizar_queryset(queryset, self.campos_selecionados())
+            queryset = self.restringir_campos(queryset)
+        return queryset
+
+    def calcular_validadores(self):
+        """
+        ETag da listagem e do detalhe: contagem e max(updated_at) das
+        categorias e dos seus cupcakes, guardados por versão do catálogo
+        """
+        if self.action not in ('list', 'retrieve'):
+            return None
+
+        def calcular():
+            queryset = self._categorias_visiveis()
+            if self.action == 'retrieve':
+                queryset = self.filtrar_objeto(queryset)
+                if queryset is None:
+                    return None
+            return self.validadores_do_queryset(
+                queryset,
+                datas=('updated_at', 'cupcakes__updated_at'),
+                contagens=('pk', 'cupcakes')
+            )
+
+        chave = CatalogoCacheService.montar_chave(
+            f"etag:categorias:{self.request.build_absolute_uri()}",
+            staff=self.request.user.is_staff
+        )
+        return CatalogoCacheService.obter_ou_calcular(chave, calcular)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lista categorias (304 se o cliente já tiver a versão atual)
+        """
+        return self.responder_condicional(
+            lambda: super(CategoriaViewSet, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Obtém uma categoria (304 se o cliente já tiver a versão atual)
+        """
+        return self.responder_condicional(
+            lambda: super(CategoriaViewSet, self).retrieve(request, *args, **kwargs)
+        )
+
     @action(detail=True, methods=['get'])
     def cupcakes(self, request, pk=None):
         """
         Lista cupcakes de uma categoria específica
         """
         categoria = self.get_object()
-        cupcakes = categoria.cupcakes.filter(ativo=True)
+        cupcakes = categoria.cupcakes.filter(ativo=True).select_related('categoria')
         
         from cupcakes_api.serializers import CupcakeListSerializer
         serializer = CupcakeListSerializer(cupcakes, many=True, context={'request': request})
@@ -1,12 +1,31 @@
+import re
+from datetime import timezone as dt_timezone
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
-from cupcakes_api.models import Cupcake
-from cupcakes_api.serializers import CupcakeSerializer, CupcakeListSerializer
+from cupcakes_api.filters import BuscaCupcakeFilter
+from cupcakes_api.models import Categoria, Cupcake
+from cupcakes_api.pagination import PaginacaoCursorOpcional
+from cupcakes_api.serializers import (
+    CupcakeSerializer,
+    CupcakeListSerializer,
+    CupcakeListaRapidaSerializer,
+    CategoriaSerializer
+)
+from cupcakes_api.services import (
+    CatalogoCacheService,
+    AutocompletarService,
+    FacetaService,
+    SincronizacaoCatalogoService
+)
+from cupcakes_api.views.mixins import CamposDinamicosViewMixin, GetCondicionalMixin
 
 
-class CupcakeViewSet(viewsets.ModelViewSet):
+class CupcakeViewSet(CamposDinamicosViewMixin, GetCondicionalMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar cupcakes
     
@@ -17,11 +36,12 @@ class CupcakeViewSet(viewsets.ModelViewSet):
     destroy: Remove um cupcake (admin)
     """
     queryset = Cupcake.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['categoria', 'destaque', 'ativo']
-    search_fields = ['nome', 'descricao']
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, BuscaCupcakeFilter]
+    filterset_fields = ['categoria', 'destaque', 'ativo', 'disponivel']
     ordering_fields = ['preco', 'nome', 'created_at']
     ordering = ['-destaque', 'nome']
+    pagination_class = PaginacaoCursorOpcional
+    acoes_campos_dinamicos = ('list', 'retrieve', 'destaques', 'disponiveis')
 
     def get_serializer_class(self):
         """
@@ -46,22 +66,194 @@ class CupcakeViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         if not self.request.user.is_staff:
             queryset = queryset.filter(ativo=True)
+        if self.action != 'list':
+            # A listagem usa a projeção do caminho rápido
+            queryset = self.restringir_campos(queryset)
         return queryset
 
+    def _resposta_em_cache(self, prefixo, calcular):
+        """
+        Serve os dados serializados a partir do cache do catálogo
+
+        A chave considera a versão do catálogo, os parâmetros da requisição,
+        o host (as URLs retornadas são absolutas) e se o usuário é admin.
+        """
+        chave = CatalogoCacheService.montar_chave(
+            f"{prefixo}:{self.request.build_absolute_uri('/')}",
+            self.request.query_params,
+            staff=self.request.user.is_staff
+        )
+        return Response(CatalogoCacheService.obter_ou_calcular(chave, calcular))
+
+    def calcular_validadores(self):
+        """
+        ETag da listagem e do detalhe: contagem e max(updated_at) dos
+        cupcakes e de suas categorias, guardados por versão do catálogo
+        """
+        if self.action not in ('list', 'retrieve'):
+            return None
+
+        def calcular():
+            queryset = self.get_queryset()
+            if self.action == 'list':
+                queryset = self.filter_queryset(queryset)
+            else:
+                queryset = self.filtrar_objeto(queryset)
+                if queryset is None:
+                    return None
+            return self.validadores_do_queryset(
+                queryset, datas=('updated_at', 'categoria__updated_at')
+            )
+
+        chave = CatalogoCacheService.montar_chave(
+            f"etag:cupcakes:{self.request.build_absolute_uri()}",
+            staff=self.request.user.is_staff
+        )
+        return CatalogoCacheService.obter_ou_calcular(chave, calcular)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lista cupcakes (resposta em cache por versão do catálogo)
+        """
+        return self.responder_condicional(
+            lambda: self._resposta_em_cache('cupcakes:list', self._listar)
+        )
+
+    def _listar(self):
+        """
+        Monta a listagem pelo caminho rápido do CupcakeListSerializer
+
+        A paginação é feita sobre a projeção `.values()`, então a página já
+        chega ao serializer como dicionários.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = CupcakeListaRapidaSerializer.projetar(queryset, self.campos_selecionados())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data).data
+
+        return self.get_serializer(queryset, many=True).data
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Obtém um cupcake (304 se o cliente já tiver a versão atual)
+        """
+        return self.responder_condicional(
+            lambda: super(CupcakeViewSet, self).retrieve(request, *args, **kwargs)
+        )
+
     @action(detail=False, methods=['get'])
     def destaques(self, request):
         """
         Lista cupcakes em destaque
         """
-        cupcakes = self.get_queryset().filter(destaque=True, ativo=True)
-        serializer = self.get_serializer(cupcakes, many=True)
-        return Response(serializer.data)
+        def calcular():
+            cupcakes = self.get_queryset().filter(destaque=True, ativo=True)
+            return self.get_serializer(cupcakes, many=True).data
+
+        return self._resposta_em_cache('cupcakes:destaques', calcular)
 
     @action(detail=False, methods=['get'])
     def disponiveis(self, request):
         """
         Lista cupcakes disponíveis (com estoque)
         """
-        cupcakes = self.get_queryset().filter(ativo=True, estoque__gt=0)
-        serializer = self.get_serializer(cupcakes, many=True)
-        return Response(serializer.data)
+        def calcular():
+            cupcakes = self.get_queryset().filter(disponivel=True)
+            return self.get_serializer(cupcakes, many=True).data
+
+        return self._resposta_em_cache('cupcakes:disponiveis', calcular)
+
+    @action(detail=False, methods=['get'])
+    def facetas(self, request):
+        """
+        Contagens por categoria, faixa de preço e disponibilidade
+
+        Aceita os mesmos filtros da listagem (categoria, destaque, ativo,
+        search). Resposta em cache por versão do catálogo.
+        """
+        parametros = request.query_params.copy()
+        categoria = parametros.pop('categoria', [''])[-1]
+        if categoria and not categoria.isdigit():
+            return Response(
+                {'mensagem': 'Parâmetro categoria inválido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        def calcular():
+            queryset = self.get_queryset()
+            # A faceta de categoria é calculada sem o filtro de categoria
+            filterset_class = DjangoFilterBackend().get_filterset_class(self, queryset)
+            filterset = filterset_class(data=parametros, queryset=queryset, request=request)
+            if not filterset.is_valid():
+                raise ValidationError(filterset.errors)
+            queryset = BuscaCupcakeFilter().filter_queryset(request, filterset.qs, self)
+            return FacetaService.calcular_facetas(
+                queryset, int(categoria) if categoria else None
+            )
+
+        return self._resposta_em_cache('cupcakes:facetas', calcular)
+
+    @action(detail=False, methods=['get'], authentication_classes=[])
+    def autocomplete(self, request):
+        """
+        Sugestões para a caixa de busca (?q=prefixo&limite=N)
+
+        Servido pela trie em memória do AutocompletarService, sem consultas
+        ao banco enquanto o catálogo não muda.
+        """
+        limite = request.query_params.get('limite', str(AutocompletarService.LIMITE))
+        if not limite.isdigit() or int(limite) < 1:
+            return Response(
+                {'mensagem': 'Parâmetro limite inválido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(AutocompletarService.sugerir(request.query_params.get('q', ''), int(limite)))
+
+    @action(detail=False, methods=['get'])
+    def mudancas(self, request):
+        """
+        Sincronização incremental do catálogo (?desde=<ISO 8601>)
+
+        Retorna os cupcakes e categorias alterados desde o instante
+        informado e os IDs a remover da cópia local. O campo "ate" da
+        resposta (UTC com sufixo Z) é o "desde" da próxima sincronização.
+        """
+        # Um "+00:00" enviado sem percent-encoding chega como " 00:00"
+        valor = re.sub(r' (\d{2}:?\d{2})$', r'+\1', request.query_params.get('desde', ''))
+        try:
+            desde = parse_datetime(valor)
+        except ValueError:
+            desde = None
+        if desde is None:
+            return Response(
+                {'mensagem': 'Parâmetro desde inválido (use ISO 8601, ex: 2024-01-31T12:00:00Z)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if timezone.is_naive(desde):
+            desde = timezone.make_aware(desde)
+
+        categorias = Categoria.objects.all()
+        if not request.user.is_staff:
+            categorias = categorias.filter(ativo=True)
+
+        resultado = SincronizacaoCatalogoService.obter_mudancas(
+            desde, self.get_queryset(), categorias
+        )
+        if not resultado['sucesso']:
+            return Response({'mensagem': resultado['mensagem']}, status=status.HTTP_410_GONE)
+
+        contexto = self.get_serializer_context()
+        return Response({
+            'ate': resultado['ate'].astimezone(dt_timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'cupcakes': CupcakeListSerializer(resultado['cupcakes'], many=True, context=contexto).data,
+            'categorias': CategoriaSerializer(
+                CategoriaSerializer.otimizar_queryset(resultado['categorias']),
+                many=True,
+                context=contexto
+            ).data,
+            'removidos': resultado['removidos']
+        })
@@ -0,0 +1,189 @@
+import hashlib
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class GetCondicionalMixin:
+    """
+    Mixin de GET condicional (ETag / Last-Modified) para ViewSets
+
+    A view informa, em `calcular_validadores`, valores baratos que mudam
+    sempre que a resposta muda (ex: max(updated_at) e contagem de linhas).
+    Se o cliente já tiver a mesma versão (If-None-Match / If-Modified-Since),
+    a resposta é um 304 sem corpo, devolvido antes de qualquer serialização.
+    """
+
+    # Respostas específicas do usuário não podem ser guardadas por proxies
+    cache_privado = False
+
+    def calcular_validadores(self):
+        """
+        Retorna os validadores da action atual
+
+        Returns:
+            tuple|None: (etag, ultima_modificacao) ou None para não usar
+        """
+        return None
+
+    def montar_validadores(self, *partes, ultima_modificacao=None):
+        """
+        Monta a ETag forte a partir das partes e da URL da requisição
+
+        A URL (host e parâmetros) e o perfil do usuário entram no hash porque
+        mudam o conteúdo da resposta (URLs absolutas, filtros, itens inativos).
+
+        Args:
+            *partes: Valores que identificam a versão dos dados
+            ultima_modificacao (datetime, optional): Valor do Last-Modified
+
+        Returns:
+            tuple: (etag, ultima_modificacao)
+        """
+        conteudo = repr((
+            self.request.build_absolute_uri(),
+            self.request.user.is_staff,
+            partes
+        ))
+        etag = quote_etag(hashlib.md5(conteudo.encode('utf-8')).hexdigest())
+        return etag, ultima_modificacao
+
+    def validadores_do_queryset(self, queryset, datas=('updated_at',), contagens=('pk',)):
+        """
+        Calcula os validadores com uma única consulta agregada
+
+        Last-Modified só é enviado no detalhe de um objeto sem contagens
+        extras: em listagens (ou em contagens de relacionados) uma exclusão
+        muda a resposta sem mudar max(updated_at), e If-Modified-Since
+        devolveria um 304 falso. Nesses casos vale só a ETag, que inclui as
+        contagens.
+
+        Args:
+            queryset (QuerySet): Dados que compõem a resposta
+            datas (tuple): Campos cujo Max() identifica a última alteração
+            contagens (tuple): Campos contados (detectam remoções)
+
+        Returns:
+            tuple|None: (etag, ultima_modificacao), ou None em uma action de
+                detalhe sem objeto (a view segue e responde 404)
+        """
+        agregacoes = {f'ultima_{indice}': Max(campo) for indice, campo in enumerate(datas)}
+        agregacoes.update({
+            f'total_{indice}': Count(campo, distinct=True)
+            for indice, campo in enumerate(contagens)
+        })
+        dados = queryset.aggregate(**agregacoes)
+
+        if self.detail and not dados['total_0']:
+            return None
+
+        ultimas = [dados[f'ultima_{indice}'] for indice in range(len(datas))]
+        totais = [dados[f'total_{indice}'] for indice in range(len(contagens))]
+        ultima_modificacao = None
+        if self.detail and tuple(contagens) == ('pk',):
+            ultima_modificacao = max((data for data in ultimas if data), default=None)
+        return self.montar_validadores(*totais, *ultimas, ultima_modificacao=ultima_modificacao)
+
+    def filtrar_objeto(self, queryset):
+        """
+        Restringe o queryset ao objeto da URL (actions de detalhe)
+
+        Returns:
+            QuerySet|None: Queryset filtrado ou None se o identificador é inválido
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def _nao_modificado(self, etag, ultima_modificacao):
+        """
+        Verifica as pré-condições da requisição (RFC 9110, seção 13.2.2)
+        """
+        if_none_match = self.request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            # Comparação fraca, como exigido para If-None-Match
+            etags = [valor.removeprefix('W/') for valor in parse_etags(if_none_match)]
+            return '*' in etags or etag in etags
+
+        if_modified_since = parse_http_date_safe(self.request.META.get('HTTP_IF_MODIFIED_SINCE'))
+        if if_modified_since is not None and ultima_modificacao is not None:
+            return int(ultima_modificacao.timestamp()) <= if_modified_since
+        return False
+
+    def responder_condicional(self, gerar_resposta):
+        """
+        Responde 304 se o cliente já tiver a versão atual, senão gera a resposta
+
+        Args:
+            gerar_resposta (callable): Produz a resposta completa
+
+        Returns:
+            Response: 304 sem corpo ou a resposta gerada, com ETag e Last-Modified
+        """
+        validadores = self.calcular_validadores()
+        if validadores is None:
+            return gerar_resposta()
+
+        etag, ultima_modificacao = validadores
+        if self._nao_modificado(etag, ultima_modificacao):
+            resposta = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            resposta = gerar_resposta()
+            if resposta.status_code != status.HTTP_200_OK:
+                return resposta
+
+        resposta['ETag'] = etag
+        if ultima_modificacao is not None:
+            resposta['Last-Modified'] = http_date(ultima_modificacao.timestamp())
+        if self.cache_privado:
+            patch_cache_control(resposta, private=True, no_cache=True)
+        else:
+            patch_cache_control(resposta, no_cache=True)
+        patch_vary_headers(resposta, ['Authorization'])
+        return resposta
+
+
+class CamposDinamicosViewMixin:
+    """
+    Mixin que leva a seleção de campos (?fields= / ?omit=) ao queryset
+
+    Complementa o CamposDinamicosMixin dos serializers: nas actions de
+    leitura, o queryset passa a carregar só as colunas e relações que os
+    campos mantidos usam.
+    """
+
+    acoes_campos_dinamicos = ('list', 'retrieve')
+
+    def serializer_da_selecao(self):
+        """
+        Serializer da action com a seleção da requisição aplicada
+
+        Returns:
+            Serializer|None: None fora das actions de leitura ou sem seleção
+        """
+        if self.action not in self.acoes_campos_dinamicos:
+            return None
+        if not hasattr(self, '_serializer_da_selecao'):
+            serializer = self.get_serializer()
+            self._serializer_da_selecao = serializer if getattr(serializer, 'selecao_aplicada', False) else None
+        return self._serializer_da_selecao
+
+    def campos_selecionados(self):
+        """
+        Returns:
+            list|None: Campos mantidos pelo serializer ou None sem seleção
+        """
+        serializer = self.serializer_da_selecao()
+        return list(serializer.fields) if serializer is not None else None
+
+    def restringir_campos(self, queryset):
+        """
+        Aplica .only() com as colunas dos campos solicitados
+        """
+        serializer = self.serializer_da_selecao()
+        return serializer.restringir_queryset(queryset) if serializer is not None else queryset
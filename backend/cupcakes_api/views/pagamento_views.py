@@ -1,9 +1,11 @@
 from rest_framework import viewsets, permissions
 from cupcakes_api.models import Pagamento
+from cupcakes_api.pagination import PaginacaoCursorOpcional
 from cupcakes_api.serializers import PagamentoSerializer
+from cupcakes_api.views.mixins import CamposDinamicosViewMixin
 
 
-class PagamentoViewSet(viewsets.ReadOnlyModelViewSet):
+class PagamentoViewSet(CamposDinamicosViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para visualizar pagamentos
     
@@ -12,11 +14,14 @@ class PagamentoViewSet(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = PagamentoSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PaginacaoCursorOpcional
 
     def get_queryset(self):
         """
         Retorna pagamentos do usuário ou todos (se admin)
         """
         if self.request.user.is_staff:
-            return Pagamento.objects.all()
-        return Pagamento.objects.filter(pedido__usuario=self.request.user)
+            queryset = Pagamento.objects.all()
+        else:
+            queryset = Pagamento.objects.filter(pedido__usuario=self.request.user)
+        return self.restringir_campos(queryset)
@@ -2,11 +2,17 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from cupcakes_api.models import Pedido
-from cupcakes_api.serializers import PedidoSerializer, CriarPedidoSerializer
-from cupcakes_api.services import PedidoService
+from cupcakes_api.pagination import PaginacaoCursorOpcional
+from cupcakes_api.serializers import (
+    PedidoSerializer,
+    CriarPedidoSerializer,
+    EstatisticasPedidosSerializer
+)
+from cupcakes_api.services import PedidoService, IdempotenciaService
+from cupcakes_api.views.mixins import CamposDinamicosViewMixin, GetCondicionalMixin
 
 
-class PedidoViewSet(viewsets.ReadOnlyModelViewSet):
+class PedidoViewSet(CamposDinamicosViewMixin, GetCondicionalMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para gerenciar pedidos
     
@@ -18,14 +24,41 @@ class PedidoViewSet(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = PedidoSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PaginacaoCursorOpcional
+    cache_privado = True
+    acoes_campos_dinamicos = ('list', 'retrieve', 'meus_pedidos')
 
     def get_queryset(self):
         """
         Retorna pedidos do usuário ou todos (se admin)
         """
         if self.request.user.is_staff:
-            return Pedido.objects.all()
-        return PedidoService.listar_pedidos_usuario(self.request.user)
+            queryset = Pedido.objects.all()
+        else:
+            queryset = PedidoService.listar_pedidos_usuario(self.request.user)
+        queryset = PedidoSerializer.otimizar_queryset(queryset, self.campos_selecionados())
+        return self.restringir_campos(queryset)
+
+    def calcular_validadores(self):
+        """
+        ETag do detalhe: updated_at do pedido e dos cupcakes dos seus itens
+        """
+        if self.action != 'retrieve':
+            return None
+        queryset = self.filtrar_objeto(self.get_queryset())
+        if queryset is None:
+            return None
+        return self.validadores_do_queryset(
+            queryset, datas=('updated_at', 'itens__cupcake__updated_at')
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Obtém um pedido (304 se o cliente já tiver a versão atual)
+        """
+        return self.responder_condicional(
+            lambda: super(PedidoViewSet, self).retrieve(request, *args, **kwargs)
+        )
 
     @action(detail=False, methods=['post'])
     def criar(self, request):
@@ -48,13 +81,44 @@ class PedidoViewSet(viewsets.ReadOnlyModelViewSet):
             valor_pago: Valor pago (obrigatório se dinheiro)
             codigo_cupom: Código do cupom (opcional)
             observacoes: Observações (opcional)
+
+        Headers:
+            Idempotency-Key: Chave única da tentativa (opcional). Repetições
+                com a mesma chave devolvem o pedido original sem criar outro.
         """
         serializer = CriarPedidoSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        chave = request.headers.get('Idempotency-Key')
+        if not chave:
+            status_code, corpo = self._criar_pedido(request, serializer.validated_data)
+            return Response(corpo, status=status_code)
+
+        if len(chave) > 255:
+            return Response({
+                'mensagem': 'Idempotency-Key deve ter no máximo 255 caracteres'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        resultado = IdempotenciaService.executar(
+            usuario=request.user,
+            chave=chave,
+            endpoint='pedidos:criar',
+            dados=serializer.validated_data,
+            operacao=lambda: self._criar_pedido(request, serializer.validated_data)
+        )
+
+        resposta = Response(resultado['resposta'], status=resultado['status'])
+        if resultado['reproduzida']:
+            resposta['Idempotent-Replayed'] = 'true'
+        return resposta
+
+    def _criar_pedido(self, request, dados_pedido):
+        """
+        Cria o pedido e retorna (status_code, corpo da resposta)
+        """
         resultado = PedidoService.criar_pedido(
             usuario=request.user,
-            dados_pedido=serializer.validated_data
+            dados_pedido=dados_pedido
         )
 
         if resultado['sucesso']:
@@ -62,14 +126,14 @@ class PedidoViewSet(viewsets.ReadOnlyModelViewSet):
                 resultado['pedido'],
                 context={'request': request}
             )
-            return Response({
+            return status.HTTP_201_CREATED, {
                 'mensagem': resultado['mensagem'],
                 'pedido': pedido_serializer.data
-            }, status=status.HTTP_201_CREATED)
+            }
 
-        return Response({
+        return status.HTTP_400_BAD_REQUEST, {
             'mensagem': resultado['mensagem']
-        }, status=status.HTTP_400_BAD_REQUEST)
+        }
 
     @action(detail=True, methods=['post'])
     def cancelar(self, request, pk=None):
@@ -139,14 +203,25 @@ class PedidoViewSet(viewsets.ReadOnlyModelViewSet):
         """
         Lista todos os pedidos do usuário autenticado
         """
-        pedidos = PedidoService.listar_pedidos_usuario(request.user)
-        serializer = self.get_serializer(pedidos, many=True)
+        pedidos = PedidoSerializer.otimizar_queryset(
+            PedidoService.listar_pedidos_usuario(request.user),
+            self.campos_selecionados()
+        )
+        serializer = self.get_serializer(self.restringir_campos(pedidos), many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
     def estatisticas(self, request):
         """
         Retorna estatísticas de pedidos (apenas admin)
+
+        Query params:
+            data_inicio: Data inicial (AAAA-MM-DD ou DD/MM/AAAA)
+            data_fim: Data final (AAAA-MM-DD ou DD/MM/AAAA)
+            granularidade: 'dia', 'semana' ou 'mes' (inclui série temporal)
         """
-        stats = PedidoService.calcular_estatisticas_pedidos()
+        serializer = EstatisticasPedidosSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        stats = PedidoService.calcular_estatisticas_pedidos(**serializer.validated_data)
         return Response(stats)
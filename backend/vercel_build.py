@@ -24,7 +24,13 @@ from django.core.management import call_command
 print("Running migrations...")
 call_command('migrate', '--no-input')
 
+print("Creating cache table...")
+call_command('createcachetable')
+
 print("Collecting static files...")
 call_command('collectstatic', '--no-input', '--clear')
 
+print("Publishing catalog snapshot...")
+call_command('publicar_catalogo')
+
 print("Build completed successfully!")